@@ -1,5 +1,4 @@
 from ..AssetBundle import AssetBundle
-from ..download_file import download_file
 import zipfile
 from pathlib import Path
 
@@ -10,6 +9,10 @@ DOWNLOAD_URL = "https://lindat.mff.cuni.cz/repository/xmlui/bitstream/" + \
 
 class MuscimaPP(AssetBundle):
     def install(self):
+        # imported here, so that using the installed bundle
+        # does not import requests and tqdm
+        from ..download_file import download_file
+
         print("Downloading MUSCIMA++ dataset...")
         downloaded_zip = self.bundle_directory / "MUSCIMA-pp_v1.0.zip"
         download_file(
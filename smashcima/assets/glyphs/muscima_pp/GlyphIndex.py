@@ -0,0 +1,356 @@
+from smashcima.scene.Sprite import Sprite
+from smashcima.scene.SpriteMask import SpriteMask
+from smashcima.scene.ScenePoint import ScenePoint
+from smashcima.scene.visual.Glyph import Glyph
+from smashcima.scene.visual.LineGlyph import LineGlyph
+from smashcima.scene.visual.Notehead import Notehead
+from smashcima.scene.visual.RestGlyph import RestGlyph
+from smashcima.scene.visual.Stem import Stem
+from smashcima.scene.visual.Beam import Beam
+from smashcima.scene.visual.BeamHook import BeamHook
+from smashcima.scene.visual.LedgerLine import LedgerLine
+from smashcima.geometry.Point import Point
+from smashcima.geometry.Vector2 import Vector2
+from smashcima.geometry.Transform import Transform
+from .MppGlyphMetadata import MppGlyphMetadata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple, Type
+import numpy as np
+import threading
+
+
+_GLYPH_TYPES: Dict[str, Type[Glyph]] = {
+    t.__name__: t for t in [
+        Glyph, LineGlyph, Notehead, RestGlyph, Stem, Beam, BeamHook, LedgerLine
+    ]
+}
+"Glyph types that can be stored in the index, by their name"
+
+def _is_identity(transform: Transform) -> bool:
+    return np.array_equal(transform.matrix, Transform.identity().matrix)
+
+
+MASKS_FILE = "masks.bin"
+"Name of the file with all the packed sprite masks, one after another"
+
+INDEX_FILE = "index.npz"
+"Name of the file with the columnar glyph index"
+
+
+class GlyphIndex:
+    """
+    On-disk symbol repository storage. Packed sprite masks of all glyphs live
+    in one contiguous file that is memory-mapped, so that all processes
+    reading the repository share the same page-cache memory. Everything else
+    about the glyphs lives in a compact columnar index (one numpy array per
+    property, one row per glyph). Glyph instances are materialized from
+    the index only when requested. The most recently requested glyphs
+    are kept, so that glyphs sampled repeatedly are materialized only once.
+
+    Only the glyphs extracted from MUSCIMA++ can be stored, that is,
+    glyphs with MUSCIMA++ metadata and a single sprite holding a packed mask.
+    """
+
+    def __init__(
+        self,
+        columns: Dict[str, np.ndarray],
+        masks: np.ndarray,
+        max_materialized_glyphs: int = 1024
+    ):
+        assert max_materialized_glyphs >= 0
+        self.columns = columns
+        "The columnar index, each column has one value per glyph"
+
+        self.masks = masks
+        "All packed masks as one flat (memory-mapped) uint8 array"
+
+        self.type_names: List[str] = columns["type_names"].tolist()
+        "Names of the glyph types, indexed by the glyph_type column"
+
+        self.class_names: List[str] = columns["class_names"].tolist()
+        "Names of the glyph classes, indexed by the glyph_class column"
+
+        self.max_materialized_glyphs = max_materialized_glyphs
+        "How many materialized glyphs are kept (0 keeps none)"
+
+        self._materialized: OrderedDict[int, Glyph] = OrderedDict()
+        """Materialized glyphs by their row, from the least recently
+        requested to the most"""
+
+        self._lock = threading.Lock()
+        "Guards the materialized glyphs when used from multiple threads"
+
+    def __len__(self) -> int:
+        return len(self.columns["mpp_writer"])
+
+    @staticmethod
+    def load(
+        directory: Path,
+        max_materialized_glyphs: int = 1024
+    ) -> "GlyphIndex":
+        """Opens the index stored in the given directory"""
+        with np.load(directory / INDEX_FILE) as file:
+            columns = {name: file[name] for name in file.files}
+
+        masks_path = directory / MASKS_FILE
+        if masks_path.stat().st_size == 0:
+            masks = np.zeros(shape=(0,), dtype=np.uint8) # cannot map empty
+        else:
+            masks = np.memmap(masks_path, dtype=np.uint8, mode="r")
+
+        return GlyphIndex(columns, masks, max_materialized_glyphs)
+
+    @staticmethod
+    def write(glyphs: Sequence[Glyph], directory: Path):
+        """Stores the glyphs into the given directory"""
+        directory.mkdir(parents=True, exist_ok=True)
+
+        type_names: List[str] = []
+        class_names: List[str] = []
+        rows: List[tuple] = []
+        offset = 0
+
+        with open(directory / MASKS_FILE, "wb") as masks_file:
+            for glyph in glyphs:
+                metadata = MppGlyphMetadata.of_glyph(glyph, fail_if_none=True)
+                assert type(glyph).__name__ in _GLYPH_TYPES, \
+                    f"Glyph type {type(glyph)} cannot be stored in the index"
+                assert len(glyph.sprites) == 1, \
+                    "Only glyphs with exactly one sprite can be stored"
+                sprite = glyph.sprites[0]
+                assert sprite.mask is not None, \
+                    "Only sprites holding a packed mask can be stored"
+                assert _is_identity(glyph.space.transform)
+                assert _is_identity(sprite.transform)
+
+                if type(glyph).__name__ not in type_names:
+                    type_names.append(type(glyph).__name__)
+                if glyph.glyph_class not in class_names:
+                    class_names.append(glyph.glyph_class)
+
+                if isinstance(glyph, LineGlyph):
+                    line = (
+                        glyph.start_point.point.x, glyph.start_point.point.y,
+                        glyph.end_point.point.x, glyph.end_point.point.y
+                    )
+                else:
+                    line = (np.nan, np.nan, np.nan, np.nan)
+
+                mask = sprite.mask
+                masks_file.write(np.ascontiguousarray(mask.packed).data)
+                rows.append((
+                    type_names.index(type(glyph).__name__),
+                    class_names.index(glyph.glyph_class),
+                    metadata.mpp_writer,
+                    metadata.mpp_piece,
+                    metadata.mpp_numeric_objid,
+                    offset,
+                    mask.width,
+                    mask.height,
+                    mask.ink_color,
+                    sprite.bitmap_origin.x,
+                    sprite.bitmap_origin.y,
+                    sprite.dpi,
+                    *line
+                ))
+                offset += mask.nbytes
+
+        def column(i: int, dtype) -> np.ndarray:
+            return np.array([row[i] for row in rows], dtype=dtype)
+
+        np.savez(
+            directory / INDEX_FILE,
+            type_names=np.array(type_names, dtype=np.str_),
+            class_names=np.array(class_names, dtype=np.str_),
+            glyph_type=column(0, np.int16),
+            glyph_class=column(1, np.int16),
+            mpp_writer=column(2, np.int8),
+            mpp_piece=column(3, np.int8),
+            mpp_numeric_objid=column(4, np.int32),
+            mask_offset=column(5, np.int64),
+            mask_width=column(6, np.int32),
+            mask_height=column(7, np.int32),
+            ink_color=column(8, np.uint8).reshape(-1, 4),
+            origin_x=column(9, np.float64),
+            origin_y=column(10, np.float64),
+            dpi=column(11, np.float64),
+            line_start_x=column(12, np.float64),
+            line_start_y=column(13, np.float64),
+            line_end_x=column(14, np.float64),
+            line_end_y=column(15, np.float64),
+        )
+
+    @staticmethod
+    def concatenate(
+        sources: Sequence[Tuple[Path, np.ndarray]],
+        directory: Path
+    ):
+        """Stores the given rows of the indices in the given source
+        directories into a single index in the given directory (in the given
+        order). Sources are read one at a time and no glyphs are materialized,
+        nor are the masks memory-mapped, so the sources can be removed
+        right after."""
+        directory.mkdir(parents=True, exist_ok=True)
+
+        type_names: List[str] = []
+        class_names: List[str] = []
+        parts: Dict[str, List[np.ndarray]] = {}
+        offset = 0
+
+        def remap(names: List[str], source_names: List[str], ids: np.ndarray):
+            # names are added in the order of their first use,
+            # the same way GlyphIndex.write does
+            _, first_rows = np.unique(ids, return_index=True)
+            for i in ids[np.sort(first_rows)]:
+                if source_names[i] not in names:
+                    names.append(source_names[i])
+            mapping = np.array(
+                [names.index(n) if n in names else -1 for n in source_names],
+                dtype=ids.dtype
+            )
+            return mapping[ids]
+
+        with open(directory / MASKS_FILE, "wb") as masks_file:
+            for source, rows in sources:
+                with np.load(source / INDEX_FILE) as file:
+                    columns = {
+                        name: file[name][rows] for name in file.files
+                        if name not in ("type_names", "class_names")
+                    }
+                    source_type_names = file["type_names"].tolist()
+                    source_class_names = file["class_names"].tolist()
+                masks = np.fromfile(source / MASKS_FILE, dtype=np.uint8)
+
+                columns["glyph_type"] = remap(
+                    type_names, source_type_names, columns["glyph_type"]
+                )
+                columns["glyph_class"] = remap(
+                    class_names, source_class_names, columns["glyph_class"]
+                )
+
+                sizes = columns["mask_height"].astype(np.int64) \
+                    * ((columns["mask_width"].astype(np.int64) + 7) // 8)
+                for mask_offset, size in zip(
+                    columns["mask_offset"].tolist(), sizes.tolist()
+                ):
+                    masks_file.write(
+                        masks[mask_offset:mask_offset+size].data
+                    )
+                columns["mask_offset"] = offset + np.cumsum(sizes) - sizes
+                offset += int(sizes.sum())
+
+                for name, column in columns.items():
+                    parts.setdefault(name, []).append(column)
+                del masks
+
+        np.savez(
+            directory / INDEX_FILE,
+            type_names=np.array(type_names, dtype=np.str_),
+            class_names=np.array(class_names, dtype=np.str_),
+            **{
+                name: np.concatenate(column_parts)
+                for name, column_parts in parts.items()
+            }
+        )
+
+    def rows_where(self, **conditions) -> np.ndarray:
+        """Returns rows whose columns equal the given values,
+        e.g. rows_where(mpp_writer=3)"""
+        selected = np.ones(shape=(len(self),), dtype=np.bool_)
+        for name, value in conditions.items():
+            if name == "glyph_class":
+                if value not in self.class_names:
+                    return np.zeros(shape=(0,), dtype=np.int64)
+                value = self.class_names.index(value)
+            selected &= self.columns[name] == value
+        return np.flatnonzero(selected)
+
+    def line_length(self, row: int) -> float:
+        """Returns the length of a line glyph, computed the same way
+        as for a materialized glyph"""
+        c = self.columns
+        start = Vector2(
+            float(c["line_start_x"][row]),
+            float(c["line_start_y"][row])
+        )
+        end = Vector2(
+            float(c["line_end_x"][row]),
+            float(c["line_end_y"][row])
+        )
+        return (end - start).magnitude
+
+    def get_glyph_type(self, row: int) -> Type[Glyph]:
+        """Returns the type of the glyph stored in the given row"""
+        return _GLYPH_TYPES[self.type_names[self.columns["glyph_type"][row]]]
+
+    def get_glyph(self, row: int) -> Glyph:
+        """Returns the glyph stored in the given row, materializing it
+        unless it has been requested recently"""
+        with self._lock:
+            glyph = self._materialized.get(row)
+            if glyph is not None:
+                self._materialized.move_to_end(row)
+                return glyph
+
+        glyph = self._materialize(row)
+
+        with self._lock:
+            if self.max_materialized_glyphs > 0:
+                glyph = self._materialized.setdefault(row, glyph)
+                self._materialized.move_to_end(row)
+                while len(self._materialized) > self.max_materialized_glyphs:
+                    self._materialized.popitem(last=False)
+        return glyph
+
+    def _materialize(self, row: int) -> Glyph:
+        c = self.columns
+        glyph = self.get_glyph_type(row)(
+            glyph_class=self.class_names[c["glyph_class"][row]]
+        )
+        MppGlyphMetadata(
+            glyph=glyph,
+            mpp_writer=int(c["mpp_writer"][row]),
+            mpp_piece=int(c["mpp_piece"][row]),
+            mpp_numeric_objid=int(c["mpp_numeric_objid"][row])
+        )
+
+        width = int(c["mask_width"][row])
+        height = int(c["mask_height"][row])
+        offset = int(c["mask_offset"][row])
+        size = height * ((width + 7) // 8)
+        mask = SpriteMask(
+            packed=self.masks[offset:offset+size].reshape(height, -1),
+            width=width,
+            height=height,
+            ink_color=tuple(c["ink_color"][row].tolist())
+        )
+        glyph.sprites = [
+            Sprite(
+                space=glyph.space,
+                bitmap=mask,
+                bitmap_origin=Point(
+                    float(c["origin_x"][row]),
+                    float(c["origin_y"][row])
+                ),
+                dpi=float(c["dpi"][row])
+            )
+        ]
+
+        if isinstance(glyph, LineGlyph):
+            glyph.start_point = ScenePoint(
+                point=Point(
+                    float(c["line_start_x"][row]),
+                    float(c["line_start_y"][row])
+                ),
+                space=glyph.space
+            )
+            glyph.end_point = ScenePoint(
+                point=Point(
+                    float(c["line_end_x"][row]),
+                    float(c["line_end_y"][row])
+                ),
+                space=glyph.space
+            )
+
+        return glyph
@@ -1,4 +1,5 @@
 from smashcima.scene.visual.LineGlyph import LineGlyph
+from typing import List
 import bisect
 import random
 
@@ -9,6 +10,51 @@ def _get_line_length(glyph: LineGlyph) -> float:
     ).magnitude
 
 
+def pick_line_index(
+    line_lengths: List[float],
+    target_length: float,
+    rng: random.Random,
+    percentile_spread=0.1
+) -> int:
+    """Picks a random index into the ascending list of line lengths,
+    from the neighborhood of the target length"""
+    count = len(line_lengths)
+    center = bisect.bisect_left(
+        line_lengths,
+        target_length,
+        0,
+        count
+    )
+    target_items = max(int(count * percentile_spread), 2)
+    
+    # build neighborhood indices
+    start = center - target_items // 2 # inclusive
+    end = center + target_items // 2 # exclusive
+    
+    # clamp end
+    if end > count:
+        shift = end - count
+        start -= shift
+        end -= shift
+    
+    # clamp start
+    if start < 0:
+        shift = 0 - start
+        start += shift
+        end += shift
+
+    # squash end
+    if end > count:
+        end = count
+    
+    # empty
+    if end - start <= 0:
+        raise Exception("Cannot sample an empty list")
+    
+    # sample
+    return rng.randint(start, end - 1)
+
+
 class LineList(list):
     """Container that keeps a list of line glyphs and provides their sampling"""
     def __init__(self, *args, **kwargs):
@@ -26,38 +72,10 @@ class LineList(list):
         rng: random.Random,
         percentile_spread=0.1
     ) -> LineGlyph:
-        center = bisect.bisect_left(
+        index = pick_line_index(
             self.line_lengths,
             target_length,
-            0,
-            len(self)
+            rng,
+            percentile_spread
         )
-        target_items = max(int(len(self) * percentile_spread), 2)
-        
-        # build neighborhood indices
-        start = center - target_items // 2 # inclusive
-        end = center + target_items // 2 # exclusive
-        
-        # clamp end
-        if end > len(self):
-            shift = end - len(self)
-            start -= shift
-            end -= shift
-        
-        # clamp start
-        if start < 0:
-            shift = 0 - start
-            start += shift
-            end += shift
-
-        # squash end
-        if end > len(self):
-            end = len(self)
-        
-        # empty
-        if end - start <= 0:
-            raise Exception("Cannot sample an empty list")
-        
-        # sample
-        index = rng.randint(start, end - 1)
         return self[index]
@@ -1,9 +1,12 @@
 from dataclasses import dataclass
-from smashcima.scene.SceneObject import SceneObject
+from smashcima.scene.SceneObject import SceneObject, LinkDescriptor
 from smashcima.scene.visual.Glyph import Glyph
-from .MppPage import MppPage
-from typing import Optional
-from smashcima.nameof_via_dummy import nameof_via_dummy
+from typing import Optional, ClassVar, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # the page is only used during installation and importing it
+    # would import the muscima library at synthesis time
+    from .MppPage import MppPage
 
 
 @dataclass
@@ -22,6 +25,9 @@ class MppGlyphMetadata(SceneObject):
     mpp_numeric_objid: int = None
     "Id number assigned to the corresponding crop object in the MUSCIMA++ dataset"
 
+    GLYPH_LINK: ClassVar[LinkDescriptor]
+    "Links from glyph metadata to their glyphs"
+
     def __post_init__(self):
         assert self.glyph is not None
         assert self.mpp_writer is not None
@@ -39,7 +45,7 @@ class MppGlyphMetadata(SceneObject):
         return f"MUSCIMA-pp_1.0___CVC-MUSCIMA_W-{w}_N-{n}_D-ideal___{i}"
 
     @staticmethod
-    def stamp_glyph(glyph: Glyph, mpp_page: MppPage, numeric_objid: int):
+    def stamp_glyph(glyph: Glyph, mpp_page: "MppPage", numeric_objid: int):
         # just create an instance and that's it
         # the glyph's inlinks will hold on to the instance
         MppGlyphMetadata(
@@ -49,14 +55,28 @@ class MppGlyphMetadata(SceneObject):
             mpp_numeric_objid=numeric_objid
         )
     
+    def stamp_glyph_instance(self, instance: Glyph):
+        """Stamps an instance of the glyph (see Glyph.create_instance)
+        with the same metadata as this glyph has"""
+        MppGlyphMetadata(
+            glyph=instance,
+            mpp_writer=self.mpp_writer,
+            mpp_piece=self.mpp_piece,
+            mpp_numeric_objid=self.mpp_numeric_objid
+        )
+    
     @staticmethod
     def of_glyph(
         glyph: Glyph,
         fail_if_none=False
     ) -> Optional["MppGlyphMetadata"] | "MppGlyphMetadata":
-        return glyph.get_inlinked(
-            MppGlyphMetadata,
-            nameof_via_dummy(MppGlyphMetadata, lambda m: m.glyph),
+        return MppGlyphMetadata.GLYPH_LINK.get_sources(
+            glyph,
             at_most_one=True,
             fail_if_none=fail_if_none
         )
+
+
+MppGlyphMetadata.GLYPH_LINK = LinkDescriptor.declare(
+    MppGlyphMetadata, lambda m: m.glyph
+)
@@ -1,95 +1,165 @@
 from ...AssetBundle import AssetBundle
 from ...datasets.MuscimaPP import MuscimaPP
-from smashcima.rendering.DebugGlyphRenderer import DebugGlyphRenderer
-from .MppPage import MppPage
-from .MppGlyphClass import MppGlyphClass
-from .get_symbols import \
-    get_full_noteheads, \
-    get_empty_noteheads, \
-    get_normal_barlines, \
-    get_whole_rests, \
-    get_half_rests, \
-    get_quarter_rests, \
-    get_eighth_rests, \
-    get_sixteenth_rests, \
-    get_g_clefs, \
-    get_f_clefs, \
-    get_c_clefs, \
-    get_stems, \
-    get_beams, \
-    get_beam_hooks, \
-    get_ledger_lines
 from .SymbolRepository import SymbolRepository
 from .MppGlyphMetadata import MppGlyphMetadata
+from .PartitionedSymbolRepository import PartitionedSymbolRepository
+from .GlyphIndex import INDEX_FILE
 from pathlib import Path
 import pickle
-from tqdm import tqdm
 import shutil
-import cv2
-from typing import Optional
+from typing import Iterable, Optional, Set
+
+
+# Only the modules needed to load and sample the installed symbol repository
+# are imported here. Installation (muscima, scikit-image, tqdm, requests)
+# and debugging dependencies are imported when those methods are called,
+# so that synthesis workers start up quickly.
 
 
 class MuscimaPPGlyphs(AssetBundle):
     def __post_init__(self):
         self._symbol_repository_cache: Optional[SymbolRepository] = None
 
-        self.muscima_pp = self.dependency_resolver.resolve_bundle(MuscimaPP)
+        self._muscima_pp: Optional[MuscimaPP] = None
+        "The resolved MUSCIMA++ dataset bundle, see the muscima_pp property"
+
+        self.allowed_writers: Optional[Set[int]] = None
+        "Only these writers are loaded from the repository (None allows all)"
+
+        self.denied_writers: Set[int] = set()
+        "These writers are never loaded from the repository"
+
+        self.max_resident_writers: Optional[int] = None
+        "How many writers can be loaded at once (None means unbounded)"
+
+        self.install_workers: Optional[int] = None
+        """Number of processes that extract glyphs during installation
+        (None means one per CPU, 1 extracts in this process)"""
+
+    @property
+    def muscima_pp(self) -> MuscimaPP:
+        """The MUSCIMA++ dataset bundle, resolved on first access
+        (it is needed only to install this bundle)"""
+        if self._muscima_pp is None:
+            self._muscima_pp = self.dependency_resolver \
+                .resolve_bundle(MuscimaPP)
+        return self._muscima_pp
+
+    @property
+    def symbol_repository_directory(self) -> Path:
+        """Directory with the symbol repository, one glyph index per writer"""
+        return self.bundle_directory / "symbol_repository"
 
     @property
     def symbol_repository_path(self) -> Path:
+        """Pickled symbol repository, written by older versions"""
         return self.bundle_directory / "symbol_repository.pkl"
     
+    @property
+    def install_cache_directory(self) -> Path:
+        """Glyphs extracted from individual documents during installation.
+        It lives next to the bundle directory (which is cleared before
+        each installation attempt), so that an interrupted installation
+        can resume. It is removed once the installation succeeds."""
+        return self.bundle_directory.with_name(
+            self.bundle_directory.name + "_install_cache"
+        )
+
     def install(self):
         """Extracts data from the MUSCIMA++ dataset and bundles it up
-        in the symbol repository in a pickle file."""
-        document_paths = list(
+        in the symbol repository, stored as memory-mapped glyph indices
+        partitioned by writer. Documents are processed in parallel, each one
+        is cached once extracted, so an interrupted installation resumes."""
+        from .extract_document_glyphs import extract_document_glyphs
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        from tqdm import tqdm
+
+        document_paths = sorted(
             self.muscima_pp.cropobjects_directory.glob("CVC-MUSCIMA_*-ideal.xml")
         )
+        cache_directory = self.install_cache_directory
+        cache_directory.mkdir(parents=True, exist_ok=True)
+
+        # extract glyphs from the documents that are not cached yet
+        pending_paths = [
+            path for path in document_paths
+            if not (cache_directory / path.stem / INDEX_FILE).is_file()
+        ]
+        if len(document_paths) > len(pending_paths):
+            print(
+                "Resuming, documents already extracted:",
+                len(document_paths) - len(pending_paths)
+            )
+        if self.install_workers == 1:
+            for path in tqdm(pending_paths):
+                extract_document_glyphs(path, cache_directory)
+        else:
+            with ProcessPoolExecutor(self.install_workers) as executor:
+                futures = [
+                    executor.submit(extract_document_glyphs, path, cache_directory)
+                    for path in pending_paths
+                ]
+                for future in tqdm(as_completed(futures), total=len(futures)):
+                    future.result() # re-raises worker exceptions
+
+        # move the extracted glyphs into the glyph indices of their writers,
+        # in the document order, without loading them all into memory
+        # (line lists are built by the repository when loaded)
+        print("Writing...", self.symbol_repository_directory)
+        PartitionedSymbolRepository.write_from_indices(
+            [cache_directory / path.stem for path in document_paths],
+            self.symbol_repository_directory
+        )
 
-        repository = SymbolRepository()
-
-        # go through all the MUSCIMA++ XML files
-        for document_path in tqdm(document_paths):
-            page = MppPage.load(document_path)
-
-            # and extract glyphs
-            repository.add_glyphs(get_full_noteheads(page))
-            repository.add_glyphs(get_empty_noteheads(page))
-            repository.add_glyphs(get_normal_barlines(page))
-            repository.add_glyphs(get_whole_rests(page))
-            repository.add_glyphs(get_half_rests(page))
-            repository.add_glyphs(get_quarter_rests(page))
-            repository.add_glyphs(get_eighth_rests(page))
-            repository.add_glyphs(get_sixteenth_rests(page))
-            repository.add_glyphs(get_g_clefs(page))
-            repository.add_glyphs(get_f_clefs(page))
-            repository.add_glyphs(get_c_clefs(page))
-            repository.add_glyphs(get_stems(page))
-            repository.add_glyphs(get_beams(page))
-            repository.add_glyphs(get_beam_hooks(page))
-            repository.add_glyphs(get_ledger_lines(page))
-
-            # and line indexes
-            repository.index_lines([
-                MppGlyphClass.stem.value,
-                MppGlyphClass.beam.value,
-                MppGlyphClass.beamHook.value,
-                MppGlyphClass.ledgerLine.value
-            ])
-
-            # TODO: and extract distributions
-
-        # dump the repository into a pickle file
-        with open(self.symbol_repository_path, "wb") as file:
-            pickle.dump(repository, file)
-            print("Writing...", self.symbol_repository_path)
+        shutil.rmtree(cache_directory)
     
+    def configure_symbol_repository(
+        self,
+        allowed_writers: Optional[Iterable[int]] = None,
+        denied_writers: Iterable[int] = (),
+        max_resident_writers: Optional[int] = None
+    ):
+        """Sets which writers are loaded from the symbol repository and how
+        many of them can be resident at once. Must be called before the
+        repository is loaded by the synthesizers (e.g. to exclude the writers
+        of a testing set), it drops the previously loaded repository."""
+        self.allowed_writers = None if allowed_writers is None \
+            else set(allowed_writers)
+        self.denied_writers = set(denied_writers)
+        self.max_resident_writers = max_resident_writers
+        self._symbol_repository_cache = None
+
+    def _is_writer_selected(self, writer: int) -> bool:
+        if self.allowed_writers is not None \
+            and writer not in self.allowed_writers:
+            return False
+        return writer not in self.denied_writers
+
     def load_symbol_repository(self) -> SymbolRepository:
-        """Loads the symbol repository from its pickle file"""
+        """Loads the symbol repository of the selected writers. The writers
+        are loaded lazily from their glyph indices (if installed by an older
+        version, the whole repository is loaded and filtered instead)."""
         if self._symbol_repository_cache is None:
-            with open(self.symbol_repository_path, "rb") as file:
-                repository = pickle.load(file)
+            directory = self.symbol_repository_directory
+            if directory.is_dir():
+                repository = PartitionedSymbolRepository(
+                    directory,
+                    writers=[
+                        writer for writer in
+                        PartitionedSymbolRepository.available_writers(directory)
+                        if self._is_writer_selected(writer)
+                    ],
+                    max_resident_writers=self.max_resident_writers
+                )
+            else:
+                with open(self.symbol_repository_path, "rb") as file:
+                    repository = pickle.load(file)
             assert isinstance(repository, SymbolRepository)
+
+            for writer in list(repository.all_writers):
+                if not self._is_writer_selected(writer):
+                    repository.remove_writer(writer)
+
             self._symbol_repository_cache = repository
         
         return self._symbol_repository_cache
@@ -97,6 +167,10 @@ class MuscimaPPGlyphs(AssetBundle):
     def build_debug_folder(self):
         """Creates a debug folder in the bundle folder, where it dumps
         all the extracted glyphs for visual inspection."""
+        from smashcima.rendering.DebugGlyphRenderer import DebugGlyphRenderer
+        from tqdm import tqdm
+        import cv2
+
         repository = self.load_symbol_repository()
         
         debug_folder = self.bundle_directory / "debug"
@@ -0,0 +1,175 @@
+from smashcima.scene.visual.LineGlyph import LineGlyph
+from .SymbolRepository import SymbolRepository
+from .GlyphIndex import GlyphIndex, INDEX_FILE, _GLYPH_TYPES
+from .PooledGlyphList import PooledGlyphList, PooledLineList
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import threading
+
+
+PARTITION_PREFIX = "writer_"
+"Prefix of the partition directory names, followed by the writer number"
+
+
+def partition_directory(directory: Path, writer: int) -> Path:
+    """Returns the directory with the glyph index of the given writer"""
+    return directory / f"{PARTITION_PREFIX}{writer:02d}"
+
+
+class PartitionedSymbolRepository(SymbolRepository):
+    """
+    Symbol repository stored as one glyph index per MUSCIMA++ writer.
+    Only the glyph classes and line lengths are read when the repository
+    is opened. The index of a writer (its mapped masks and materialized
+    glyphs) is loaded when its first glyph is picked. The number of resident
+    writers can be bounded, the least recently used writer is then unloaded.
+
+    All the lookup dictionaries of the repository are available, but they
+    hold pooled lists that load writers on access. Iterating over a list that
+    spans all writers (e.g. all_glyphs) therefore loads all the writers.
+    """
+    def __init__(
+        self,
+        directory: Path,
+        writers: Sequence[int],
+        max_resident_writers: Optional[int] = None
+    ):
+        super().__init__()
+        assert max_resident_writers is None or max_resident_writers >= 1
+
+        self.directory = directory
+        "Directory with the writer partitions"
+
+        self.max_resident_writers = max_resident_writers
+        "How many writers can be loaded at once (None means unbounded)"
+
+        self._resident: OrderedDict[int, GlyphIndex] = OrderedDict()
+        "Loaded writer indices, from the least recently used to the most"
+
+        self._lock = threading.Lock()
+        "Guards the resident writers when used from multiple threads"
+
+        self._build_lookups(sorted(writers))
+
+    @staticmethod
+    def available_writers(directory: Path) -> List[int]:
+        """Lists writers stored in the partitioned repository directory"""
+        return sorted(
+            int(path.name[len(PARTITION_PREFIX):])
+            for path in directory.glob(PARTITION_PREFIX + "*")
+            if (path / INDEX_FILE).is_file()
+        )
+
+    @staticmethod
+    def write_from_indices(sources: Sequence[Path], directory: Path):
+        """Stores the glyphs of the glyph indices in the source directories
+        into the directory, partitioned by writer. The glyphs are never
+        materialized, only one source index is read at a time."""
+        rows_by_writer: Dict[int, List[Tuple[Path, np.ndarray]]] = {}
+        for source in sources:
+            with np.load(source / INDEX_FILE) as file:
+                writers = file["mpp_writer"]
+            for writer in np.unique(writers).tolist():
+                rows_by_writer.setdefault(writer, []).append(
+                    (source, np.flatnonzero(writers == writer))
+                )
+
+        for writer, writer_sources in sorted(rows_by_writer.items()):
+            GlyphIndex.concatenate(
+                writer_sources,
+                partition_directory(directory, writer)
+            )
+
+    def load_writer(self, writer: int) -> GlyphIndex:
+        """Returns the glyph index of the writer, loading it if needed"""
+        with self._lock:
+            index = self._resident.get(writer)
+            if index is not None:
+                self._resident.move_to_end(writer)
+                return index
+
+            assert writer in self.all_writers, \
+                f"The writer {writer} is not in the repository"
+            index = GlyphIndex.load(partition_directory(self.directory, writer))
+            self._resident[writer] = index
+
+            if self.max_resident_writers is not None:
+                while len(self._resident) > self.max_resident_writers:
+                    self._resident.popitem(last=False)
+
+            return index
+
+    @property
+    def resident_writers(self) -> List[int]:
+        """Writers that are currently loaded, least recently used first"""
+        with self._lock:
+            return list(self._resident.keys())
+
+    def _build_lookups(self, writers: List[int]):
+        load_writer: Callable[[int], GlyphIndex] = self.load_writer
+
+        # glyph class -> [(writers, rows, line lengths)]
+        parts: Dict[str, List[Tuple[np.ndarray, ...]]] = {}
+        glyph_type_names: Dict[str, str] = {}
+        
+        for writer in writers:
+            path = partition_directory(self.directory, writer) / INDEX_FILE
+            with np.load(path) as file:
+                class_names: List[str] = file["class_names"].tolist()
+                type_names: List[str] = file["type_names"].tolist()
+                glyph_classes = file["glyph_class"]
+                glyph_types = file["glyph_type"]
+                dx = file["line_end_x"] - file["line_start_x"]
+                dy = file["line_end_y"] - file["line_start_y"]
+            lengths = np.sqrt(dx * dx + dy * dy) # the same as Vector2
+
+            for class_id, glyph_class in enumerate(class_names):
+                rows = np.flatnonzero(glyph_classes == class_id)
+                if len(rows) == 0:
+                    continue
+                glyph_type_names.setdefault(
+                    glyph_class, type_names[glyph_types[rows[0]]]
+                )
+                parts.setdefault(glyph_class, []).append((
+                    np.full_like(rows, writer), rows, lengths[rows]
+                ))
+            
+            self.all_writers.add(writer)
+
+        def _glyph_list(
+            glyph_class: str,
+            writers: np.ndarray,
+            rows: np.ndarray,
+            lengths: np.ndarray
+        ) -> PooledGlyphList:
+            glyph_type = _GLYPH_TYPES[glyph_type_names[glyph_class]]
+            if issubclass(glyph_type, LineGlyph):
+                return PooledLineList(load_writer, writers, rows, lengths)
+            return PooledGlyphList(load_writer, writers, rows)
+
+        all_writers = []
+        all_rows = []
+        for glyph_class, class_parts in parts.items():
+            for writers_part, rows, lengths in class_parts:
+                self.glyphs_by_class_and_writer[
+                    glyph_class, int(writers_part[0])
+                ] = _glyph_list(glyph_class, writers_part, rows, lengths)
+            self.glyphs_by_class[glyph_class] = _glyph_list(
+                glyph_class,
+                *(np.concatenate(column) for column in zip(*class_parts))
+            )
+            all_writers += [w for w, _, _ in class_parts]
+            all_rows += [r for _, r, _ in class_parts]
+        
+        self.all_glyphs = PooledGlyphList(
+            load_writer,
+            np.concatenate(all_writers or [np.zeros(0, np.int64)]),
+            np.concatenate(all_rows or [np.zeros(0, np.int64)])
+        )
+
+    def remove_writer(self, writer: int):
+        super().remove_writer(writer)
+        with self._lock:
+            self._resident.pop(writer, None)
@@ -0,0 +1,88 @@
+from smashcima.scene.visual.Glyph import Glyph
+from smashcima.scene.visual.LineGlyph import LineGlyph
+from .GlyphIndex import GlyphIndex
+from .LineList import pick_line_index
+from collections.abc import Sequence
+from typing import Callable, Iterator, List
+import numpy as np
+import random
+
+
+class PooledGlyphList(Sequence):
+    """Read-only list of glyphs pooled from the glyph indices of multiple
+    writers. A writer's index is loaded (via the given callback) only when
+    one of its glyphs is accessed."""
+    def __init__(
+        self,
+        load_index: Callable[[int], GlyphIndex],
+        writers: np.ndarray,
+        rows: np.ndarray
+    ):
+        assert writers.shape == rows.shape
+        
+        self.load_index = load_index
+        "Returns the glyph index of the given writer"
+
+        self.writers = writers
+        "Writer of each glyph in this list, in order"
+
+        self.rows = rows
+        "Row of each glyph in the index of its writer, in order"
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _get_glyph(self, i: int) -> Glyph:
+        return self.load_index(int(self.writers[i])) \
+            .get_glyph(int(self.rows[i]))
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._get_glyph(j) for j in range(len(self))[i]]
+        return self._get_glyph(range(len(self))[i])
+
+    def __iter__(self) -> Iterator[Glyph]:
+        for i in range(len(self)):
+            yield self._get_glyph(i)
+
+    def without_writer(self, writer: int) -> "PooledGlyphList":
+        """Returns the list without glyphs of the given writer"""
+        keep = self.writers != writer
+        selected = PooledGlyphList.__new__(type(self))
+        selected.__dict__.update(self.__dict__)
+        selected.writers = self.writers[keep]
+        selected.rows = self.rows[keep]
+        if isinstance(self, PooledLineList):
+            selected.line_lengths = np.asarray(self.line_lengths)[keep].tolist()
+        return selected
+
+
+class PooledLineList(PooledGlyphList):
+    """Pooled counterpart of the LineList, the lines are sorted by their
+    (precomputed) length and sampled without loading the writers"""
+    def __init__(
+        self,
+        load_index: Callable[[int], GlyphIndex],
+        writers: np.ndarray,
+        rows: np.ndarray,
+        lengths: np.ndarray
+    ):
+        order = np.argsort(lengths, kind="stable")
+        super().__init__(load_index, writers[order], rows[order])
+
+        self.line_lengths: List[float] = lengths[order].tolist()
+        "Lengths of the lines, ascending"
+
+    def pick_line(
+        self,
+        target_length: float,
+        rng: random.Random,
+        percentile_spread=0.1
+    ) -> LineGlyph:
+        index = pick_line_index(
+            self.line_lengths,
+            target_length,
+            rng,
+            percentile_spread
+        )
+        return self[index]
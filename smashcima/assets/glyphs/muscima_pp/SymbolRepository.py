@@ -1,9 +1,20 @@
-from typing import List, Dict, Tuple, Set
+from typing import List, Dict, Tuple, Set, Sequence
 from smashcima.scene.visual.Glyph import Glyph
 from .MppGlyphMetadata import MppGlyphMetadata
 from .LineList import LineList
 
 
+def _without_writer(glyphs: Sequence[Glyph], writer: int) -> Sequence[Glyph]:
+    # pooled lists filter over their writers, without loading any glyphs
+    if hasattr(glyphs, "without_writer"):
+        return glyphs.without_writer(writer)
+    kept = [
+        g for g in glyphs
+        if MppGlyphMetadata.of_glyph(g).mpp_writer != writer
+    ]
+    return LineList(kept) if isinstance(glyphs, LineList) else kept
+
+
 class SymbolRepository:
     """
     Extracted glyphs from MUSCIMA++ so that they can be sampled
@@ -45,21 +56,16 @@ class SymbolRepository:
     def remove_writer(self, writer: int):
         """Removes a given writer from the repository completely.
         Can be used to remove testing set when performing synthesis."""
-        self.all_glyphs = list(filter(
-            lambda g: MppGlyphMetadata.of_glyph(g).mpp_writer == writer,
-            self.all_glyphs
-        ))
         self.all_writers.remove(writer)
+        self.all_glyphs = _without_writer(self.all_glyphs, writer)
         for key in self.glyphs_by_class.keys():
-            self.glyphs_by_class[key] = list(filter(
-                lambda g: MppGlyphMetadata.of_glyph(g).mpp_writer == writer,
-                self.glyphs_by_class[key]
-            ))
-        for key in self.glyphs_by_class_and_writer.keys():
-            self.glyphs_by_class_and_writer[key] = list(filter(
-                lambda g: MppGlyphMetadata.of_glyph(g).mpp_writer == writer,
-                self.glyphs_by_class_and_writer[key]
-            ))
+            self.glyphs_by_class[key] = \
+                _without_writer(self.glyphs_by_class[key], writer)
+        self.glyphs_by_class_and_writer = {
+            key: glyphs
+            for key, glyphs in self.glyphs_by_class_and_writer.items()
+            if key[1] != writer
+        }
 
     def index_lines(self, glyph_classes: List[str]):
         """Build line lookup index for each lines collection"""
@@ -72,3 +78,4 @@ class SymbolRepository:
                 if (glyph_class, writer) in self.glyphs_by_class_and_writer:
                     self.glyphs_by_class_and_writer[glyph_class, writer] = \
                         LineList(self.glyphs_by_class_and_writer[glyph_class, writer])
+
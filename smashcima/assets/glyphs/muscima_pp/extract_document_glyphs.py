@@ -0,0 +1,58 @@
+from .MppPage import MppPage
+from .get_symbols import \
+    get_full_noteheads, \
+    get_empty_noteheads, \
+    get_normal_barlines, \
+    get_whole_rests, \
+    get_half_rests, \
+    get_quarter_rests, \
+    get_eighth_rests, \
+    get_sixteenth_rests, \
+    get_g_clefs, \
+    get_f_clefs, \
+    get_c_clefs, \
+    get_stems, \
+    get_beams, \
+    get_beam_hooks, \
+    get_ledger_lines
+from .GlyphIndex import GlyphIndex
+from smashcima.scene.visual.Glyph import Glyph
+from pathlib import Path
+from typing import List
+import os
+import shutil
+
+
+def extract_document_glyphs(document_path: Path, cache_directory: Path):
+    """Extracts glyphs from one MUSCIMA++ document and caches them
+    as a glyph index in the cache directory (runs in a worker process)"""
+    page = MppPage.load(document_path)
+
+    glyphs: List[Glyph] = [
+        *get_full_noteheads(page),
+        *get_empty_noteheads(page),
+        *get_normal_barlines(page),
+        *get_whole_rests(page),
+        *get_half_rests(page),
+        *get_quarter_rests(page),
+        *get_eighth_rests(page),
+        *get_sixteenth_rests(page),
+        *get_g_clefs(page),
+        *get_f_clefs(page),
+        *get_c_clefs(page),
+        *get_stems(page),
+        *get_beams(page),
+        *get_beam_hooks(page),
+        *get_ledger_lines(page),
+    ]
+
+    # TODO: and extract distributions
+
+    # write into a temporary directory first and then rename it,
+    # so that an interrupted write is never mistaken for a cached document
+    directory = cache_directory / document_path.stem
+    temporary = cache_directory / f"{document_path.stem}.{os.getpid()}.tmp"
+    shutil.rmtree(temporary, ignore_errors=True)
+    GlyphIndex.write(glyphs, temporary)
+    shutil.rmtree(directory, ignore_errors=True)
+    temporary.rename(directory)
@@ -4,6 +4,7 @@ from .MppPage import MppPage
 from .MppGlyphMetadata import MppGlyphMetadata
 from .MppGlyphClass import MppGlyphClass
 from smashcima.scene.Sprite import Sprite
+from smashcima.scene.SpriteMask import SpriteMask
 from smashcima.scene.ScenePoint import ScenePoint
 from smashcima.geometry.Point import Point
 from smashcima.scene.visual.Glyph import Glyph
@@ -30,14 +31,11 @@ TALL_BARLINE_THRESHOLD_PX = 150
 BEAM_HOOK_MAX_WIDTH_PX = 25
 
 
-def _mpp_mask_to_sprite_bitmap(mask: np.ndarray):
-    """True/False pixel mask to black on transparent BGRA uint8 bitmap"""
+def _mpp_mask_to_sprite_mask(mask: np.ndarray) -> SpriteMask:
+    """True/False pixel mask to black on transparent packed sprite mask"""
     assert len(mask.shape) == 2
     assert mask.dtype == np.uint8
-    alpha = mask * 255
-    color = np.zeros_like(mask)
-    bitmap = np.stack([color, color, color, alpha], axis=2)
-    return bitmap
+    return SpriteMask.from_mask(mask, ink_color=(0, 0, 0, 255))
 
 
 def _crop_objects_to_single_sprite_glyphs(
@@ -57,7 +55,7 @@ def _crop_objects_to_single_sprite_glyphs(
         glyph.sprites = [
             Sprite(
                 space=glyph.space,
-                bitmap=_mpp_mask_to_sprite_bitmap(o.mask),
+                bitmap=_mpp_mask_to_sprite_mask(o.mask),
                 bitmap_origin=(
                     sprite_origin(o) if sprite_origin else Point(0.5, 0.5)
                 ),
@@ -143,7 +141,7 @@ def _crop_objects_to_line_glyphs(
         MppGlyphMetadata.stamp_glyph(glyph, page, int(o.objid))
         sprite = Sprite(
             space=glyph.space,
-            bitmap=_mpp_mask_to_sprite_bitmap(o.mask),
+            bitmap=_mpp_mask_to_sprite_mask(o.mask),
             bitmap_origin=Point(0.5, 0.5),
             dpi=MUSCIMA_PP_DPI
         )
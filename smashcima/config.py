@@ -12,3 +12,10 @@ MC_CACHE_HOME = os.path.expanduser(os.getenv("MC_HOME", DEFAULT_MC_CACHE_HOME))
 # default asset repository path
 DEFAULT_MC_ASSETS_CACHE = os.path.join(MC_CACHE_HOME, "assets")
 MC_ASSETS_CACHE = Path(os.getenv("MC_ASSETS_CACHE", DEFAULT_MC_ASSETS_CACHE))
+
+# parsed score cache path, scores are cached on the disk only when it is set
+# (cached scores are pickles and loading a pickle can run arbitrary code,
+# so only point it to a directory that no untrusted user can write to)
+_MC_SCORE_CACHE = os.getenv("MC_SCORE_CACHE", "")
+MC_SCORE_CACHE = None if _MC_SCORE_CACHE.strip().lower() in ("", "off") \
+    else Path(_MC_SCORE_CACHE)
@@ -1,31 +1,51 @@
 from .Vector2 import Vector2
+from typing import Any
 
 
 class Point:
-    """Geometric 2D point"""
+    """Geometric 2D point (immutable)"""
+
+    __slots__ = ("x", "y")
+
     def __init__(self, x: float, y: float):
-        self.vector = Vector2(float(x), float(y))
-        "The vector from origin to the point position that defines this point"
+        _set_x(self, float(x))
+        _set_y(self, float(y))
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("Point is immutable")
+
+    def __reduce__(self):
+        return (Point, (self.x, self.y))
+
+    def __setstate__(self, state: dict):
+        # points pickled before the switch to slots
+        _set_x(self, state["vector"].x)
+        _set_y(self, state["vector"].y)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Point):
+            return NotImplemented
+        return self.x == other.x and self.y == other.y
+
+    def __hash__(self) -> int:
+        return hash((self.x, self.y))
     
     @staticmethod
     def from_origin_vector(vector: Vector2) -> "Point":
         return Point(vector.x, vector.y)
 
     @property
-    def x(self) -> float:
-        return self.vector.x
-
-    @property
-    def y(self) -> float:
-        return self.vector.y
+    def vector(self) -> Vector2:
+        "The vector from origin to the point position that defines this point"
+        return Vector2(self.x, self.y)
 
     @property
     def left(self) -> float:
-        return self.vector.x
+        return self.x
 
     @property
     def top(self) -> float:
-        return self.vector.y
+        return self.y
     
     def __repr__(self):
         return f"Point({self.x}, {self.y})"
@@ -36,3 +56,8 @@ class Point:
     def __iter__(self):
         yield self.x
         yield self.y
+
+
+# immutable instances are initialized via the slot descriptors directly
+_set_x = Point.x.__set__
+_set_y = Point.y.__set__
@@ -1,17 +1,60 @@
 from .Point import Point
 from .Rectangle import Rectangle
 from .Quad import Quad
-from typing import List
+from typing import Any, List
 import numpy as np
 
 
 class Polygon:
     """
     Polygon is a list of points that enclose an area.
+    The points are stored as a read-only [N, 2] numpy array of (x, y)
+    coordinates, so that whole polygons can be transformed and measured
+    at once. The polygon is immutable.
     """
 
+    __slots__ = ("array",)
+
     def __init__(self, points: List[Point]):
-        self.points = points
+        array = np.array(
+            [(p.x, p.y) for p in points],
+            dtype=np.float64
+        ).reshape(-1, 2)
+        array.flags.writeable = False
+        _set_array(self, array)
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("Polygon is immutable")
+
+    def __reduce__(self):
+        return (Polygon.from_array, (self.array,))
+
+    def __setstate__(self, state: dict):
+        # polygons pickled before the switch to slots
+        array = np.array(
+            [(p.x, p.y) for p in state["points"]],
+            dtype=np.float64
+        ).reshape(-1, 2)
+        array.flags.writeable = False
+        _set_array(self, array)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Polygon):
+            return NotImplemented
+        return np.array_equal(self.array, other.array)
+
+    def __hash__(self) -> int:
+        return hash((self.array.shape, self.array.tobytes()))
+
+    @staticmethod
+    def from_array(array: np.ndarray) -> "Polygon":
+        """Constructs a polygon from an [N, 2] array of point coordinates"""
+        assert len(array.shape) == 2 and array.shape[1] == 2
+        array = np.array(array, dtype=np.float64)
+        array.flags.writeable = False
+        polygon = Polygon.__new__(Polygon)
+        _set_array(polygon, array)
+        return polygon
 
     @staticmethod
     def from_rectangle(rectangle: Rectangle) -> "Polygon":
@@ -24,28 +67,38 @@ class Polygon:
             rectangle.bottom_left_corner
         ])
 
+    @staticmethod
     def from_quad(quad: Quad) -> "Polygon":
         """Constructs a polygon from a quad."""
-        return Polygon([quad.a, quad.b, quad.c, quad.d])
+        return Polygon.from_array(quad.array)
 
+    @staticmethod
     def from_cv2_contour(contour: np.ndarray) -> "Polygon":
         """Constructs a polygon from an OpenCV contour instance"""
         # enumerated points are vertical vectors: [[X, Y]]
-        return Polygon([Point(p[0, 0], p[0, 1]) for p in contour])
+        return Polygon.from_array(
+            contour.reshape(-1, 2).astype(np.float64)
+        )
+
+    @property
+    def points(self) -> List[Point]:
+        """Returns the polygon points as a list"""
+        return [Point(x, y) for x, y in self.array.tolist()]
     
     def __repr__(self):
-        return f"Quad({self.a}, {self.b}, {self.c}, {self.d})"
+        return f"Polygon({self.points})"
     
     def bbox(self) -> Rectangle:
         """Returns the bounding box of the polygon"""
-        pts = self.points
-        top = min(p.y for p in pts)
-        bottom = max(p.y for p in pts)
-        left = min(p.x for p in pts)
-        right = max(p.x for p in pts)
+        left, top = self.array.min(axis=0).tolist()
+        right, bottom = self.array.max(axis=0).tolist()
         return Rectangle(
             x=left,
             y=top,
             width=right-left,
             height=bottom-top
         )
+
+
+# immutable instances are initialized via the slot descriptors directly
+_set_array = Polygon.array.__set__
@@ -1,6 +1,7 @@
 from .Point import Point
 from .Rectangle import Rectangle
-from typing import List
+from typing import Any, List
+import numpy as np
 
 
 class Quad:
@@ -10,13 +11,52 @@ class Quad:
     You can turn it back to a rectangle by getting the bounding box (bbox).
     It's created from a rectangle by going over its corners from the left top
     corner in the clockwise direction.
+    The points are stored as a read-only [4, 2] numpy array
+    of (x, y) coordinates. The quad is immutable.
     """
 
+    __slots__ = ("array",)
+
     def __init__(self, a: Point, b: Point, c: Point, d: Point):
-        self.a = a
-        self.b = b
-        self.c = c
-        self.d = d
+        array = np.array(
+            [(a.x, a.y), (b.x, b.y), (c.x, c.y), (d.x, d.y)],
+            dtype=np.float64
+        )
+        array.flags.writeable = False
+        _set_array(self, array)
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("Quad is immutable")
+
+    def __reduce__(self):
+        return (Quad.from_array, (self.array,))
+
+    def __setstate__(self, state: dict):
+        # quads pickled before the switch to slots
+        array = np.array(
+            [(state[k].x, state[k].y) for k in "abcd"],
+            dtype=np.float64
+        )
+        array.flags.writeable = False
+        _set_array(self, array)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Quad):
+            return NotImplemented
+        return np.array_equal(self.array, other.array)
+
+    def __hash__(self) -> int:
+        return hash(self.array.tobytes())
+
+    @staticmethod
+    def from_array(array: np.ndarray) -> "Quad":
+        """Constructs a quad from a [4, 2] array of point coordinates"""
+        assert array.shape == (4, 2)
+        array = np.array(array, dtype=np.float64)
+        array.flags.writeable = False
+        quad = Quad.__new__(Quad)
+        _set_array(quad, array)
+        return quad
 
     @staticmethod
     def from_rectangle(rectangle: Rectangle) -> "Quad":
@@ -29,24 +69,41 @@ class Quad:
             d=rectangle.bottom_left_corner
         )
 
+    @property
+    def a(self) -> Point:
+        return Point(*self.array[0].tolist())
+
+    @property
+    def b(self) -> Point:
+        return Point(*self.array[1].tolist())
+
+    @property
+    def c(self) -> Point:
+        return Point(*self.array[2].tolist())
+
+    @property
+    def d(self) -> Point:
+        return Point(*self.array[3].tolist())
+
     @property
     def points(self) -> List[Point]:
         """Returns the quad points as a list"""
-        return [self.a, self.b, self.c, self.d]
+        return [Point(x, y) for x, y in self.array.tolist()]
     
     def __repr__(self):
         return f"Quad({self.a}, {self.b}, {self.c}, {self.d})"
     
     def bbox(self) -> Rectangle:
         """Returns the bounding box of the quad"""
-        pts = self.points
-        top = min(p.y for p in pts)
-        bottom = max(p.y for p in pts)
-        left = min(p.x for p in pts)
-        right = max(p.x for p in pts)
+        left, top = self.array.min(axis=0).tolist()
+        right, bottom = self.array.max(axis=0).tolist()
         return Rectangle(
             x=left,
             y=top,
             width=right-left,
             height=bottom-top
         )
+
+
+# immutable instances are initialized via the slot descriptors directly
+_set_array = Quad.array.__set__
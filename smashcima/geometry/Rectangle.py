@@ -1,14 +1,41 @@
 from .Point import Point
 from math import ceil, floor
+from typing import Any
 
 
 class Rectangle:
+    """Axis-aligned rectangle (immutable)"""
+
+    __slots__ = ("x", "y", "width", "height")
+
     def __init__(self, x: float, y: float, width: float, height: float):
         assert width >= 0 and height >= 0, "Rectangle cannot have negative size"
-        self.x = float(x)
-        self.y = float(y)
-        self.width = float(width)
-        self.height = float(height)
+        _set_x(self, float(x))
+        _set_y(self, float(y))
+        _set_width(self, float(width))
+        _set_height(self, float(height))
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("Rectangle is immutable")
+
+    def __reduce__(self):
+        return (Rectangle, (self.x, self.y, self.width, self.height))
+
+    def __setstate__(self, state: dict):
+        # rectangles pickled before the switch to slots
+        _set_x(self, state["x"])
+        _set_y(self, state["y"])
+        _set_width(self, state["width"])
+        _set_height(self, state["height"])
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Rectangle):
+            return NotImplemented
+        return self.x == other.x and self.y == other.y \
+            and self.width == other.width and self.height == other.height
+
+    def __hash__(self) -> int:
+        return hash((self.x, self.y, self.width, self.height))
     
     @property
     def left(self) -> float:
@@ -121,3 +148,10 @@ class Rectangle:
             width=width,
             height=height
         )
+
+
+# immutable instances are initialized via the slot descriptors directly
+_set_x = Rectangle.x.__set__
+_set_y = Rectangle.y.__set__
+_set_width = Rectangle.width.__set__
+_set_height = Rectangle.height.__set__
@@ -1,10 +1,10 @@
+import math
 import numpy as np
-import cv2
 from .Vector2 import Vector2
 from .Point import Point
 from .Quad import Quad
 from .Polygon import Polygon
-from typing import TypeVar
+from typing import Any, TypeVar
 
 
 T = TypeVar("T")
@@ -16,62 +16,122 @@ class Transform:
 
     When used in scene objects, it maps from the local space
     to the parent object's space.
+
+    The transform is immutable and it is stored as six plain floats,
+    because numpy calls are far more expensive than the arithmetic itself
+    for such small matrices. The numpy matrix is built lazily when needed.
     """
 
     # Based on:
     # https://www.w3.org/TR/SVGTiny12/coords.html#TransformAttribute
+    # The matrix is:
+    # [a c e]
+    # [b d f]
+
+    __slots__ = ("a", "b", "c", "d", "e", "f", "_matrix")
 
     def __init__(self, matrix: np.ndarray):
         assert matrix.shape == (2, 3)
         assert matrix.dtype == np.float64
-        
-        self.matrix = matrix
-        "The 2x3 transformation matrix as a numpy array"
-    
+
+        (a, c, e), (b, d, f) = matrix.tolist()
+        _initialize(self, a, b, c, d, e, f)
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("Transform is immutable")
+
+    @staticmethod
+    def from_coefficients(
+        a: float, b: float, c: float, d: float, e: float, f: float
+    ) -> "Transform":
+        """Creates the transform from the SVG matrix(a, b, c, d, e, f)
+        coefficients, without going through a numpy array"""
+        transform = Transform.__new__(Transform)
+        _initialize(transform, a, b, c, d, e, f)
+        return transform
+
+    def __getstate__(self):
+        return (self.a, self.b, self.c, self.d, self.e, self.f)
+
+    def __setstate__(self, state):
+        # transforms pickled before the switch to slots stored the matrix
+        if isinstance(state, dict):
+            (a, c, e), (b, d, f) = state["matrix"].tolist()
+            _initialize(self, a, b, c, d, e, f)
+        else:
+            _initialize(self, *state)
+
+    def __repr__(self):
+        return f"Transform([[{self.a}, {self.c}, {self.e}], " + \
+            f"[{self.b}, {self.d}, {self.f}]])"
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """The 2x3 transformation matrix as a read-only numpy array"""
+        if self._matrix is None:
+            matrix = np.array([
+                [self.a, self.c, self.e],
+                [self.b, self.d, self.f]
+            ], dtype=np.float64)
+            matrix.flags.writeable = False
+            _set_matrix(self, matrix)
+        return self._matrix
+
     @property
     def matrix3(self) -> np.ndarray:
         """The 3x3 extended matrix of this transformation"""
-        return np.concatenate(
-            (self.matrix, np.array([[0, 0, 1]], dtype=np.float64)),
-            axis=0
-        )
-    
+        return np.array([
+            [self.a, self.c, self.e],
+            [self.b, self.d, self.f],
+            [0, 0, 1]
+        ], dtype=np.float64)
+
     @property
     def matrix2(self) -> np.ndarray:
         """The 2x2 matrix that ignores translation"""
         return self.matrix[0:2, 0:2]
-    
+
     @property
     def determinant(self) -> float:
         """Returns the determinant of the affine transformation"""
-        return np.linalg.det(self.matrix2)
-    
+        return self.a * self.d - self.c * self.b
+
     def apply_to(self, other: T) -> T:
         """Transform a vector or another transformation"""
-        m = self.matrix3
         if isinstance(other, Transform):
-            o = other.matrix3
-            r = m.dot(o)
-            return Transform(r[0:2, :])
+            return Transform.from_coefficients(
+                a=self.a * other.a + self.c * other.b,
+                b=self.b * other.a + self.d * other.b,
+                c=self.a * other.c + self.c * other.d,
+                d=self.b * other.c + self.d * other.d,
+                e=self.a * other.e + self.c * other.f + self.e,
+                f=self.b * other.e + self.d * other.f + self.f
+            )
         elif isinstance(other, Vector2):
-            o = np.array([[other.x], [other.y], [1]], dtype=np.float64)
-            r = m.dot(o)
-            return Vector2(r[0, 0], r[1, 0])
+            return Vector2(
+                self.a * other.x + self.c * other.y + self.e,
+                self.b * other.x + self.d * other.y + self.f
+            )
         elif isinstance(other, Point):
-            v = self.apply_to(other.vector)
-            return Point(v.x, v.y)
+            return Point(
+                self.a * other.x + self.c * other.y + self.e,
+                self.b * other.x + self.d * other.y + self.f
+            )
         elif isinstance(other, Quad):
-            pts = [self.apply_to(p) for p in other.points]
-            return Quad(*pts)
+            return Quad.from_array(self.apply_to_array(other.array))
         elif isinstance(other, Polygon):
-            pts = [self.apply_to(p) for p in other.points]
-            return Polygon(pts)
+            return Polygon.from_array(self.apply_to_array(other.array))
         else:
             raise ValueError("Transform applied to an unexpected type")
-    
+
+    def apply_to_array(self, points: np.ndarray) -> np.ndarray:
+        """Transforms an [N, 2] array of (x, y) point coordinates at once"""
+        assert len(points.shape) == 2 and points.shape[1] == 2
+        return points.dot(self.matrix[:, 0:2].T) + self.matrix[:, 2]
+
     def __matmul__(self, other: T) -> T:
         return self.apply_to(other)
-    
+
     def then(self, other: "Transform") -> "Transform":
         """
         Lets you chain transformations, thereby defining a new transformation.
@@ -79,41 +139,55 @@ class Transform:
         to be chronological in terms of going from local spaces up towards
         the global scene space.
         """
-        return other @ self
+        return other.apply_to(self)
 
     @staticmethod
     def identity() -> "Transform":
         """Returns the identity transform"""
-        return Transform(
-            np.array([
-                [1, 0, 0],
-                [0, 1, 0]
-            ], dtype=np.float64)
-        )
+        return Transform.from_coefficients(1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
 
     @staticmethod
     def translate(offset: Vector2) -> "Transform":
         """Returns a translation transform"""
-        return Transform(
-            np.array([
-                [1, 0, offset.x],
-                [0, 1, offset.y]
-            ], dtype=np.float64)
+        return Transform.from_coefficients(
+            1.0, 0.0, 0.0, 1.0, float(offset.x), float(offset.y)
         )
-    
+
     @staticmethod
     def scale(scale: float) -> "Transform":
         """Returns a scaling transform"""
-        return Transform(
-            np.array([
-                [scale, 0, 0],
-                [0, scale, 0]
-            ], dtype=np.float64)
-        )
-    
+        scale = float(scale)
+        return Transform.from_coefficients(scale, 0.0, 0.0, scale, 0.0, 0.0)
+
     @staticmethod
     def rotateDegCC(angle: float):
         """Creates a rotation transform for a coutner-clockwise rotation
         of a given number of degrees"""
-        matrix = cv2.getRotationMatrix2D((0, 0), angle, 1)
-        return Transform(matrix)
+        # the same matrix as cv2.getRotationMatrix2D((0, 0), angle, 1)
+        radians = angle * math.pi / 180
+        alpha = math.cos(radians)
+        beta = math.sin(radians)
+        return Transform.from_coefficients(alpha, -beta, beta, alpha, 0.0, 0.0)
+
+
+# immutable instances are initialized via the slot descriptors directly
+_set_a = Transform.a.__set__
+_set_b = Transform.b.__set__
+_set_c = Transform.c.__set__
+_set_d = Transform.d.__set__
+_set_e = Transform.e.__set__
+_set_f = Transform.f.__set__
+_set_matrix = Transform._matrix.__set__
+
+
+def _initialize(
+    transform: Transform,
+    a: float, b: float, c: float, d: float, e: float, f: float
+):
+    _set_a(transform, a)
+    _set_b(transform, b)
+    _set_c(transform, c)
+    _set_d(transform, d)
+    _set_e(transform, e)
+    _set_f(transform, f)
+    _set_matrix(transform, None)
@@ -3,11 +3,32 @@ from typing import Generator, Any
 
 
 class Vector2:
-    """Mathematical 2D vector"""
+    """Mathematical 2D vector (immutable)"""
+
+    __slots__ = ("x", "y")
 
     def __init__(self, x: float, y: float):
-        self.x = float(x)
-        self.y = float(y)
+        _set_x(self, float(x))
+        _set_y(self, float(y))
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("Vector2 is immutable")
+
+    def __reduce__(self):
+        return (Vector2, (self.x, self.y))
+
+    def __setstate__(self, state: dict):
+        # vectors pickled before the switch to slots
+        _set_x(self, state["x"])
+        _set_y(self, state["y"])
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Vector2):
+            return NotImplemented
+        return self.x == other.x and self.y == other.y
+
+    def __hash__(self) -> int:
+        return hash((self.x, self.y))
     
     @property
     def left(self) -> float:
@@ -81,3 +102,8 @@ class Vector2:
         if m == 0:
             raise Exception("Zero vector cannot be normalized")
         return self / m
+
+
+# immutable instances are initialized via the slot descriptors directly
+_set_x = Vector2.x.__set__
+_set_y = Vector2.y.__set__
@@ -16,19 +16,23 @@ from ..scene.semantic.Chord import Chord
 from ..scene.semantic.StemValue import StemValue
 from ..scene.semantic.BeamedGroup import BeamedGroup
 from ..scene.semantic.BeamValue import BeamValue
-from typing import List, TextIO, Optional, Dict
+from typing import List, TextIO, BinaryIO, Optional, Dict, Set, Union, \
+    Iterator, Tuple
 from fractions import Fraction
 from dataclasses import dataclass, field
+from pathlib import Path
 import io
+import tarfile
+import zipfile
 
 
 @dataclass
 class _ScoreState:
-    new_system_measures: List[Measure] = field(default_factory=list)
-    "Measures that should be placed on new systems (line breaks)"
+    new_system_measure_indices: Set[int] = field(default_factory=set)
+    "Indices of measures that should be placed on new systems (line breaks)"
 
-    new_page_measures: List[Measure] = field(default_factory=list)
-    "Measures that should be placed on new pages (page breaks)"
+    new_page_measure_indices: Set[int] = field(default_factory=set)
+    "Indices of measures that should be placed on new pages (page breaks)"
 
 
 @dataclass
@@ -39,6 +43,10 @@ class _PartState:
     part: Part
     "The part that is being constructed as it's being parsed"
 
+    measures: List[Measure] = field(default_factory=list)
+    """Measures parsed so far, they are assigned to the part at once
+    (linked in bulk) when the whole part is parsed"""
+
     measure_number: Optional[str] = None
     "Currently parsed measure number, or None if it was not yet defined/parsed"
 
@@ -95,6 +103,49 @@ IGNORED_MEASURE_ELEMENTS = set([
 ])
 
 
+LOADER_VERSION = 1
+"""Version of the loader output, bump it whenever the loader starts
+producing different scores from the same MusicXML (invalidates caches)"""
+
+MXL_CONTAINER_FILE = "META-INF/container.xml"
+"Path of the file inside .mxl archives that lists the score root file"
+
+SCORE_MEMBER_SUFFIXES = (".musicxml", ".xml", ".mxl")
+"Suffixes of archive members that are loaded as scores"
+
+
+def _get_mxl_root_file(archive: zipfile.ZipFile) -> str:
+    """Returns the path of the score root file inside an .mxl archive"""
+    try:
+        container = ET.fromstring(archive.read(MXL_CONTAINER_FILE))
+    except KeyError:
+        container = None
+    
+    # the first root file is the score
+    # (the container has no namespace in the MusicXML specification,
+    # but some writers use the OCF container namespace, so any is matched)
+    if container is not None:
+        for rootfile in container.iterfind(".//{*}rootfile"):
+            full_path = rootfile.attrib.get("full-path")
+            if full_path is not None:
+                return full_path
+        raise Exception(f"The {MXL_CONTAINER_FILE} lists no root file.")
+    
+    # archives without the container hold the score as the only XML file
+    for name in archive.namelist():
+        if not name.startswith("META-INF/") \
+            and name.lower().endswith((".musicxml", ".xml")):
+            return name
+    raise Exception("The .mxl archive contains no MusicXML file.")
+
+
+def _is_score_member(name: str) -> bool:
+    # META-INF holds archive metadata, not scores
+    return name.lower().endswith(SCORE_MEMBER_SUFFIXES) \
+        and not name.startswith("META-INF/") \
+        and "/META-INF/" not in name
+
+
 class MusicXmlLoader:
     """Loads MusicXML into the scene data model"""
 
@@ -120,13 +171,55 @@ class MusicXmlLoader:
             header = f"[ERROR]:"
         print(header, *values, file=self._errout)
 
-    def load_file(self, path: str) -> Score:
-        """Loads a score from a MusicXML file"""
-        # TODO: handle .mxl files as well
-        # TODO: accept Path instance as well
-        with open(path, "r") as file:
-            tree = ET.parse(file)
-        return self.load(tree)
+    def load_file(self, path: Union[str, Path]) -> Score:
+        """Loads a score from a MusicXML file, streaming it measure by
+        measure (see load_stream). Compressed MusicXML (.mxl) files
+        are decompressed in memory."""
+        path = Path(path)
+        if path.suffix.lower() == ".mxl":
+            return self.load_mxl(path)
+        with open(path, "rb") as file:
+            return self.load_stream(file)
+
+    def load_mxl(self, source: Union[str, Path, BinaryIO]) -> Score:
+        """Loads a score from a compressed MusicXML (.mxl) file or file object.
+        The root file listed in META-INF/container.xml is streamed out of
+        the zip archive, without extracting anything to the disk."""
+        with zipfile.ZipFile(source, "r") as archive:
+            with archive.open(_get_mxl_root_file(archive), "r") as file:
+                return self.load_stream(file)
+
+    def iterate_archive(
+        self,
+        path: Union[str, Path]
+    ) -> Iterator[Tuple[str, Score]]:
+        """Loads all scores stored in a zip or tar archive (a corpus shard),
+        yielding (member name, score) pairs in the archive order. Members
+        can be uncompressed (.musicxml, .xml) or compressed (.mxl) MusicXML
+        files, other members are skipped. Nothing is extracted to the disk
+        and tar archives are read sequentially, as a stream."""
+        if zipfile.is_zipfile(path):
+            with zipfile.ZipFile(path, "r") as archive:
+                for info in archive.infolist():
+                    if info.is_dir() or not _is_score_member(info.filename):
+                        continue
+                    if info.filename.lower().endswith(".mxl"):
+                        data = io.BytesIO(archive.read(info))
+                        yield info.filename, self.load_mxl(data)
+                    else:
+                        with archive.open(info, "r") as file:
+                            yield info.filename, self.load_stream(file)
+        else:
+            with tarfile.open(path, "r|*") as archive:
+                for member in archive:
+                    if not member.isfile() or not _is_score_member(member.name):
+                        continue
+                    file = archive.extractfile(member)
+                    if member.name.lower().endswith(".mxl"):
+                        data = io.BytesIO(file.read())
+                        yield member.name, self.load_mxl(data)
+                    else:
+                        yield member.name, self.load_stream(file)
 
     def load(self, tree: ET.ElementTree) -> Score:
         """Loads a score from a MusicXML XML tree"""
@@ -138,6 +231,79 @@ class MusicXmlLoader:
         score = self._load_score_partwise(score_partwise_element)
         score.validate()
         return score
+
+    def load_stream(self, source: BinaryIO) -> Score:
+        """Loads a score from a MusicXML file object. The XML is parsed
+        incrementally, each measure is loaded as soon as it is parsed and its
+        elements are then discarded. Memory used by the XML therefore stays
+        bounded by the largest measure, not by the whole file."""
+        score_partwise_element: Optional[ET.Element] = None
+        top_element: Optional[ET.Element] = None # current root child
+        score_part_elements: Dict[str, ET.Element] = {}
+        parts: Dict[str, Part] = {}
+        loading_part = False # whether the current <part> is being loaded
+        depth = 0
+
+        for event, element in ET.iterparse(source, events=("start", "end")):
+            if event == "start":
+                depth += 1
+
+                # the root element
+                if depth == 1:
+                    if element.tag != "score-partwise":
+                        raise Exception(
+                            "The loader expects the <score-partwose> " + \
+                            "tag to be the root of the file."
+                        )
+                    score_partwise_element = element
+                    self._score_state = _ScoreState()
+                
+                # the part-list, parts, and the header elements
+                elif depth == 2:
+                    top_element = element
+                    if element.tag == "part":
+                        part_id = element.attrib.get("id")
+                        # parts missing in the part list are ignored,
+                        # the first part with the given ID is used
+                        loading_part = part_id in score_part_elements \
+                            and part_id not in parts
+                        if loading_part:
+                            self._begin_part(part_id)
+                continue
+
+            element_depth = depth
+            depth -= 1
+
+            # measures are loaded and discarded one by one
+            if element_depth == 3 and top_element.tag == "part":
+                if loading_part:
+                    measure = self._load_measure(element)
+                    self._part_state.measures.append(measure)
+                top_element.remove(element)
+
+            elif element_depth == 2:
+                if element.tag == "part-list":
+                    for score_part_element in element:
+                        part_id = score_part_element.attrib.get("id")
+                        if part_id is None:
+                            raise Exception(
+                                "<score-part> element is missing an ID."
+                            )
+                        score_part_elements[part_id] = score_part_element
+                elif element.tag == "part" and loading_part:
+                    parts[element.attrib["id"]] = self._end_part()
+                    loading_part = False
+                score_partwise_element.remove(element)
+
+        # order parts by the part list
+        for part_id in score_part_elements.keys():
+            if part_id not in parts:
+                raise Exception(f"Cannot find <part> with ID '{part_id}'.")
+        score = self._end_score([
+            parts[part_id] for part_id in score_part_elements.keys()
+        ])
+        score.validate()
+        return score
     
     def _load_score_partwise(self, score_partwise_element: ET.Element) -> Score:
         assert score_partwise_element.tag == "score-partwise"
@@ -146,6 +312,11 @@ class MusicXmlLoader:
 
         parts: List[Part] = []
 
+        # index the part elements by their ID (the first one wins)
+        part_elements: Dict[str, ET.Element] = {}
+        for part_element in score_partwise_element.findall("part"):
+            part_elements.setdefault(part_element.attrib.get("id"), part_element)
+
         # go through all the parts
         part_list_element = score_partwise_element.find("part-list")
         for score_part_element in part_list_element:
@@ -154,29 +325,24 @@ class MusicXmlLoader:
                 raise Exception("<score-part> element is missing an ID.")
 
             # find the part element
-            part_elements = [
-                p for p in score_partwise_element.findall("part")
-                if p.attrib.get("id") == part_id
-            ]
-            if len(part_elements) == 0:
+            part_element = part_elements.get(part_id)
+            if part_element is None:
                 raise Exception(f"Cannot find <part> with ID '{part_id}'.")
-            part_element = part_elements[0]
 
             # and parse it
             part = self._load_part(score_part_element, part_element, part_id)
             parts.append(part)
 
+        return self._end_score(parts)
+    
+    def _end_score(self, parts: List[Part]) -> Score:
         # create the part instance
+        # (break indices were recorded while parsing the measures)
+        score_state = self._score_state
         score = Score(
             parts=parts,
-            new_system_measure_indices=set(
-                Part.of_measure(m, fail_if_none=True).measures.index(m)
-                for m in self._score_state.new_system_measures
-            ),
-            new_page_measure_indices=set(
-                Part.of_measure(m, fail_if_none=True).measures.index(m)
-                for m in self._score_state.new_page_measures
-            )
+            new_system_measure_indices=score_state.new_system_measure_indices,
+            new_page_measure_indices=score_state.new_page_measure_indices
         )
 
         self._score_state = None
@@ -194,16 +360,23 @@ class MusicXmlLoader:
         assert score_part_element.attrib["id"] == part_id
         assert part_element.attrib["id"] == part_id
 
-        self._part_state = _PartState(
-            part_id=part_id,
-            part=Part()
-        )
+        self._begin_part(part_id)
 
         for measure_element in part_element:
             measure = self._load_measure(measure_element)
-            self._part_state.part.append_measure(measure)
+            self._part_state.measures.append(measure)
         
+        return self._end_part()
+    
+    def _begin_part(self, part_id: str):
+        self._part_state = _PartState(
+            part_id=part_id,
+            part=Part()
+        )
+    
+    def _end_part(self) -> Part:
         part = self._part_state.part
+        part.measures = self._part_state.measures
         self._part_state = None
 
         # set attributes for each event in the part
@@ -626,14 +799,73 @@ class MusicXmlLoader:
     def _load_print(self, print_element: ET.Element):
         assert print_element.tag == "print"
 
+        # index of the parsed measure within its part
+        # (it is appended to the part measures after it's parsed)
+        measure_index = len(self._part_state.measures)
+
         # parse line breaks
         if print_element.attrib.get("new-system") == "yes":
-            self._score_state.new_system_measures.append(
-                self._measure_state.measure
-            )
+            self._score_state.new_system_measure_indices.add(measure_index)
         
         # parse page breaks
         if print_element.attrib.get("new-page") == "yes":
-            self._score_state.new_page_measures.append(
-                self._measure_state.measure
+            self._score_state.new_page_measure_indices.add(measure_index)
+
+
+# Run by:
+# .venv/bin/python3 -m smashcima.loading.MusicXmlLoader
+if __name__ == "__main__":
+    # Benchmarks the loading of synthetic single-part scores of growing
+    # length, the time per measure should stay flat (linear scaling)
+    import time
+
+    def _synthetic_score(measure_count: int) -> str:
+        attributes = "<attributes><divisions>1</divisions>" + \
+            "<key><fifths>0</fifths></key>" + \
+            "<time><beats>4</beats><beat-type>4</beat-type></time>" + \
+            "<clef><sign>G</sign><line>2</line></clef></attributes>"
+        note = "<note><pitch><step>C</step><octave>5</octave></pitch>" + \
+            "<duration>1</duration><voice>1</voice><type>quarter</type>" + \
+            "<stem>down</stem></note>"
+        measures = []
+        for i in range(measure_count):
+            measures.append(
+                f"<measure number=\"{i + 1}\">" +
+                ("<print new-system=\"yes\"/>" if i % 8 == 0 else "") +
+                (attributes if i == 0 else "") +
+                note * 4 +
+                "</measure>"
             )
+        return "<score-partwise version=\"3.1\"><part-list>" + \
+            "<score-part id=\"P1\"><part-name>Piano</part-name></score-part>" + \
+            "</part-list><part id=\"P1\">" + "".join(measures) + \
+            "</part></score-partwise>"
+
+    for measure_count in [10, 100, 1_000, 10_000]:
+        tree = ET.ElementTree(ET.fromstring(_synthetic_score(measure_count)))
+        start = time.perf_counter()
+        score = MusicXmlLoader().load(tree)
+        seconds = time.perf_counter() - start
+        assert len(score.parts[0].measures) == measure_count
+        print(
+            f"{measure_count:>6} measures: {seconds:.3f} s, " +
+            f"{seconds / measure_count * 1000:.3f} ms per measure"
+        )
+
+    # compares peak memory of loading a parsed tree and of streaming
+    # (the loaded score itself is included in both)
+    import tracemalloc
+    xml = _synthetic_score(10_000).encode("utf-8")
+
+    tracemalloc.start()
+    MusicXmlLoader().load(ET.ElementTree(ET.fromstring(xml)))
+    _, tree_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    MusicXmlLoader().load_stream(io.BytesIO(xml))
+    _, stream_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"Peak memory, parsed tree: {tree_peak / 1024 / 1024:.1f} MiB")
+    print(f"Peak memory, streamed: {stream_peak / 1024 / 1024:.1f} MiB")
@@ -0,0 +1,201 @@
+import gc
+import hashlib
+import io
+import os
+import pickle
+import sys
+import threading
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple, Union
+from ..scene.semantic.Score import Score
+from ..config import MC_SCORE_CACHE
+from .. import __version__
+from .MusicXmlLoader import MusicXmlLoader, LOADER_VERSION
+
+
+def _serialize(score: Score) -> bytes:
+    # the pickled graph is repetitive, fast compression shrinks it ~6x
+    # and costs far less than the unpickling itself
+    return zlib.compress(pickle.dumps(score, pickle.HIGHEST_PROTOCOL), 1)
+
+
+def _deserialize(data: bytes) -> Score:
+    # unpickling a large object graph triggers many garbage collections
+    # that find nothing (everything is reachable), which makes the unpickling
+    # several times slower, so the collector is paused meanwhile
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return pickle.loads(zlib.decompress(data))
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class ScoreCache:
+    """
+    Cache of loaded (parsed) scores, keyed by the hash of the file content
+    and by the loader version. Training epochs load the same scores many
+    times, so a repeated load only deserializes the pickled score graph
+    (compressed with zlib) instead of parsing the MusicXML again.
+
+    The cache has two layers, an in-memory LRU of serialized scores and
+    a persistent directory on the disk (opt-in). Each load returns a new
+    deserialized score instance, since the synthesis attaches its scene
+    objects to the score and the cached score must stay pristine.
+
+    The disk layer can be shared by multiple processes, files are written
+    atomically (a temporary file is renamed into place) and entries that
+    cannot be deserialized are treated as missing. When the directory cannot
+    be written (e.g. it is read-only or the disk is full), a warning is
+    printed and the disk layer is disabled, the cache then works in memory
+    only. The in-memory layer is thread-safe.
+
+    The disk entries are pickles, and unpickling can run arbitrary code.
+    The disk layer therefore trusts everyone who can write to its directory.
+    Use a directory that only trusted users can write to, never a shared
+    or world-writable one.
+
+    Errors and warnings of the loader are printed only when the score
+    is actually parsed, not when it is loaded from the cache.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        max_bytes: int = 256 * 1024 * 1024
+    ):
+        assert max_bytes >= 0
+        self.directory = directory
+        "Directory of the disk layer, None keeps the cache in memory only"
+
+        self.max_bytes = max_bytes
+        "Budget for the total size of serialized scores kept in memory"
+
+        self.size_bytes = 0
+        "Total size of the serialized scores kept in memory in bytes"
+
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        "Serialized scores by key, from the least to the most recently used"
+
+        self._lock = threading.Lock()
+        "Guards the in-memory entries when used from multiple threads"
+
+    @staticmethod
+    def default() -> "ScoreCache":
+        """Builds a new instance of the default score cache to use
+        for this process. The disk layer is used only when its directory
+        is set by the MC_SCORE_CACHE environment variable."""
+        if MC_SCORE_CACHE is None:
+            return ScoreCache()
+        return ScoreCache(Path(MC_SCORE_CACHE).resolve())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        """Drops the in-memory layer (the disk layer is kept)"""
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+
+    @staticmethod
+    def compute_key(content: bytes) -> str:
+        """Computes the cache key for the given MusicXML file content"""
+        digest = hashlib.sha256()
+        digest.update(
+            f"smashcima={__version__};loader={LOADER_VERSION};".encode("ascii")
+        )
+        digest.update(content)
+        return digest.hexdigest()
+
+    def load_file(self, path: Union[str, Path]) -> Score:
+        """Loads a score from a MusicXML (or .mxl) file, parsing it only
+        if it is not cached yet"""
+        path = Path(path)
+        content = path.read_bytes()
+        key = ScoreCache.compute_key(content)
+
+        # in-memory layer
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+        if data is not None:
+            return _deserialize(data)
+
+        # disk layer
+        entry = self._read_from_disk(key)
+        if entry is not None:
+            data, score = entry
+            self._remember(key, data)
+            return score
+
+        # miss, parse the content that has already been read
+        if path.suffix.lower() == ".mxl":
+            score = MusicXmlLoader().load_mxl(io.BytesIO(content))
+        else:
+            score = MusicXmlLoader().load_stream(io.BytesIO(content))
+        data = _serialize(score)
+        self._write_to_disk(key, data)
+        self._remember(key, data)
+        return score
+
+    def _remember(self, key: str, data: bytes):
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = data
+            self.size_bytes += len(data)
+            while self.size_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size_bytes -= len(evicted)
+
+    def _get_disk_path(self, key: str) -> Path:
+        return self.directory / key[:2] / (key + ".pkl.z")
+
+    def _read_from_disk(self, key: str) -> Optional[Tuple[bytes, Score]]:
+        if self.directory is None:
+            return None
+        try:
+            data = self._get_disk_path(key).read_bytes()
+        except OSError:
+            return None # missing or unreadable entry
+        try:
+            score = _deserialize(data)
+        except Exception:
+            return None # stale or damaged entry, it will be overwritten
+        if not isinstance(score, Score):
+            return None
+        return data, score
+
+    def _write_to_disk(self, key: str, data: bytes):
+        if self.directory is None:
+            return
+        path = self._get_disk_path(key)
+
+        # write a process-private temporary file and rename it into place,
+        # so that other processes never read a partially written entry
+        temporary = path.with_name(
+            f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                temporary.write_bytes(data)
+                os.replace(temporary, path)
+            finally:
+                temporary.unlink(missing_ok=True)
+        except OSError as error:
+            # the score has been parsed, so the load must not fail,
+            # the cache keeps working in memory only
+            print(
+                f"[Smashcima Score Cache]: Cannot write to {self.directory}, " +
+                f"the disk cache is disabled: {error}",
+                file=sys.stderr
+            )
+            self.directory = None
@@ -1,6 +1,6 @@
 from .Model import Model
 from ..geometry.Vector2 import Vector2
-from ..loading.MusicXmlLoader import MusicXmlLoader
+from ..loading.ScoreCache import ScoreCache
 from ..synthesis.page.NaiveStafflinesSynthesizer \
     import NaiveStafflinesSynthesizer
 from ..synthesis.page.StafflinesSynthesizer import StafflinesSynthesizer
@@ -29,7 +29,12 @@ class BaseHandwrittenModel(Model):
     and its name might change in the future. It aims to be like Mashcima1
     with the additions of using MXL input, polyphony and postprocessing.
     """
-    def __init__(self):
+    def __init__(self, disk_score_cache: bool = True):
+        self.disk_score_cache = disk_score_cache
+        """Whether parsed scores are also cached on the disk, in the directory
+        set by the MC_SCORE_CACHE environment variable (when it is not set,
+        they are cached in memory only)"""
+
         super().__init__()
 
         self.pages: List[Page] = []
@@ -47,10 +52,19 @@ class BaseHandwrittenModel(Model):
         c.type(SimplePageSynthesizer)
         c.type(MuscimaPPStyleDomain)
 
+        # epochs load the same scores repeatedly, cache them parsed
+        c.instance(
+            ScoreCache,
+            ScoreCache.default() if self.disk_score_cache else ScoreCache()
+        )
+
     def resolve_services(self):
         super().resolve_services()
         c = self.container
 
+        self.score_cache = c.resolve(ScoreCache)
+        "Loads the input scores, parsing each file only once"
+
         self.layout_synthesizer = c.resolve(ColumnLayoutSynthesizer)
         self.page_synthesizer = c.resolve(SimplePageSynthesizer)
     
@@ -67,7 +81,7 @@ class BaseHandwrittenModel(Model):
 
     def call(self, annotation_file_path: str):
         # load the symbolic part
-        score = MusicXmlLoader().load_file(annotation_file_path)
+        score = self.score_cache.load_file(annotation_file_path)
         self.scene.add(score)
 
         # until you run out of music
@@ -114,3 +128,64 @@ class BaseHandwrittenModel(Model):
         bitmap[mask, :] = 255
 
         return bitmap
+
+
+# Run by:
+# .venv/bin/python3 -m smashcima.orchestration.BaseHandwrittenModel [file.musicxml]
+if __name__ == "__main__":
+    # Benchmarks the cold start of a synthesis process (importing smashcima
+    # and constructing the model in a fresh interpreter) and then the time
+    # and memory allocations of synthesizing a page, with the allocations
+    # of geometry primitives reported separately
+    import subprocess
+    import sys
+    import time
+    import tracemalloc
+
+    path = sys.argv[1] if len(sys.argv) >= 2 else "testing/input.musicxml"
+
+    model = BaseHandwrittenModel() # installs missing bundles first
+
+    cold_start = subprocess.run(
+        [sys.executable, "-c", "\n".join([
+            "import time",
+            "start = time.perf_counter()",
+            "from smashcima.orchestration.BaseHandwrittenModel " +
+                "import BaseHandwrittenModel",
+            "imported = time.perf_counter()",
+            "BaseHandwrittenModel()",
+            "constructed = time.perf_counter()",
+            "print(imported - start, constructed - imported)",
+        ])],
+        check=True,
+        capture_output=True,
+        text=True
+    )
+    import_seconds, construct_seconds = map(
+        float, cold_start.stdout.strip().splitlines()[-1].split()
+    )
+    print(f"Cold start import time: {import_seconds:.3f} s")
+    print(f"Cold start model construction time: {construct_seconds:.3f} s")
+
+    model(path) # warm up (loads the symbol repository)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    model(path)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    geometry = snapshot.filter_traces([
+        tracemalloc.Filter(True, "*/smashcima/geometry/*")
+    ]).statistics("filename")
+    geometry_bytes = sum(stat.size for stat in geometry)
+    geometry_blocks = sum(stat.count for stat in geometry)
+
+    print(f"Synthesis time: {seconds:.3f} s")
+    print(f"Peak traced memory: {peak / 1024 / 1024:.1f} MiB")
+    print(
+        f"Live geometry allocations: {geometry_blocks} blocks, " +
+        f"{geometry_bytes / 1024 / 1024:.1f} MiB"
+    )
@@ -1,21 +1,39 @@
 import numpy as np
 import cv2
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from math import ceil
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Iterator, Tuple
+from typing import Union
 from smashcima.geometry.Transform import Transform
 from smashcima.geometry.Rectangle import Rectangle
-from smashcima.geometry.Quad import Quad
+from smashcima.geometry.Vector2 import Vector2
 from ..scene.Scene import Scene
 from ..scene.ViewBox import ViewBox
+from ..scene.SpriteMask import SpriteMask
 from ..geometry.units import mm_to_px
-from .traverse_sprites import traverse_sprites
+from .RenderList import RenderList
+from .SpriteBitmapCache import SpriteBitmapCache
 
 
 # Alpha compositing via the "over" operator + alpha premultiplication:
 # https://en.wikipedia.org/wiki/Alpha_compositing
 
 
-def _premultiplied_float32_alpha_overlay(canvas: np.ndarray, layer: np.ndarray):
-    factor = (1 - layer[:, :, 3:4])
+def _premultiplied_float32_alpha_overlay(
+    canvas: np.ndarray,
+    layer: np.ndarray,
+    factor: Optional[np.ndarray] = None
+):
+    """Composits the layer over the canvas in-place. The layer is either
+    mRGBA [H, W, 4], or coverage only [H, W] (which is its own alpha).
+    The factor is an optional scratch array of shape [H, W, 1] (or [H, W]
+    for coverage) to avoid allocating a temporary array."""
+    alpha = layer[:, :, 3:4] if layer.ndim == 3 else layer
+    if factor is None:
+        factor = np.empty(shape=alpha.shape, dtype=np.float32)
+    np.subtract(1, alpha, out=factor)
     canvas *= factor
     canvas += layer
 
@@ -23,7 +41,8 @@ def _premultiplied_float32_alpha_overlay(canvas: np.ndarray, layer: np.ndarray):
 def _premultiplied_float32_alpha_overlay_in_window(
     canvas: np.ndarray,
     window: Rectangle,
-    layer: np.ndarray
+    layer: np.ndarray,
+    factor: Optional[np.ndarray] = None
 ):
     assert int(window.height) == layer.shape[0]
     assert int(window.width) == layer.shape[1]
@@ -33,7 +52,8 @@ def _premultiplied_float32_alpha_overlay_in_window(
     right = int(window.right)
     _premultiplied_float32_alpha_overlay(
         canvas[top:bottom, left:right],
-        layer
+        layer,
+        factor
     )
 
 
@@ -49,96 +69,617 @@ def _float32_to_uint8(img: np.ndarray) -> np.ndarray:
     return img
 
 
+def _sprite_bitmap_to_premultiplied_float32(
+    bitmap: Union[np.ndarray, SpriteMask]
+) -> np.ndarray:
+    if isinstance(bitmap, SpriteMask):
+        return _sprite_mask_to_premultiplied_float32(bitmap)
+    bitmap = cv2.cvtColor(bitmap, cv2.COLOR_RGBA2mRGBA)
+    bitmap = _uint8_to_float32(bitmap)
+    return bitmap
+
+
+def _sprite_bitmap_to_coverage_float32(
+    bitmap: Union[np.ndarray, SpriteMask]
+) -> np.ndarray:
+    if isinstance(bitmap, SpriteMask):
+        return _sprite_mask_to_coverage_float32(bitmap)
+    return _uint8_to_float32(bitmap[:, :, 3])
+
+
+def _sprite_mask_to_premultiplied_float32(mask: SpriteMask) -> np.ndarray:
+    # premultiply the ink color exactly like the bitmap conversion does,
+    # so that masks render identically to their expanded bitmaps
+    ink = cv2.cvtColor(
+        np.array([[mask.ink_color]], dtype=np.uint8),
+        cv2.COLOR_RGBA2mRGBA
+    )
+    ink = _uint8_to_float32(ink)[0, 0]
+    return mask.unpack()[:, :, np.newaxis] * ink
+
+
+def _sprite_mask_to_coverage_float32(mask: SpriteMask) -> np.ndarray:
+    ink_alpha = _uint8_to_float32(np.array([mask.ink_color[3]], np.uint8))
+    return mask.unpack() * ink_alpha[0]
+
+
+_SCALE_EPSILON = 1e-9
+"""Tolerance of scale comparisons (scaling there and back via DPI
+conversions does not end up exactly at 1.0)"""
+
+
+class _ScratchBuffers:
+    """Float32 arrays reused across sprites and renders, so that the innermost
+    render loop does not allocate temporary arrays. Not thread-safe,
+    each rendering thread needs its own instance."""
+
+    def __init__(self):
+        self._buffers: Dict[str, np.ndarray] = {}
+
+    def get(self, name: str, shape: Tuple[int, ...]) -> np.ndarray:
+        """Returns an uninitialized contiguous array of the given shape.
+        It remains valid until the next request for the same name."""
+        size = int(np.prod(shape))
+        buffer = self._buffers.get(name)
+        if buffer is None or buffer.size < size:
+            # grow geometrically to avoid reallocating for each larger sprite
+            old_size = 0 if buffer is None else buffer.size
+            buffer = np.empty(shape=max(size, 2 * old_size), dtype=np.float32)
+            self._buffers[name] = buffer
+        return buffer[:size].reshape(shape)
+
+
+# Mipmaps:
+# Sprites that are scaled down (e.g. 300 DPI glyphs rendered at 150 DPI) are
+# warped from a precomputed reduced copy of their bitmap (a mipmap level).
+# Each level halves the previous one by averaging 2x2 pixel blocks (the bitmap
+# is padded to even dimensions first), so that the pixel (x, y) of level k
+# is centered at ((x + 0.5) * 2^k - 0.5, (y + 0.5) * 2^k - 0.5) of the sprite.
+# The nearest level that is not smaller than the target is chosen, which
+# avoids the aliasing of bilinear warping at large reductions and makes
+# the downscaling cheaper.
+
+
+_MIPMAP_LEVELS = 2
+"""Number of mipmap levels above the original bitmap (2x and 4x reductions)"""
+
+
+def _halve_bitmap(bitmap: np.ndarray) -> np.ndarray:
+    """Builds the next mipmap level (works for both mRGBA and coverage)"""
+    height, width = bitmap.shape[:2]
+    bitmap = cv2.copyMakeBorder(
+        bitmap, 0, height % 2, 0, width % 2, cv2.BORDER_CONSTANT, value=0
+    )
+    return cv2.resize(
+        bitmap,
+        dsize=((width + 1) // 2, (height + 1) // 2),
+        interpolation=cv2.INTER_AREA
+    )
+
+
+def _mipmap_level(matrix: np.ndarray) -> int:
+    """Chooses the mipmap level for a 2x3 sprite-to-canvas affine matrix"""
+    # how many canvas pixels does one sprite pixel span (along the longer
+    # axis, so that sprites are not blurred by anisotropic scaling)
+    scale = max(
+        np.hypot(matrix[0, 0], matrix[1, 0]),
+        np.hypot(matrix[0, 1], matrix[1, 1])
+    )
+    level = 0
+    while level < _MIPMAP_LEVELS \
+            and scale * 2 ** (level + 1) <= 1 + _SCALE_EPSILON:
+        level += 1
+    return level
+
+
+def _mipmap_to_sprite_transform(level: int) -> Transform:
+    """Maps from the pixel space of a mipmap level to the sprite pixel space"""
+    factor = 2 ** level
+    offset = (factor - 1) / 2
+    return Transform.scale(factor).then(
+        Transform.translate(Vector2(offset, offset))
+    )
+
+
+_PARALLEL_TILE_SIZE = 512
+"""Tile size used for parallel rendering, when no tile size is specified"""
+
+
+@dataclass
+class _SpriteDrawCall:
+    """One sprite, prepared for rasterization onto the canvas"""
+
+    bitmap: Union[np.ndarray, SpriteMask]
+    "The BGRA bitmap (or the packed mask) of the sprite to be drawn"
+
+    canvas_window: Rectangle
+    """The window in the canvas pixel space that the sprite paints over
+    (integer-snapped and clamped inside of the canvas)"""
+
+    to_window_transform: Transform
+    "Transform from the sprite's pixel space to the canvas window pixel space"
+
+
 class BitmapRenderer:
-    """Renders a scene into a bitmap RGBA opencv representation"""
+    """Renders a scene into a bitmap RGBA opencv representation,
+    or into a grayscale bitmap in the ink-only mode"""
     def __init__(
         self,
-        dpi: float = 300
+        dpi: float = 300,
+        tile_size: Optional[int] = None,
+        bitmap_cache: Optional[SpriteBitmapCache] = None,
+        workers: int = 1,
+        ink_only: bool = False,
+        mipmaps: bool = False
     ):
         self.dpi = float(dpi)
         "DPI at which the scene should be rasterized"
 
+        assert tile_size is None or tile_size > 0
+        self.tile_size = tile_size
+        """Size (in pixels) of square tiles, into which the canvas is split
+        during rendering. Only one float32 tile exists at a time and it is
+        converted to uint8 as soon as it is finished, so the peak memory
+        is bounded by the tile size instead of the page size. The result is
+        identical to the non-tiled rendering. None renders the whole canvas
+        as a single tile."""
+
+        self.bitmap_cache = bitmap_cache
+        """Optional cache of sprite bitmaps converted to the premultiplied
+        float32 format. Share one cache instance between renders (and renderers)
+        to convert each sprite bitmap only once."""
+
+        assert workers >= 1
+        self.workers = workers
+        """Number of threads that render tiles in parallel (OpenCV and numpy
+        release the GIL). The canvas is split into tiles even if tile_size
+        is None. The result is identical regardless of the number of workers.
+        Up to this many float32 tiles exist at a time."""
+
+        self.ink_only = ink_only
+        """Composits only the alpha channel (the ink coverage) of sprites
+        into a single-channel canvas and returns a uint8 grayscale image
+        of black ink on white paper. Sprite colors are ignored, which is
+        exact for the black ink glyphs and stafflines. Uses about 4x less
+        memory and memory bandwidth than the RGBA rendering."""
+
+        self.mipmaps = mipmaps
+        """Downscaled sprites are warped from the nearest mipmap level
+        (2x or 4x reduction of the sprite bitmap), see the comment at
+        _MIPMAP_LEVELS. The levels are kept in the bitmap cache (if given),
+        so use both when rendering at lower DPIs repeatedly."""
+
+        self._thread_local = threading.local()
+        "Holds the scratch buffers of each rendering thread"
+
     def render(self, scene: Scene, view_box: ViewBox) -> np.ndarray:
+        render_list = RenderList.compile(scene)
+        return self._render_at_dpi(render_list, view_box, self.dpi)
+
+    def render_compiled(
+        self,
+        render_list: RenderList,
+        view_box: ViewBox
+    ) -> np.ndarray:
+        """Renders a compiled render list of a scene. Compile the scene once
+        to render multiple view boxes without traversing it repeatedly."""
+        return self._render_at_dpi(render_list, view_box, self.dpi)
+
+    def render_multi(
+        self,
+        scene: Scene,
+        view_box: ViewBox,
+        dpis: List[float]
+    ) -> List[np.ndarray]:
+        """Renders the scene at multiple DPIs, traversing the scene only once.
+        The DPI of the renderer is ignored, the bitmaps are returned
+        in the order of the given DPIs."""
+        render_list = RenderList.compile(scene)
+        return [
+            self._render_at_dpi(render_list, view_box, float(dpi))
+            for dpi in dpis
+        ]
+
+    def _render_at_dpi(
+        self,
+        render_list: RenderList,
+        view_box: ViewBox,
+        dpi: float
+    ) -> np.ndarray:
         # bounding box of the canvas in pixel space
         canvas_px_bbox = Rectangle(
             x=0,
             y=0,
-            width=ceil(mm_to_px(view_box.rectangle.width, dpi=self.dpi)),
-            height=ceil(mm_to_px(view_box.rectangle.height, dpi=self.dpi)),
+            width=ceil(mm_to_px(view_box.rectangle.width, dpi=dpi)),
+            height=ceil(mm_to_px(view_box.rectangle.height, dpi=dpi)),
         )
 
-        # the canvas pixel array in alpha premultiplied float32 format
+        draw_calls = list(
+            self._build_draw_calls(render_list, view_box, canvas_px_bbox, dpi)
+        )
+
+        # the whole canvas is a single tile
+        tile_size = self._get_tile_size()
+        if tile_size is None:
+            return self._render_tile(canvas_px_bbox, draw_calls)
+
+        # the output pixel array in uint8 RGBA (BGRA actually)
+        # or grayscale format
         canvas = np.zeros(
-            shape=(int(canvas_px_bbox.height), int(canvas_px_bbox.width), 4),
-            dtype=np.float32
+            shape=(
+                int(canvas_px_bbox.height),
+                int(canvas_px_bbox.width),
+                *self._pixel_shape()
+            ),
+            dtype=np.uint8
         )
 
+        # sort draw calls into tiles (keeping the draw order)
+        tiles = self._build_tiles(canvas_px_bbox, tile_size)
+        tile_draw_calls = self._distribute_draw_calls(
+            draw_calls, canvas_px_bbox, tile_size
+        )
+
+        def render_tile_into_canvas(
+            tile: Rectangle,
+            calls: List[_SpriteDrawCall]
+        ):
+            top = int(tile.top)
+            bottom = int(tile.bottom)
+            left = int(tile.left)
+            right = int(tile.right)
+            canvas[top:bottom, left:right] = self._render_tile(tile, calls)
+
+        # render tiles one by one
+        if self.workers == 1:
+            for tile, calls in zip(tiles, tile_draw_calls):
+                render_tile_into_canvas(tile, calls)
+            return canvas
+
+        # render tiles in parallel (tiles are disjoint
+        # so the result does not depend on the order of completion)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for _ in executor.map(
+                render_tile_into_canvas, tiles, tile_draw_calls
+            ):
+                pass # re-raises exceptions from the workers
+
+        return canvas
+
+    def _pixel_shape(self) -> Tuple[int, ...]:
+        """Shape of one pixel of the canvas (the channels dimension)"""
+        return () if self.ink_only else (4,)
+
+    def _get_tile_size(self) -> Optional[int]:
+        """Returns the tile size to be used, None means no tiling"""
+        if self.tile_size is None and self.workers > 1:
+            return _PARALLEL_TILE_SIZE
+        return self.tile_size
+
+    def _build_draw_calls(
+        self,
+        render_list: RenderList,
+        view_box: ViewBox,
+        canvas_px_bbox: Rectangle,
+        dpi: float
+    ) -> Iterator[_SpriteDrawCall]:
+        """Prepares draw calls for the compiled sprites,
+        skipping sprites that do not overlap the canvas"""
+
         # converts from scene millimeter coordinate system
         # to the canvas pixel coordinate system
         scene_to_canvas_transform = (
             Transform.translate(-view_box.rectangle.top_left_corner.vector)
-                .then(Transform.scale(mm_to_px(1, dpi=self.dpi)))
+                .then(Transform.scale(mm_to_px(1, dpi=dpi)))
         )
 
-        # go through all the sprites in the scene
-        for (sprite, sprite_transform) in traverse_sprites(
-            scene.space,
-            include_pixels_transform=True,
-            include_sprite_transform=True,
-            include_root_space_transform=False
-        ):
-            # build up a transform that converts from sprite's local pixel space
-            # to canvas global pixel space, while going through the scene space
-            to_canvas_transform = (
-                sprite_transform # recursive scene hierarchy transforms
-                .then(scene_to_canvas_transform)
-            )
-            
-            # get the window in the canvas that we're going to paint over
-            canvas_window: Rectangle = (
-                to_canvas_transform.apply_to(
-                    Quad.from_rectangle(
-                        sprite.pixels_bbox.dilate(1.0) # grow by 1 pixel
-                        # dilation is done to accommodate the aliasing blur
+        # build up transforms that convert from sprites' local pixel space
+        # to canvas global pixel space, while going through the scene space
+        matrices = np.matmul(
+            scene_to_canvas_transform.matrix3,
+            np.concatenate(
+                (
+                    render_list.matrices,
+                    np.broadcast_to(
+                        np.array([[[0, 0, 1]]], dtype=np.float64),
+                        (len(render_list), 1, 3)
                     )
-                ) # get the quad of the dilated sprite quad in canvas coordinates
-                .bbox() # get the bounding box rectangle
-                .snap_grow() # round to integer by growing
-                .intersect_with(canvas_px_bbox) # clamp inside of canvas
-            )
-            to_window_transform = to_canvas_transform.then(
-                Transform.translate(-canvas_window.top_left_corner.vector)
+                ),
+                axis=1
             )
+        )[:, 0:2, :]
 
-            # viewport culling:
-            # do not render sprites that have no overlap with the canvas
-            if canvas_window.has_no_area:
-                continue
-            
-            # prepare the sprite bitmap into mRGBA float
-            sprite_bitmap = sprite.bitmap
-            sprite_bitmap = cv2.cvtColor(sprite_bitmap, cv2.COLOR_RGBA2mRGBA)
-            sprite_bitmap = _uint8_to_float32(sprite_bitmap)
+        # get the windows in the canvas that we're going to paint over,
+        # that is the bounding boxes of the sprite quads in canvas coordinates,
+        # where the sprites are grown by 1 pixel
+        # (dilation is done to accommodate the aliasing blur)
+        low = np.full(len(render_list), -1.0)
+        high = render_list.pixel_sizes + 1.0
+        corners_x = np.stack([low, high[:, 0], high[:, 0], low], axis=1)
+        corners_y = np.stack([low, low, high[:, 1], high[:, 1]], axis=1)
+        xs = ( # [N, 4] x coordinates of the corners in the canvas space
+            matrices[:, 0:1, 0] * corners_x
+            + matrices[:, 0:1, 1] * corners_y
+            + matrices[:, 0:1, 2]
+        )
+        ys = ( # [N, 4] y coordinates of the corners in the canvas space
+            matrices[:, 1:2, 0] * corners_x
+            + matrices[:, 1:2, 1] * corners_y
+            + matrices[:, 1:2, 2]
+        )
 
-            # get the transformed bitmap of the sprite
-            new_layer = cv2.warpAffine(
-                src=sprite_bitmap,
-                M=to_window_transform.matrix,
-                dsize=(int(canvas_window.width), int(canvas_window.height)),
-                flags=(
-                    cv2.INTER_AREA # used for downscaling
-                    if to_window_transform.determinant < 1.0
-                    else cv2.INTER_LINEAR # used for upscaling
+        # round to integer by growing and clamp inside of canvas
+        left = np.maximum(np.floor(xs.min(axis=1)), canvas_px_bbox.left)
+        top = np.maximum(np.floor(ys.min(axis=1)), canvas_px_bbox.top)
+        right = np.minimum(np.ceil(xs.max(axis=1)), canvas_px_bbox.right)
+        bottom = np.minimum(np.ceil(ys.max(axis=1)), canvas_px_bbox.bottom)
+
+        # viewport culling:
+        # do not render sprites that have no overlap with the canvas
+        visible = np.flatnonzero((left < right) & (top < bottom))
+
+        # transforms into the windows
+        matrices[:, 0, 2] -= left
+        matrices[:, 1, 2] -= top
+
+        for i in visible:
+            yield _SpriteDrawCall(
+                bitmap=render_list.bitmaps[i],
+                canvas_window=Rectangle(
+                    x=left[i],
+                    y=top[i],
+                    width=right[i] - left[i],
+                    height=bottom[i] - top[i]
                 ),
-                borderMode=cv2.BORDER_CONSTANT
+                to_window_transform=Transform(matrices[i])
             )
 
+    def _build_tiles(
+        self,
+        canvas_px_bbox: Rectangle,
+        tile_size: int
+    ) -> List[Rectangle]:
+        """Splits the canvas into tiles, in the row-major order"""
+        tiles: List[Rectangle] = []
+        for y in range(0, int(canvas_px_bbox.height), tile_size):
+            for x in range(0, int(canvas_px_bbox.width), tile_size):
+                tiles.append(
+                    Rectangle(
+                        x=x,
+                        y=y,
+                        width=tile_size,
+                        height=tile_size
+                    ).intersect_with(canvas_px_bbox)
+                )
+        return tiles
+
+    def _distribute_draw_calls(
+        self,
+        draw_calls: List[_SpriteDrawCall],
+        canvas_px_bbox: Rectangle,
+        tile_size: int
+    ) -> List[List[_SpriteDrawCall]]:
+        """Culls draw calls for each tile produced by _build_tiles,
+        preserving the draw order within each tile"""
+        columns = ceil(canvas_px_bbox.width / tile_size)
+        rows = ceil(canvas_px_bbox.height / tile_size)
+        tile_draw_calls: List[List[_SpriteDrawCall]] = [
+            [] for _ in range(rows * columns)
+        ]
+        for call in draw_calls:
+            window = call.canvas_window
+            for row in range(
+                int(window.top) // tile_size,
+                (int(window.bottom) - 1) // tile_size + 1
+            ):
+                for column in range(
+                    int(window.left) // tile_size,
+                    (int(window.right) - 1) // tile_size + 1
+                ):
+                    tile_draw_calls[row * columns + column].append(call)
+        return tile_draw_calls
+
+    def _get_scratch_buffers(self) -> _ScratchBuffers:
+        """Returns scratch buffers owned by the current thread"""
+        scratch = getattr(self._thread_local, "scratch", None)
+        if scratch is None:
+            scratch = _ScratchBuffers()
+            self._thread_local.scratch = scratch
+        return scratch
+
+    def _get_sprite_bitmap(
+        self,
+        bitmap: Union[np.ndarray, SpriteMask],
+        level: int = 0
+    ) -> np.ndarray:
+        """Returns the sprite bitmap in the mRGBA float format
+        (or the coverage float format in the ink-only mode) at the given
+        mipmap level"""
+        if level > 0:
+            return self._get_cached_bitmap(
+                bitmap,
+                ("mipmap", level),
+                lambda _: _halve_bitmap(
+                    self._get_sprite_bitmap(bitmap, level=level - 1)
+                )
+            )
+        if self.ink_only:
+            return self._get_cached_bitmap(
+                bitmap, (), _sprite_bitmap_to_coverage_float32
+            )
+        return self._get_cached_bitmap(
+            bitmap, (), _sprite_bitmap_to_premultiplied_float32
+        )
+
+    def _get_cached_bitmap(
+        self,
+        bitmap: Union[np.ndarray, SpriteMask],
+        variant: Tuple[Any, ...],
+        build: Callable[[Any], np.ndarray]
+    ) -> np.ndarray:
+        """Builds the sprite bitmap variant, or takes it from the cache"""
+        if self.bitmap_cache is None:
+            return build(bitmap)
+        pixel_format = (
+            "coverage float32" if self.ink_only else "premultiplied float32"
+        )
+        return self.bitmap_cache.get(
+            bitmap, (pixel_format, *variant), build
+        )
+
+    def _rasterize_sprite(
+        self,
+        call: _SpriteDrawCall,
+        scratch: _ScratchBuffers
+    ) -> np.ndarray:
+        """Returns the sprite transformed into its canvas window
+        as an mRGBA (or coverage) float bitmap,
+        which lives in the scratch buffers"""
+        width = int(call.canvas_window.width)
+        height = int(call.canvas_window.height)
+        to_window_transform = call.to_window_transform
+
+        # pick the mipmap level and warp from it instead
+        level = 0
+        if self.mipmaps:
+            level = _mipmap_level(to_window_transform.matrix)
+            if level > 0:
+                to_window_transform = _mipmap_to_sprite_transform(level) \
+                    .then(to_window_transform)
+
+        matrix = to_window_transform.matrix
+
+        # the whole window is always rasterized, because cropping the window
+        # changes the rounding inside of warpAffine and the result
+        # would then depend on the tiling
+
+        return cv2.warpAffine(
+            src=self._get_sprite_bitmap(call.bitmap, level=level),
+            M=matrix,
+            dsize=(width, height),
+            dst=scratch.get("layer", (height, width, *self._pixel_shape())),
+            flags=(
+                cv2.INTER_AREA # used for downscaling
+                if to_window_transform.determinant < 1.0
+                else cv2.INTER_LINEAR # used for upscaling
+            ),
+            borderMode=cv2.BORDER_CONSTANT
+        )
+
+    def _render_tile(
+        self,
+        tile: Rectangle,
+        draw_calls: List[_SpriteDrawCall]
+    ) -> np.ndarray:
+        """Renders the given draw calls into a tile of the canvas and returns
+        the tile as a uint8 RGBA (BGRA actually) or grayscale bitmap"""
+        # the tile pixel array in alpha premultiplied float32 format
+        # (or ink coverage float32 format)
+        canvas = np.zeros(
+            shape=(int(tile.height), int(tile.width), *self._pixel_shape()),
+            dtype=np.float32
+        )
+
+        scratch = self._get_scratch_buffers()
+
+        for call in draw_calls:
+            canvas_window = call.canvas_window
+
+            # get the transformed bitmap of the sprite
+            new_layer = self._rasterize_sprite(call, scratch)
+
+            # crop the layer to the part that overlaps the tile
+            region = canvas_window.intersect_with(tile)
+            if region.has_no_area:
+                continue
+            new_layer = new_layer[
+                int(region.top - canvas_window.top)
+                    :int(region.bottom - canvas_window.top),
+                int(region.left - canvas_window.left)
+                    :int(region.right - canvas_window.left)
+            ]
+
             # composit the next layer over the canvas in the window
             _premultiplied_float32_alpha_overlay_in_window(
-                canvas, canvas_window, new_layer
+                canvas,
+                Rectangle(
+                    x=region.x - tile.x,
+                    y=region.y - tile.y,
+                    width=region.width,
+                    height=region.height
+                ),
+                new_layer,
+                scratch.get(
+                    "factor",
+                    (*new_layer.shape[:2], 1) if new_layer.ndim == 3
+                    else new_layer.shape
+                )
             )
 
+        # convert ink coverage to black ink on white paper and return
+        if self.ink_only:
+            canvas = _float32_to_uint8(canvas)
+            np.subtract(255, canvas, out=canvas)
+            return canvas
+
         # convert to uint8 RGBA (BGRA actually) and return
         canvas = _float32_to_uint8(canvas)
         canvas = cv2.cvtColor(canvas, cv2.COLOR_mRGBA2RGBA)
         return canvas
+
+
+# Run by:
+# .venv/bin/python3 -m smashcima.rendering.BitmapRenderer
+if __name__ == "__main__":
+    # Benchmarks the rendering modes on a page of glyph-like sprites
+    # at sub-pixel positions, drawn at the scene DPI
+    import time
+    from ..geometry.Point import Point
+    from ..scene.Sprite import Sprite
+
+    rng = np.random.default_rng(42)
+    bitmaps: List[np.ndarray] = []
+    for _ in range(20):
+        bitmap = np.zeros(
+            shape=(rng.integers(20, 120), rng.integers(20, 120), 4),
+            dtype=np.uint8
+        )
+        bitmap[:, :, 3] = (rng.random(bitmap.shape[:2]) > 0.5) * 255
+        bitmaps.append(bitmap)
+
+    scene = Scene()
+    for _ in range(2000):
+        Sprite(
+            space=scene.space,
+            bitmap=bitmaps[rng.integers(len(bitmaps))],
+            bitmap_origin=Point(0.5, 0.5),
+            dpi=300,
+            transform=Transform.translate(
+                Vector2(rng.uniform(0, 210), rng.uniform(0, 297))
+            )
+        )
+    view_box = ViewBox(Rectangle(0, 0, 210, 297))
+
+    modes = {
+        "single pass": dict(),
+        "tiled (512 px)": dict(tile_size=512),
+        "4 workers": dict(workers=4),
+    }
+    results = {}
+    for mode, options in modes.items():
+        renderer = BitmapRenderer(
+            dpi=300,
+            bitmap_cache=SpriteBitmapCache(),
+            **options
+        )
+        renderer.render(scene, view_box) # warm up the cache
+        start = time.perf_counter()
+        for _ in range(5):
+            results[mode] = renderer.render(scene, view_box)
+        seconds = (time.perf_counter() - start) / 5
+        print(f"{mode}: {seconds:.3f} s per page")
+
+    print("Identical results:", all(
+        np.array_equal(results["single pass"], result)
+        for result in results.values()
+    ))
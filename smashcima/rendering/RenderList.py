@@ -0,0 +1,78 @@
+import numpy as np
+from typing import List, Union
+from ..scene.Scene import Scene
+from ..scene.AffineSpace import AffineSpace
+from ..scene.SpriteMask import SpriteMask
+from .traverse_sprites import traverse_sprites
+
+
+class RenderList:
+    """
+    Sprites of a scene compiled into packed parallel arrays, in the draw order.
+    Renderers iterate these arrays instead of walking the scene hierarchy
+    and can process all sprites at once with vectorized numpy operations
+    (e.g. viewport culling). A compiled render list can be reused to render
+    multiple view boxes (pages, staff crops) of the same scene.
+
+    The render list is a snapshot, changes to the scene made after
+    the compilation are not reflected in it.
+    """
+
+    def __init__(
+        self,
+        bitmaps: List[Union[np.ndarray, SpriteMask]],
+        matrices: np.ndarray,
+        pixel_sizes: np.ndarray
+    ):
+        assert matrices.shape == (len(bitmaps), 2, 3)
+        assert matrices.dtype == np.float64
+        assert pixel_sizes.shape == (len(bitmaps), 2)
+
+        self.bitmaps = bitmaps
+        """BGRA bitmaps (or packed masks) of the sprites, in the draw order"""
+
+        self.matrices = matrices
+        """[N, 2, 3] affine matrices that map from the pixel space
+        of each sprite to the scene space (in millimeters)"""
+
+        self.pixel_sizes = pixel_sizes
+        "[N, 2] integer (width, height) of each sprite bitmap in pixels"
+
+    def __len__(self) -> int:
+        return len(self.bitmaps)
+
+    @staticmethod
+    def compile(scene: Scene) -> "RenderList":
+        """Compiles all sprites in the scene into a render list"""
+        return RenderList.compile_space(scene.space)
+
+    @staticmethod
+    def compile_space(space: AffineSpace) -> "RenderList":
+        """Compiles all sprites under the given space into a render list,
+        the transform of the space itself is ignored"""
+        bitmaps: List[Union[np.ndarray, SpriteMask]] = []
+        matrices: List[np.ndarray] = []
+        for (sprite, transform) in traverse_sprites(
+            space,
+            include_pixels_transform=True,
+            include_sprite_transform=True,
+            include_root_space_transform=False
+        ):
+            bitmaps.append(sprite.image)
+            matrices.append(transform.matrix)
+
+        if len(bitmaps) == 0:
+            return RenderList(
+                bitmaps=[],
+                matrices=np.zeros(shape=(0, 2, 3), dtype=np.float64),
+                pixel_sizes=np.zeros(shape=(0, 2), dtype=np.int64)
+            )
+
+        return RenderList(
+            bitmaps=bitmaps,
+            matrices=np.stack(matrices),
+            pixel_sizes=np.array(
+                [(b.shape[1], b.shape[0]) for b in bitmaps],
+                dtype=np.int64
+            )
+        )
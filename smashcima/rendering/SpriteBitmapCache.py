@@ -0,0 +1,129 @@
+import numpy as np
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Tuple, Union
+from dataclasses import dataclass
+from ..scene.SpriteMask import SpriteMask
+
+
+@dataclass
+class _CacheEntry:
+    source: Union[np.ndarray, SpriteMask]
+    """The sprite bitmap the value was built from (holding the reference
+    keeps the id() of the bitmap from being reused while cached)"""
+
+    value: np.ndarray
+    "The converted bitmap"
+
+
+class SpriteBitmapCache:
+    """
+    LRU cache of sprite bitmaps converted into the working format of a renderer
+    (e.g. the premultiplied float32 representation used by BitmapRenderer).
+    The same sprite bitmaps (e.g. MUSCIMA++ glyphs) are drawn many times,
+    so the conversion can be done only once and then reused across renders.
+
+    By default, bitmaps are identified by their identity (the numpy array
+    instance). Replacing the bitmap of a sprite with a new array is therefore
+    picked up correctly, but modifying a bitmap array in-place is not.
+    If you need to modify bitmaps in-place, use key_by_content=True, which
+    keys the cache by the hash of the bitmap pixels instead.
+    Packed sprite masks (SpriteMask) are cached the same way.
+
+    The cache is thread-safe, so it can be used by a renderer
+    that renders in multiple threads.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 256 * 1024 * 1024,
+        key_by_content: bool = False
+    ):
+        assert max_bytes >= 0
+        self.max_bytes = max_bytes
+        "Budget for the total size of cached arrays in bytes"
+
+        self.key_by_content = key_by_content
+        "Identify bitmaps by the hash of their pixels instead of identity"
+
+        self.size_bytes = 0
+        "Total size of currently cached arrays in bytes"
+
+        self._entries: OrderedDict[Tuple[Any, ...], _CacheEntry] = OrderedDict()
+        "Cached entries, from the least recently used to the most recently used"
+
+        self._lock = threading.Lock()
+        "Guards the entries when used from multiple threads"
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _key(
+        self,
+        bitmap: Union[np.ndarray, SpriteMask],
+        variant: Hashable
+    ) -> Tuple[Any, ...]:
+        if self.key_by_content and isinstance(bitmap, SpriteMask):
+            digest = hashlib.blake2b(
+                np.ascontiguousarray(bitmap.packed).data,
+                digest_size=16
+            ).digest()
+            return (digest, bitmap.shape, bitmap.ink_color, variant)
+        if self.key_by_content:
+            digest = hashlib.blake2b(
+                np.ascontiguousarray(bitmap).data,
+                digest_size=16
+            ).digest()
+            return (digest, bitmap.shape, bitmap.dtype.str, variant)
+        return (id(bitmap), variant)
+
+    def get(
+        self,
+        bitmap: Union[np.ndarray, SpriteMask],
+        variant: Hashable,
+        build: Callable[[Any], np.ndarray]
+    ) -> np.ndarray:
+        """Returns the bitmap converted by the build function. The variant
+        identifies the conversion, so that one bitmap can be cached in multiple
+        formats. The returned array is read-only and must not be modified."""
+        key = self._key(bitmap, variant)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (
+                self.key_by_content or entry.source is bitmap
+            ):
+                self._entries.move_to_end(key)
+                return entry.value
+
+        # build outside of the lock, so that threads convert in parallel
+        # (two threads may convert the same bitmap, which is harmless)
+        value = build(bitmap)
+        value.flags.writeable = False
+
+        # do not even try caching values that do not fit
+        if value.nbytes > self.max_bytes:
+            return value
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _CacheEntry(source=bitmap, value=value)
+            self.size_bytes += value.nbytes
+
+            # evict the least recently used entries
+            while self.size_bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+        return value
+
+    def _remove(self, key: Tuple[Any, ...]):
+        entry = self._entries.pop(key)
+        self.size_bytes -= entry.value.nbytes
+
+    def clear(self):
+        """Removes all cached entries"""
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
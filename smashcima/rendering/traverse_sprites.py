@@ -1,7 +1,7 @@
 from smashcima.scene.AffineSpace import AffineSpace
 from smashcima.geometry.Transform import Transform
 from smashcima.scene.Sprite import Sprite
-from typing import Iterator, Tuple
+from typing import Iterator, List, Optional, Tuple
 
 
 def traverse_sprites(
@@ -17,36 +17,76 @@ def traverse_sprites(
     The sprite's transform as well as the root space's transform are ignored.
     If you want to include them, you need to chain them with the returned
     transform.
+
+    The hierarchy is traversed iteratively, depth-first, with sprites of
+    a space returned before the sprites of its sub-spaces. Accumulated
+    transforms are cached in spaces and sprites, so repeated traversals
+    only recompute the transforms of the parts of the hierarchy that changed.
     """
 
-    # yield all sprites in the root space
-    for sprite in space.get_inlinked(Sprite):
-        transform = Transform.identity()
-        
-        if include_pixels_transform:
-            transform = transform.then(
-                sprite.get_pixels_to_scene_transform()
+    # accumulated transform of the root space (None means identity)
+    root_transform: Optional[Transform] = None
+    if include_root_space_transform:
+        root_transform = space.transform
+
+    # spaces to visit, together with their transform to the root space
+    stack: List[Tuple[AffineSpace, Optional[Transform]]] = [
+        (space, root_transform)
+    ]
+
+    while len(stack) > 0:
+        current_space, space_transform = stack.pop()
+
+        # inlinks are indexed by the source type, so other inlinked objects
+        # (e.g. glyphs placed in the space) are not even visited
+        sprites: List[Sprite] = [
+            link.source for link in current_space.inlinks.find(Sprite)
+        ]
+        subspaces: List[AffineSpace] = [
+            link.source for link in current_space.inlinks.find(AffineSpace)
+        ]
+
+        # yield all sprites in the space
+        for sprite in sprites:
+            yield (
+                sprite,
+                _get_sprite_transform(
+                    sprite,
+                    space_transform,
+                    include_pixels_transform,
+                    include_sprite_transform
+                )
             )
         
-        if include_sprite_transform:
-            transform = transform.then(sprite.transform)
-        
-        if include_root_space_transform:
-            yield (sprite, transform.then(space.transform))
-        else:
-            yield (sprite, transform)
+        # continue with all the sub-spaces, in their order
+        for subspace in reversed(subspaces):
+            stack.append((
+                subspace,
+                subspace.chain_transform(space_transform)
+            ))
+
+
+def _get_sprite_transform(
+    sprite: Sprite,
+    space_transform: Optional[Transform],
+    include_pixels_transform: bool,
+    include_sprite_transform: bool
+) -> Transform:
+    # the common case is cached in the sprite
+    if include_pixels_transform and include_sprite_transform:
+        return sprite.chain_transform(space_transform)
+
+    transform = Transform.identity()
+    
+    if include_pixels_transform:
+        transform = transform.then(
+            sprite.get_pixels_to_scene_transform()
+        )
+    
+    if include_sprite_transform:
+        transform = transform.then(sprite.transform)
+    
+    if space_transform is not None:
+        transform = transform.then(space_transform)
     
-    # recusion into all sub-spaces
-    for subspace in space.get_inlinked(AffineSpace):
-        for (sprite, sprite_transform) in traverse_sprites(
-            subspace,
-            include_pixels_transform=include_pixels_transform,
-            include_sprite_transform=include_sprite_transform,
-            include_root_space_transform=False
-        ):
-            transform = sprite_transform.then(subspace.transform)
-
-            if include_root_space_transform:
-                yield (sprite, transform.then(space.transform))
-            else:
-                yield (sprite, transform)
+    return transform
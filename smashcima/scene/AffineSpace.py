@@ -1,6 +1,6 @@
 from .SceneObject import SceneObject
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Any, Optional, Tuple
 from ..geometry.Transform import Transform
 
 
@@ -21,6 +21,45 @@ class AffineSpace(SceneObject):
     to the parent's space coordinates, effectively defining the placement of
     this space within the parent space."""
 
+    _chained_transform_cache: Optional[
+        Tuple[Optional[Transform], Transform]
+    ] = field(default=None, init=False, repr=False, compare=False)
+    """Cached result of the last chain_transform call, together with the
+    parent transform it was computed for"""
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # moving the space invalidates the cached chained transform
+        # (sub-spaces notice the change, because they receive a new
+        # parent transform instance)
+        if name == "transform" or name == "parent_space":
+            object.__setattr__(self, "_chained_transform_cache", None)
+        super().__setattr__(name, value)
+
+    def chain_transform(
+        self,
+        parent_transform: Optional[Transform]
+    ) -> Transform:
+        """Returns the transform of this space chained with the accumulated
+        transform of the parent space (None stands for identity).
+        The result is cached until the transform or the parent of this space
+        changes, or until a different parent transform instance is given.
+        Transform instances are treated as immutable."""
+        cache = self._chained_transform_cache
+        if cache is not None and cache[0] is parent_transform:
+            return cache[1]
+        
+        if parent_transform is None:
+            transform = self.transform
+        else:
+            transform = self.transform.then(parent_transform)
+        
+        object.__setattr__(
+            self,
+            "_chained_transform_cache",
+            (parent_transform, transform)
+        )
+        return transform
+
     def transform_from(self, sub_space: "AffineSpace") -> Transform:
         """Returns the transform from the given space to the current space"""
         t = Transform.identity()
@@ -1,5 +1,8 @@
-from typing import Any, Type, TypeVar, List, Optional
-from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, Type, TypeVar, List
+from typing import Optional, Tuple, FrozenSet, Union, ClassVar, Literal
+from typing import get_type_hints, get_origin, get_args
+from dataclasses import dataclass, field, fields
+from smashcima.nameof_via_dummy import nameof_via_dummy
 
 
 T = TypeVar("T")
@@ -33,8 +36,8 @@ class Link:
 
     def attach(self):
         """Add the link into the graph"""
-        self.source.outlinks.append(self)
-        self.target.inlinks.append(self)
+        self.source.outlinks.add(self)
+        self.target.inlinks.add(self)
 
     def detach(self):
         """Remove the link from the graph"""
@@ -42,34 +45,428 @@ class Link:
         self.target.inlinks.remove(self)
 
 
+class LinkCollection:
+    """
+    Links attached to one end of a scene object (its inlinks or outlinks)
+    in the order in which they were attached. The links are indexed by their
+    name and by the type of the object on the other end of the link, so that
+    adding, removing and looking up links takes constant time, regardless
+    of the number of links.
+    """
+
+    def __init__(self, other_end: str, links: Iterable[Link] = ()):
+        assert other_end in ("source", "target")
+        self._other_end = other_end
+        "Which end of the links is indexed by type (source for inlinks)"
+
+        self._links: Dict[int, Tuple[int, Link]] = {}
+        "All links by their id, with their attachment order"
+
+        self._index: Dict[str, Dict[type, Dict[int, Tuple[int, Link]]]] = {}
+        "Links by name, then by the type of the other end, then by their id"
+
+        self._next_order = 0
+        "Attachment order of the next added link"
+
+        self._pending: Optional[List[Link]] = list(links) or None
+        """Links waiting to be indexed. Indexing is postponed until the first
+        use, because unpickled links may not be fully restored yet."""
+
+    def _index_pending(self):
+        pending = self._pending
+        self._pending = None
+        for link in pending:
+            self.add(link)
+
+    def add(self, link: Link):
+        """Adds the link at the end of the collection"""
+        if self._pending is not None:
+            self._index_pending()
+        entry = (self._next_order, link)
+        self._next_order += 1
+        self._links[id(link)] = entry
+        other_type = type(getattr(link, self._other_end))
+        self._index.setdefault(link.name, {}) \
+            .setdefault(other_type, {})[id(link)] = entry
+
+    def remove(self, link: Link):
+        """Removes the link, raises ValueError if not present"""
+        if self._pending is not None:
+            self._index_pending()
+        if self._links.pop(id(link), None) is None:
+            raise ValueError("The link is not in the collection")
+        other_type = type(getattr(link, self._other_end))
+        by_type = self._index[link.name]
+        bucket = by_type[other_type]
+        del bucket[id(link)]
+        if len(bucket) == 0:
+            del by_type[other_type]
+            if len(by_type) == 0:
+                del self._index[link.name]
+
+    def find_to(self, name: str, other: "SceneObject") -> Optional[Link]:
+        """Returns the last attached link with the given name, whose other end
+        is the given object, or None if there is no such link"""
+        if self._pending is not None:
+            self._index_pending()
+        bucket = self._index.get(name, {}).get(type(other), {})
+        for _, link in reversed(bucket.values()):
+            if getattr(link, self._other_end) is other:
+                return link
+        return None
+
+    def find(
+        self,
+        other_type: Type = object,
+        name: Optional[str] = None
+    ) -> List[Link]:
+        """Returns links with the given name (any name if None), whose other
+        end is an instance of the given type, in the attachment order"""
+        if self._pending is not None:
+            self._index_pending()
+        
+        if name is None:
+            by_types = list(self._index.values())
+        elif name in self._index:
+            by_types = [self._index[name]]
+        else:
+            return []
+        
+        buckets = [
+            bucket
+            for by_type in by_types
+            for bucket_type, bucket in by_type.items()
+            if issubclass(bucket_type, other_type)
+        ]
+
+        if len(buckets) == 0:
+            return []
+        if len(buckets) == 1:
+            return [link for _, link in buckets[0].values()]
+        entries = [entry for bucket in buckets for entry in bucket.values()]
+        entries.sort(key=lambda entry: entry[0])
+        return [link for _, link in entries]
+
+    def __iter__(self) -> Iterator[Link]:
+        if self._pending is not None:
+            self._index_pending()
+        # iterate a snapshot, so that links can be removed while iterating
+        return iter([link for _, link in self._links.values()])
+
+    def __len__(self) -> int:
+        if self._pending is not None:
+            return len(self._pending)
+        return len(self._links)
+
+    def __getitem__(self, index: int) -> Link:
+        return list(self)[index]
+
+    def __contains__(self, link: Link) -> bool:
+        return any(link == other for other in self)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, LinkCollection):
+            return list(self) == list(other)
+        if isinstance(other, list):
+            return list(self) == other
+        return False
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def __reduce__(self):
+        return (LinkCollection, (self._other_end, list(self)))
+
+
+class LinkedList(list):
+    """
+    List stored in a link-bearing field of a scene object. It keeps the links
+    of the owner object in sync when the list is mutated in-place
+    (e.g. measure.events.append(event)), so that only the added and removed
+    items are linked and unlinked. Reordering (sort, reverse) does not touch
+    the links at all.
+
+    Lists assigned to scene object fields are converted to linked lists
+    automatically, by copying them. The field therefore does not alias
+    the assigned list: appending to the original list afterwards does not
+    change the field, and `a.items = b.items` gives `a` its own copy.
+    Mutate the list through the field (e.g. `a.items.append(x)`) instead.
+    When the field is assigned another value, the replaced list is unbound
+    and its mutations no longer touch any links. When pickled, the list
+    is stored as a plain list and converted back by the owner
+    when unpickled.
+    """
+
+    def __init__(self, items: Iterable[Any] = ()):
+        super().__init__(items)
+        self._owner: Optional["SceneObject"] = None
+        "The scene object whose field holds this list"
+
+        self._name: Optional[str] = None
+        "Name of the field that holds this list"
+
+    def _bind(self, owner: "SceneObject", name: str):
+        self._owner = owner
+        self._name = name
+
+    def _link(self, item: Any):
+        if self._owner is not None and isinstance(item, SceneObject):
+            Link(source=self._owner, target=item, name=self._name).attach()
+
+    def _unlink(self, item: Any):
+        if self._owner is not None and isinstance(item, SceneObject):
+            link = self._owner.outlinks.find_to(self._name, item)
+            if link is not None:
+                link.detach()
+
+    def __reduce_ex__(self, protocol):
+        return (list, (list(self),))
+
+    def append(self, item: Any):
+        super().append(item)
+        self._link(item)
+
+    def extend(self, items: Iterable[Any]):
+        items = list(items)
+        super().extend(items)
+        for item in items:
+            self._link(item)
+
+    def __iadd__(self, items: Iterable[Any]):
+        self.extend(items)
+        return self
+
+    def __imul__(self, count: int):
+        items = list(self)
+        self.clear()
+        self.extend(items * count)
+        return self
+
+    def insert(self, index: int, item: Any):
+        super().insert(index, item)
+        self._link(item)
+
+    def remove(self, item: Any):
+        super().remove(item)
+        self._unlink(item)
+
+    def pop(self, index: int = -1) -> Any:
+        item = super().pop(index)
+        self._unlink(item)
+        return item
+
+    def clear(self):
+        items = list(self)
+        super().clear()
+        for item in items:
+            self._unlink(item)
+
+    def __setitem__(self, index, value):
+        removed = self[index] if isinstance(index, slice) else [self[index]]
+        if isinstance(index, slice):
+            value = list(value)
+        super().__setitem__(index, value)
+        for item in removed:
+            self._unlink(item)
+        for item in (value if isinstance(index, slice) else [value]):
+            self._link(item)
+
+    def __delitem__(self, index):
+        removed = self[index] if isinstance(index, slice) else [self[index]]
+        super().__delitem__(index)
+        for item in removed:
+            self._unlink(item)
+
+
+def _may_hold_scene_objects(annotation: Any) -> bool:
+    """Decides from a type annotation whether the annotated field can hold
+    scene objects (conservatively, unknown annotations can)"""
+    if annotation is None or annotation is type(None):
+        return False
+    origin = get_origin(annotation)
+    if origin is ClassVar:
+        return False
+    if origin is not None:
+        args = get_args(annotation)
+        if origin is Union:
+            return any(_may_hold_scene_objects(a) for a in args)
+        if origin is Literal:
+            return False
+        if len(args) == 0:
+            return True
+        return any(
+            _may_hold_scene_objects(a) for a in args if a is not Ellipsis
+        )
+    if isinstance(annotation, type):
+        if annotation in (object, list, set, frozenset, tuple, dict):
+            return True
+        return issubclass(annotation, SceneObject)
+    # typing.Any, TypeVars, unresolved forward references, ...
+    return True
+
+
+_PLAIN_FIELDS: Dict[type, FrozenSet[str]] = {}
+"""For each scene object type, the set of dataclass fields that cannot hold
+scene objects, so that assigning them does not need any link bookkeeping"""
+
+
+def _get_plain_fields(scene_object_type: type) -> FrozenSet[str]:
+    """Returns the plain (link-free) fields of the type, computed once
+    per type from its dataclass annotations and the _plain_fields
+    class attribute declarations"""
+    plain_fields = _PLAIN_FIELDS.get(scene_object_type)
+    if plain_fields is not None:
+        return plain_fields
+
+    try:
+        hints = get_type_hints(scene_object_type)
+    except Exception:
+        # unresolvable annotations, fall back to the raw ones
+        hints = {}
+        for base in reversed(scene_object_type.__mro__):
+            hints.update(getattr(base, "__annotations__", {}))
+
+    # fields declared via link descriptors are never plain
+    declared_links = {
+        d.name for d in LinkDescriptor.registered_for(scene_object_type)
+    }
+
+    inferred_plain_fields = {
+        f.name for f in fields(scene_object_type)
+        if f.name not in ("inlinks", "outlinks")
+            and f.name not in declared_links
+            and not _may_hold_scene_objects(hints.get(f.name, Any))
+    }
+
+    # attributes declared as plain (by types that are not dataclasses)
+    declared_plain_fields = {
+        name
+        for base in scene_object_type.__mro__
+        for name in vars(base).get("_plain_fields", ())
+    }
+
+    plain_fields = frozenset(inferred_plain_fields | declared_plain_fields)
+    _PLAIN_FIELDS[scene_object_type] = plain_fields
+    return plain_fields
+
+
 @dataclass
 class SceneObject:
-    inlinks: List[Link] = field(default_factory=list, init=False, repr=False)
-    outlinks: List[Link] = field(default_factory=list, init=False, repr=False)
+    inlinks: LinkCollection = field(
+        default_factory=lambda: LinkCollection("source"),
+        init=False,
+        repr=False
+    )
+    "Links pointing to this object, indexed by name and source type"
+
+    outlinks: LinkCollection = field(
+        default_factory=lambda: LinkCollection("target"),
+        init=False,
+        repr=False
+    )
+    "Links pointing from this object, indexed by name and target type"
+
+    _plain_fields: ClassVar[Tuple[str, ...]] = ()
+    """Attributes that never hold scene objects, so they can be assigned
+    without any link bookkeeping. Dataclass fields are inferred from their
+    annotations, this is meant for types that assign attributes
+    in their own constructor."""
+
+    def __setstate__(self, state: dict):
+        # objects pickled before the link index existed store plain lists
+        if isinstance(state.get("inlinks"), list):
+            state["inlinks"] = LinkCollection("source", state["inlinks"])
+        if isinstance(state.get("outlinks"), list):
+            state["outlinks"] = LinkCollection("target", state["outlinks"])
+
+        # linked lists are pickled as plain lists, the links themselves
+        # are restored with the link collections
+        plain_fields = _get_plain_fields(type(self))
+        for name, value in state.items():
+            if name in plain_fields or name in ("inlinks", "outlinks"):
+                continue
+            if type(value) is list or (
+                isinstance(value, LinkedList) and value._owner is not self
+            ):
+                linked_list = LinkedList(value)
+                linked_list._bind(self, name)
+                state[name] = linked_list
+
+        self.__dict__.update(state)
 
     def __setattr__(self, name: str, value: Any) -> None:
-        if name == "inlinks":
+        if name in _get_plain_fields(type(self)):
+            # fast path: the field cannot hold scene objects
             pass
+        elif name == "inlinks":
+            if not isinstance(value, LinkCollection):
+                value = LinkCollection("source", value)
         elif name == "outlinks":
-            pass
+            if not isinstance(value, LinkCollection):
+                value = LinkCollection("target", value)
         elif isinstance(value, SceneObject):
+            self._release_linked_list(name, value)
             self._destroy_outlinks_for(name)
             Link(source=self, target=value, name=name).attach()
-        elif isinstance(value, list) or isinstance(value, set):
-            # TODO: hook into mutation methods or freeze the instances!
+        elif isinstance(value, list):
+            value = self._relink_list(name, value)
+            self._release_linked_list(name, value)
+        elif isinstance(value, set):
+            self._release_linked_list(name, value)
             self._destroy_outlinks_for(name)
             for item in value:
                 if isinstance(item, SceneObject):
                     Link(source=self, target=item, name=name).attach()
         else:
+            self._release_linked_list(name, value)
             self._destroy_outlinks_for(name)
 
         super().__setattr__(name, value)
+
+    def _release_linked_list(self, name: str, replacement: Any):
+        """Unbinds the linked list currently held by the field (unless it is
+        also the new value), so that mutating the replaced list no longer
+        creates or removes links of this object"""
+        current = self.__dict__.get(name)
+        if isinstance(current, LinkedList) and current is not replacement \
+                and current._owner is self and current._name == name:
+            current._bind(None, None)
+
+    def _relink_list(self, name: str, items: List[Any]) -> LinkedList:
+        """Links the list items, keeping the links of items that were already
+        linked via this field, and returns the list as a linked list"""
+        # links of the previous value, by the linked object
+        old_links: Dict[int, List[Link]] = {}
+        for link in self.outlinks.find(name=name):
+            old_links.setdefault(id(link.target), []).append(link)
+
+        if isinstance(items, LinkedList) and (
+            items._owner is None
+            or (items._owner is self and items._name == name)
+        ):
+            linked_list = items
+        else:
+            linked_list = LinkedList(items)
+
+        for item in linked_list:
+            if not isinstance(item, SceneObject):
+                continue
+            kept_links = old_links.get(id(item))
+            if kept_links:
+                kept_links.pop()
+            else:
+                Link(source=self, target=item, name=name).attach()
+
+        for links in old_links.values():
+            for link in links:
+                link.detach()
+
+        linked_list._bind(self, name)
+        return linked_list
     
     def _destroy_outlinks_for(self, name: str):
-        for link in list(self.outlinks):
-            if link.name == name:
-                link.detach()
+        for link in self.outlinks.find(name=name):
+            link.detach()
     
     def get_inlinked(
         self,
@@ -85,9 +482,7 @@ class SceneObject:
         at_most_one: Returns the first found source, fails if there are more.
         """
         sources = [
-            link.source for link in self.inlinks
-            if isinstance(link.source, obj_type)
-                and (name is None or link.name == name)
+            link.source for link in self.inlinks.find(obj_type, name)
         ]
 
         if fail_if_none:
@@ -109,3 +504,70 @@ class SceneObject:
                 return sources[0]
         
         return sources
+
+
+class LinkDescriptor:
+    """
+    Describes a link-bearing field of a scene object type. Descriptors are
+    declared once at import time, so that the link name does not have to be
+    resolved (e.g. via nameof_via_dummy) every time the link is looked up.
+    All declared descriptors are kept in a registry, see registered_for().
+    """
+
+    __slots__ = ("source_type", "name")
+
+    _registry: Dict[Tuple[type, str], "LinkDescriptor"] = {}
+    "All declared descriptors, by their source type and link name"
+
+    def __init__(self, source_type: Type[SceneObject], name: str):
+        self.source_type = source_type
+        "The scene object type that holds the field"
+
+        self.name = name
+        "Name of the field, which is also the name of the links it creates"
+
+    def __repr__(self) -> str:
+        return f"LinkDescriptor({self.source_type.__name__}.{self.name})"
+
+    @staticmethod
+    def declare(
+        source_type: Type[T],
+        probe: Callable[[T], Any]
+    ) -> "LinkDescriptor":
+        """Declares the link for the field accessed by the probe lambda:
+        LinkDescriptor.declare(Measure, lambda m: m.events)"""
+        name = nameof_via_dummy(source_type, probe)
+        key = (source_type, name)
+        if key not in LinkDescriptor._registry:
+            # only check the fields of types that are dataclasses themselves,
+            # not just inheriting from one (e.g. BeamCoordinateSystem)
+            if "__dataclass_fields__" in vars(source_type):
+                assert name in {f.name for f in fields(source_type)}, \
+                    f"{source_type.__name__} has no field named {name}"
+            LinkDescriptor._registry[key] = LinkDescriptor(source_type, name)
+        return LinkDescriptor._registry[key]
+
+    @staticmethod
+    def registered_for(source_type: type) -> List["LinkDescriptor"]:
+        """Returns all declared descriptors of the type and its base types"""
+        return [
+            descriptor
+            for (registered_type, _), descriptor
+            in LinkDescriptor._registry.items()
+            if issubclass(source_type, registered_type)
+        ]
+
+    def get_sources(
+        self,
+        target: SceneObject,
+        at_most_one=False,
+        fail_if_none=False
+    ) -> List[Any] | Optional[Any] | Any:
+        """Returns objects of the source type that link to the target
+        via this link, see SceneObject.get_inlinked"""
+        return target.get_inlinked(
+            self.source_type,
+            self.name,
+            at_most_one=at_most_one,
+            fail_if_none=fail_if_none
+        )
@@ -1,7 +1,9 @@
 import numpy as np
+from typing import Any, Optional, Tuple, Union
 
 from .SceneObject import SceneObject
 from .AffineSpace import AffineSpace
+from .SpriteMask import SpriteMask
 from ..geometry.Vector2 import Vector2
 from ..geometry.Transform import Transform
 from ..geometry.Point import Point
@@ -11,11 +13,24 @@ from ..geometry.units import px_to_mm, mm_to_px
 
 class Sprite(SceneObject):
     """Sprite is a bitmap image within the scene hierarchy"""
+
+    _plain_fields = (
+        "transform", "bitmap", "_bitmap", "mask", "bitmap_origin", "dpi"
+    )
+
+    _local_transform_cache: Optional[Transform] = None
+    """Cached transform from the pixel space to the parent space"""
+
+    _chained_transform_cache: Optional[
+        Tuple[Optional[Transform], Transform]
+    ] = None
+    """Cached result of the last chain_transform call, together with the
+    space transform it was computed for"""
     
     def __init__(
         self,
         space: AffineSpace,
-        bitmap: np.ndarray,
+        bitmap: Union[np.ndarray, SpriteMask],
         bitmap_origin: Point = Point(0.5, 0.5),
         dpi: float = 300,
         transform: Transform = Transform.identity()
@@ -29,11 +44,13 @@ class Sprite(SceneObject):
         """Transform that places the sprite within the parent space - the origin
         of the transform will become the origin of the bitmap."""
 
-        assert len(bitmap.shape) == 3 # [H, W, C]
-        assert bitmap.shape[2] == 4 # BGRA
-        assert bitmap.dtype == np.uint8
+        self._bitmap: Optional[np.ndarray] = None
+        "The BGRA bitmap, if the sprite holds a bitmap"
+
+        self.mask: Optional[SpriteMask] = None
+        "The packed binary mask, if the sprite holds a mask instead of a bitmap"
+
         self.bitmap = bitmap
-        "The numpy opencv BGRA bitmap for the sprite"
 
         self.bitmap_origin = bitmap_origin
         """Origin point of the sprite in the normalized pixel space (0.0 - 1.0),
@@ -44,13 +61,56 @@ class Sprite(SceneObject):
         the sprite - how to determine the scene size in millimeters,
         when we have the size in pixels"""
     
+    def __setattr__(self, name: str, value: Any) -> None:
+        # these fields determine the transform of the sprite
+        if name in ("space", "transform", "bitmap", "bitmap_origin", "dpi"):
+            object.__setattr__(self, "_local_transform_cache", None)
+            object.__setattr__(self, "_chained_transform_cache", None)
+        super().__setattr__(name, value)
+
+    def __setstate__(self, state: dict):
+        # sprites pickled before masks were supported store the bitmap
+        if "bitmap" in state:
+            state["_bitmap"] = state.pop("bitmap")
+            state["mask"] = None
+        super().__setstate__(state)
+
+    @property
+    def bitmap(self) -> np.ndarray:
+        """The numpy opencv BGRA bitmap for the sprite. When the sprite holds
+        a packed mask, it is expanded on every access (renderers should
+        use the image property to get the mask itself)."""
+        if self._bitmap is None:
+            return self.mask.to_bitmap()
+        return self._bitmap
+
+    @bitmap.setter
+    def bitmap(self, bitmap: Union[np.ndarray, SpriteMask]):
+        if isinstance(bitmap, SpriteMask):
+            self._bitmap = None
+            self.mask = bitmap
+        else:
+            assert len(bitmap.shape) == 3 # [H, W, C]
+            assert bitmap.shape[2] == 4 # BGRA
+            assert bitmap.dtype == np.uint8
+            self._bitmap = bitmap
+            self.mask = None
+
+    @property
+    def image(self) -> Union[np.ndarray, SpriteMask]:
+        """The image data the sprite holds, either the BGRA bitmap
+        or the packed mask"""
+        if self._bitmap is None:
+            return self.mask
+        return self._bitmap
+
     @property
     def pixel_width(self) -> int:
-        return self.bitmap.shape[1]
+        return self.image.shape[1]
     
     @property
     def pixel_height(self) -> int:
-        return self.bitmap.shape[0]
+        return self.image.shape[0]
     
     @property
     def physical_width(self) -> float:
@@ -77,10 +137,63 @@ class Sprite(SceneObject):
             .then(Transform.scale(px_to_mm(1, dpi=self.dpi)))
         )
     
+    def chain_transform(
+        self,
+        space_transform: Optional[Transform]
+    ) -> Transform:
+        """Returns the transform from the pixel space of the sprite, through
+        the sprite transform and then via the accumulated transform of the
+        parent space (None stands for identity). The result is cached until
+        the sprite changes, or until a different space transform instance
+        is given. Transform instances are treated as immutable."""
+        cache = self._chained_transform_cache
+        if cache is not None and cache[0] is space_transform:
+            return cache[1]
+        
+        local_transform = self._local_transform_cache
+        if local_transform is None:
+            local_transform = self.get_pixels_to_scene_transform() \
+                .then(self.transform)
+            object.__setattr__(self, "_local_transform_cache", local_transform)
+
+        if space_transform is None:
+            transform = local_transform
+        else:
+            transform = local_transform.then(space_transform)
+        
+        object.__setattr__(
+            self,
+            "_chained_transform_cache",
+            (space_transform, transform)
+        )
+        return transform
+    
     def detach(self):
         """Detaches the sprite from the scene hierarchy"""
         self.space = None
 
+    def create_instance(self, space: AffineSpace) -> "Sprite":
+        """Creates a new sprite in the given space that shares the bitmap
+        (or the mask) with this sprite, instead of copying it. The shared
+        bitmap is marked as read-only, so that modifying it in-place
+        fails loudly."""
+        if self._bitmap is not None:
+            self._bitmap.flags.writeable = False
+        instance = Sprite(
+            space=space,
+            bitmap=self.image,
+            bitmap_origin=self.bitmap_origin,
+            dpi=self.dpi,
+            transform=self.transform
+        )
+        # the geometry is the same, so is the local transform
+        object.__setattr__(
+            instance,
+            "_local_transform_cache",
+            self._local_transform_cache
+        )
+        return instance
+
     @staticmethod
     def debug_box(
         space: AffineSpace,
@@ -0,0 +1,92 @@
+from typing import Any, Tuple
+import numpy as np
+
+
+class SpriteMask:
+    """
+    Binary (one bit per pixel) sprite image, stored packed eight pixels
+    per byte, together with the single color of its ink. Datasets of binary
+    glyph masks (e.g. MUSCIMA++) stored as BGRA bitmaps hold 32x more data
+    than they need to. Sprites can hold a mask instead of a bitmap and
+    renderers can composite it directly, without expanding it first.
+
+    The mask is immutable and its packed array is read-only.
+    """
+
+    __slots__ = ("packed", "width", "height", "ink_color")
+
+    def __init__(
+        self,
+        packed: np.ndarray,
+        width: int,
+        height: int,
+        ink_color: Tuple[int, int, int, int] = (0, 0, 0, 255) # BGRA
+    ):
+        assert packed.dtype == np.uint8
+        assert packed.shape == (height, (width + 7) // 8)
+        assert len(ink_color) == 4
+        # read-only arrays (e.g. memory-mapped files) are used as they are
+        if packed.flags.writeable:
+            packed = np.array(packed)
+            packed.flags.writeable = False
+        _set_packed(self, packed)
+        _set_width(self, int(width))
+        _set_height(self, int(height))
+        _set_ink_color(self, tuple(int(c) for c in ink_color))
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("SpriteMask is immutable")
+
+    def __reduce__(self):
+        return (
+            SpriteMask,
+            (self.packed, self.width, self.height, self.ink_color)
+        )
+
+    def __repr__(self):
+        return f"SpriteMask(width={self.width}, height={self.height}, " + \
+            f"ink_color={self.ink_color})"
+
+    @staticmethod
+    def from_mask(
+        mask: np.ndarray,
+        ink_color: Tuple[int, int, int, int] = (0, 0, 0, 255) # BGRA
+    ) -> "SpriteMask":
+        """Packs a [H, W] mask, where non-zero values are the ink pixels"""
+        assert len(mask.shape) == 2
+        return SpriteMask(
+            packed=np.packbits(mask != 0, axis=1),
+            width=mask.shape[1],
+            height=mask.shape[0],
+            ink_color=ink_color
+        )
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        """Shape of the equivalent BGRA bitmap"""
+        return (self.height, self.width, 4)
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the packed mask in bytes"""
+        return self.packed.nbytes
+
+    def unpack(self) -> np.ndarray:
+        """Returns the [H, W] boolean mask of the ink pixels"""
+        return np.unpackbits(
+            self.packed, axis=1, count=self.width
+        ).view(np.bool_)
+
+    def to_bitmap(self) -> np.ndarray:
+        """Expands the mask into a BGRA uint8 bitmap, with the ink color
+        over the ink pixels and transparent black elsewhere"""
+        bitmap = np.zeros(shape=self.shape, dtype=np.uint8)
+        bitmap[self.unpack()] = self.ink_color
+        return bitmap
+
+
+# immutable instances are initialized via the slot descriptors directly
+_set_packed = SpriteMask.packed.__set__
+_set_width = SpriteMask.width.__set__
+_set_height = SpriteMask.height.__set__
+_set_ink_color = SpriteMask.ink_color.__set__
@@ -5,6 +5,8 @@ from .SceneObject import SceneObject
 class ViewBox(SceneObject):
     """Viewport into the scene, always denoted in the global scene space"""
 
+    _plain_fields = ("rectangle",)
+
     def __init__(self, rectangle: Rectangle):
         super().__init__()
 
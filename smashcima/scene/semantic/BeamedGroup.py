@@ -1,10 +1,9 @@
 from dataclasses import dataclass, field
-from ..SceneObject import SceneObject
-from typing import List, Optional, Dict, Tuple, Generator, Any
+from ..SceneObject import SceneObject, LinkDescriptor
+from typing import List, Optional, Dict, Tuple, Generator, Any, ClassVar
 from .Note import Note
 from .Chord import Chord
 from .BeamValue import BeamValue
-from smashcima.nameof_via_dummy import nameof_via_dummy
 
 
 @dataclass
@@ -21,14 +20,16 @@ class BeamedGroup(SceneObject):
     beam_values: List[Dict[int, BeamValue]] = field(default_factory=list)
     """For each chord there is a dictionary, mapping beam numbers to beam values"""
 
+    CHORDS_LINK: ClassVar[LinkDescriptor]
+    "Links from beamed groups to their chords"
+
     @staticmethod
     def of_chord(
         chord: Chord,
         fail_if_none=False
     ) -> Optional["BeamedGroup"] | "BeamedGroup":
-        return chord.get_inlinked(
-            BeamedGroup,
-            nameof_via_dummy(BeamedGroup, lambda g: g.chords),
+        return BeamedGroup.CHORDS_LINK.get_sources(
+            chord,
             at_most_one=True,
             fail_if_none=fail_if_none
         )
@@ -70,3 +71,8 @@ class BeamedGroup(SceneObject):
             for beam_number, beam_value in beam_values.items():
                 if beam_value in [BeamValue.forward_hook, BeamValue.backward_hook]:
                     yield (beam_number, chord, beam_value)
+
+
+BeamedGroup.CHORDS_LINK = LinkDescriptor.declare(
+    BeamedGroup, lambda g: g.chords
+)
@@ -1,10 +1,9 @@
 from dataclasses import dataclass, field
-from ..SceneObject import SceneObject
-from typing import List, Optional
+from ..SceneObject import SceneObject, LinkDescriptor
+from typing import List, Optional, ClassVar
 from .Note import Note
 from .Event import Event
 from .StemValue import StemValue
-from smashcima.nameof_via_dummy import nameof_via_dummy
 
 
 @dataclass
@@ -21,14 +20,16 @@ class Chord(SceneObject):
     stem_value: StemValue = StemValue.none
     "What orientation does the stem have. If none, infer when rendering."
 
+    NOTES_LINK: ClassVar[LinkDescriptor]
+    "Links from chords to their notes"
+
     @staticmethod
     def of_note(
         note: Note,
         fail_if_none=False
     ) -> Optional["Chord"] | "Chord":
-        return note.get_inlinked(
-            Chord,
-            nameof_via_dummy(Chord, lambda c: c.notes),
+        return Chord.NOTES_LINK.get_sources(
+            note,
             at_most_one=True,
             fail_if_none=fail_if_none
         )
@@ -61,3 +62,6 @@ class Chord(SceneObject):
         notes = [*self.notes, note]
         notes.sort(key=lambda n: n.pitch.get_linear_pitch()) # ascending by pitch
         self.notes = notes
+
+
+Chord.NOTES_LINK = LinkDescriptor.declare(Chord, lambda c: c.notes)
@@ -1,11 +1,10 @@
 from dataclasses import dataclass, field
-from ..SceneObject import SceneObject
+from ..SceneObject import SceneObject, LinkDescriptor
 from fractions import Fraction
 from .Durable import Durable
 from .Attributes import Attributes
 from .AttributesChange import AttributesChange
-from typing import List, Optional
-from smashcima.nameof_via_dummy import nameof_via_dummy
+from typing import List, Optional, ClassVar
 
 
 @dataclass
@@ -27,14 +26,19 @@ class Event(SceneObject):
     """Change of attributes when entering this event. If None, there is no
     change on this event."""
 
+    DURABLES_LINK: ClassVar[LinkDescriptor]
+    "Links from events to their durables"
+
     @staticmethod
     def of_durable(
         durable: Durable,
         fail_if_none=False
     ) -> Optional["Event"] | "Event":
-        return durable.get_inlinked(
-            Event,
-            nameof_via_dummy(Event, lambda e: e.durables),
+        return Event.DURABLES_LINK.get_sources(
+            durable,
             at_most_one=True,
             fail_if_none=fail_if_none
         )
+
+
+Event.DURABLES_LINK = LinkDescriptor.declare(Event, lambda e: e.durables)
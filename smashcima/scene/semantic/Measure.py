@@ -1,13 +1,12 @@
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Optional, ClassVar
 from fractions import Fraction
-from ..SceneObject import SceneObject
+from ..SceneObject import SceneObject, LinkDescriptor
 from .Durable import Durable
 from .Event import Event
 from .Staff import Staff
 from .AttributesChange import AttributesChange
 from typing import List
-from smashcima.nameof_via_dummy import nameof_via_dummy
 
 
 @dataclass
@@ -20,6 +19,12 @@ class Measure(SceneObject):
     staves: List[Staff] = field(default_factory=list)
     """Links to all staves within this measure"""
 
+    EVENTS_LINK: ClassVar[LinkDescriptor]
+    "Links from measures to their events"
+
+    STAVES_LINK: ClassVar[LinkDescriptor]
+    "Links from measures to their staves"
+
     @property
     def first_event(self) -> Event:
         assert self.events[0].fractional_measure_onset == 0, \
@@ -41,9 +46,8 @@ class Measure(SceneObject):
         event: Event,
         fail_if_none=False
     ) -> Optional["Measure"] | "Measure":
-        return event.get_inlinked(
-            Measure,
-            nameof_via_dummy(Measure, lambda m: m.events),
+        return Measure.EVENTS_LINK.get_sources(
+            event,
             at_most_one=True,
             fail_if_none=fail_if_none
         )
@@ -53,9 +57,8 @@ class Measure(SceneObject):
         staff: Staff,
         fail_if_none=False
     ) -> Optional["Measure"] | "Measure":
-        return staff.get_inlinked(
-            Measure,
-            nameof_via_dummy(Measure, lambda m: m.staves),
+        return Measure.STAVES_LINK.get_sources(
+            staff,
             at_most_one=True,
             fail_if_none=fail_if_none
         )
@@ -115,3 +118,7 @@ class Measure(SceneObject):
     def sort_staves_by_number(self):
         """Sorts staves by number, ascending"""
         self.staves.sort(key=lambda e: e.staff_number)
+
+
+Measure.EVENTS_LINK = LinkDescriptor.declare(Measure, lambda m: m.events)
+Measure.STAVES_LINK = LinkDescriptor.declare(Measure, lambda m: m.staves)
@@ -1,10 +1,9 @@
 from dataclasses import dataclass, field
-from ..SceneObject import SceneObject
-from typing import List, Optional
+from ..SceneObject import SceneObject, LinkDescriptor
+from typing import List, Optional, ClassVar
 from .Measure import Measure
 from .Attributes import Attributes
 from .Staff import Staff
-from smashcima.nameof_via_dummy import nameof_via_dummy
 
 
 @dataclass
@@ -17,20 +16,23 @@ class Part(SceneObject):
     staff_count: int = 1
     "Number of staves for this part (each measure should have all of them)"
 
+    MEASURES_LINK: ClassVar[LinkDescriptor]
+    "Links from parts to their measures"
+
     @staticmethod
     def of_measure(
         measure: Measure,
         fail_if_none=False
     ) -> Optional["Part"] | "Part":
-        return measure.get_inlinked(
-            Part,
-            nameof_via_dummy(Part, lambda p: p.measures),
+        return Part.MEASURES_LINK.get_sources(
+            measure,
             at_most_one=True,
             fail_if_none=fail_if_none
         )
 
     def append_measure(self, measure: Measure):
-        self.measures = [*self.measures, measure]
+        """Appends a measure to the part, linking only the new measure"""
+        self.measures.append(measure)
     
     def compute_event_attributes(self):
         """Sets attributes for all events based on present attributes changes"""
@@ -76,3 +78,6 @@ class Part(SceneObject):
             for si in range(self.staff_count):
                 assert measure.staves[si].staff_number == si + 1, \
                     f"Measure {mi} has incorrect staff numbers"
+
+
+Part.MEASURES_LINK = LinkDescriptor.declare(Part, lambda p: p.measures)
@@ -1,8 +1,7 @@
 from dataclasses import dataclass, field
-from ..SceneObject import SceneObject
-from typing import List, Optional
+from ..SceneObject import SceneObject, LinkDescriptor
+from typing import List, Optional, ClassVar
 from .Durable import Durable
-from smashcima.nameof_via_dummy import nameof_via_dummy
 
 
 @dataclass
@@ -18,6 +17,9 @@ class Staff(SceneObject):
     durables: List[Durable] = field(default_factory=list)
     "Links to all durables within this staff"
 
+    DURABLES_LINK: ClassVar[LinkDescriptor]
+    "Links from staves to their durables"
+
     @property
     def staff_index(self) -> int:
         """Zero-based index of the staff in measure stafflines"""
@@ -28,9 +30,11 @@ class Staff(SceneObject):
         durable: Durable,
         fail_if_none=False
     ) -> Optional["Staff"] | "Staff":
-        return durable.get_inlinked(
-            Staff,
-            nameof_via_dummy(Staff, lambda s: s.durables),
+        return Staff.DURABLES_LINK.get_sources(
+            durable,
             at_most_one=True,
             fail_if_none=fail_if_none
         )
+
+
+Staff.DURABLES_LINK = LinkDescriptor.declare(Staff, lambda s: s.durables)
@@ -3,7 +3,6 @@ from ..semantic.Chord import Chord
 from ..semantic.BeamedGroup import BeamedGroup
 from .BeamCoordinateSystem import BeamCoordinateSystem
 from dataclasses import dataclass, field
-from smashcima.nameof_via_dummy import nameof_via_dummy
 from typing import List
 
 
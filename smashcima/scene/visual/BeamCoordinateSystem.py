@@ -2,15 +2,19 @@ from ..semantic.StemValue import StemValue
 from ..semantic.BeamedGroup import BeamedGroup
 from ..AffineSpace import AffineSpace
 from smashcima.geometry.Point import Point
-from ..SceneObject import SceneObject
-from smashcima.nameof_via_dummy import nameof_via_dummy
-from typing import Optional
+from ..SceneObject import SceneObject, LinkDescriptor
+from typing import Optional, ClassVar
 
 
 class BeamCoordinateSystem(SceneObject):
     """Defines the placement and slope of a beamed group. All values are in the
     paper coordinate system (paper space)."""
 
+    _plain_fields = ("k", "q", "beam_spacing")
+
+    BEAMED_GROUP_LINK: ClassVar[LinkDescriptor]
+    "Links from beam coordinate systems to their beamed groups"
+
     def __init__(
         self,
         beamed_group: BeamedGroup,
@@ -41,9 +45,8 @@ class BeamCoordinateSystem(SceneObject):
         beamed_group: BeamedGroup,
         fail_if_none=False
     ) -> Optional["BeamCoordinateSystem"] | "BeamCoordinateSystem":
-        return beamed_group.get_inlinked(
-            BeamCoordinateSystem,
-            nameof_via_dummy(BeamCoordinateSystem, lambda c: c.beamed_group),
+        return BeamCoordinateSystem.BEAMED_GROUP_LINK.get_sources(
+            beamed_group,
             at_most_one=True,
             fail_if_none=fail_if_none
         )
@@ -77,3 +80,8 @@ class BeamCoordinateSystem(SceneObject):
         """Invokes the linear function and instead of returning just Y,
         it returns the whole [X, Y] point"""
         return Point(x, self(x, beam_number, stem_value))
+
+
+BeamCoordinateSystem.BEAMED_GROUP_LINK = LinkDescriptor.declare(
+    BeamCoordinateSystem, lambda c: c.beamed_group
+)
@@ -6,11 +6,15 @@ from ..ScenePoint import ScenePoint
 from smashcima.geometry.Polygon import Polygon
 from smashcima.geometry.Rectangle import Rectangle
 from smashcima.geometry.Point import Point
-from typing import List
+from typing import List, TypeVar
+import dataclasses
 import numpy as np
 import cv2
 
 
+T = TypeVar("T", bound="Glyph")
+
+
 @dataclass
 class Glyph(SceneObject):
     """
@@ -47,12 +51,42 @@ class Glyph(SceneObject):
         """Unlink the glyph from the scene"""
         self.space.parent_space = None
     
+    def create_instance(self: T) -> T:
+        """Creates a new glyph that looks the same as this one, with its own
+        space, sprites and scene points, so that it can be placed into a scene
+        independently. Unlike copy.deepcopy, the sprite bitmaps are shared
+        (and made read-only) and objects linking to this glyph
+        (e.g. dataset metadata) are not copied. Use this to instantiate
+        glyphs from a symbol repository."""
+        space = AffineSpace(transform=self.space.transform)
+
+        # scene points placed in the glyph space are re-placed
+        # into the new space, other field values are shared
+        overrides = {}
+        for f in dataclasses.fields(self):
+            if not f.init:
+                continue
+            value = getattr(self, f.name)
+            if isinstance(value, ScenePoint) and value.space is self.space:
+                overrides[f.name] = ScenePoint(point=value.point, space=space)
+
+        return dataclasses.replace(
+            self,
+            space=space,
+            sprites=[sprite.create_instance(space) for sprite in self.sprites],
+            **overrides
+        )
+    
     def get_segmentation_mask_of_sprite(self, sprite: Sprite) -> np.ndarray:
         """Given a sprite in this glyph, returns its segmentation mask
         (a 2D array of booleans for the sprite bitmap). Override this
         method to control the semantic segmentation output for the glyph."""
         assert sprite in self.sprites, "Given sprite must belong to this glyph"
 
+        # packed masks hold the segmentation directly
+        if sprite.mask is not None:
+            return sprite.mask.unpack()
+
         # default behaviour: 0.5-thresholded alfa channel
         return sprite.bitmap[:, :, 3] >= 0.5
     
@@ -90,7 +124,14 @@ class Glyph(SceneObject):
         """Returns the bounding box of this glyph in the given affine space"""
         transform = space.transform_from(self.space)
         contours = self.get_contours()
-        point_cloud = Polygon([p for c in contours for p in c.points])
+        if len(contours) == 0:
+            raise ValueError(
+                f"The glyph '{self.glyph_class}' has an empty segmentation " + \
+                "mask, so it has no bounding box."
+            )
+        point_cloud = Polygon.from_array(
+            np.concatenate([c.array for c in contours])
+        )
         point_cloud_transformed = transform.apply_to(point_cloud)
         return point_cloud_transformed.bbox()
 
@@ -1,9 +1,9 @@
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import List, Optional, ClassVar
 from ..semantic.Note import Note
 from .Glyph import Glyph
 from .NoteheadSide import NoteheadSide
-from smashcima.nameof_via_dummy import nameof_via_dummy
+from ..SceneObject import LinkDescriptor
 
 
 @dataclass
@@ -25,14 +25,19 @@ class Notehead(Glyph):
     chord where noteheads have to be from both sides of the stem.
     None means there should not ever be such a stem attached."""
 
+    NOTES_LINK: ClassVar[LinkDescriptor]
+    "Links from noteheads to the notes they represent"
+
     @staticmethod
     def of_note(
         note: Note,
         fail_if_none=False
     ) -> Optional["Notehead"] | "Notehead":
-        return note.get_inlinked(
-            Notehead,
-            nameof_via_dummy(Notehead, lambda n: n.notes),
+        return Notehead.NOTES_LINK.get_sources(
+            note,
             at_most_one=True,
             fail_if_none=fail_if_none
         )
+
+
+Notehead.NOTES_LINK = LinkDescriptor.declare(Notehead, lambda n: n.notes)
@@ -1,9 +1,9 @@
 from .LineGlyph import LineGlyph
 from ..semantic.Chord import Chord
 from dataclasses import dataclass
-from typing import Optional
-from smashcima.nameof_via_dummy import nameof_via_dummy
+from typing import Optional, ClassVar
 from ..ScenePoint import ScenePoint
+from ..SceneObject import LinkDescriptor
 
 
 @dataclass
@@ -14,6 +14,9 @@ class Stem(LineGlyph):
     """The chord containing the notes that this stem is for. Can be None
     only during construction, otherwise must be set."""
 
+    CHORD_LINK: ClassVar[LinkDescriptor]
+    "Links from stems to their chords"
+
     @property
     def base(self) -> ScenePoint:
         """Base of the stem, in glyph space coordinates"""
@@ -29,9 +32,8 @@ class Stem(LineGlyph):
         chord: Chord,
         fail_if_none=False
     ) -> Optional["Stem"] | "Stem":
-        return chord.get_inlinked(
-            Stem,
-            nameof_via_dummy(Stem, lambda s: s.chord),
+        return Stem.CHORD_LINK.get_sources(
+            chord,
             at_most_one=True,
             fail_if_none=fail_if_none
         )
@@ -39,3 +41,6 @@ class Stem(LineGlyph):
     def detach(self):
         self.space.parent_space = None
         self.chord = None
+
+
+Stem.CHORD_LINK = LinkDescriptor.declare(Stem, lambda s: s.chord)
@@ -4,10 +4,11 @@ from smashcima.scene.visual.Glyph import Glyph
 from smashcima.assets.AssetRepository import AssetRepository
 from smashcima.assets.glyphs.muscima_pp.MuscimaPPGlyphs import MuscimaPPGlyphs
 from smashcima.assets.glyphs.muscima_pp.MppGlyphClass import MppGlyphClass
+from smashcima.assets.glyphs.muscima_pp.MppGlyphMetadata \
+    import MppGlyphMetadata
 from .SmuflGlyphClass import SmuflGlyphClass
 from smashcima.synthesis.style.MuscimaPPStyleDomain import MuscimaPPStyleDomain
 import random
-import copy
 
 
 _QUERY_TO_MPP_LOOKUP: Dict[str, str] = {
@@ -84,8 +85,12 @@ class MuscimaPPGlyphSynthesizer(GlyphSynthesizer):
         else:
             raise Exception("Unsupported glyph class: " + glyph_class)
 
-        # make a copy of that glyph before returning
-        glyph_copy = copy.deepcopy(glyph)
+        # make an instance of that glyph before returning
+        # (shares the bitmaps with the symbol repository)
+        glyph_copy = glyph.create_instance()
+        metadata = MppGlyphMetadata.of_glyph(glyph)
+        if metadata is not None:
+            metadata.stamp_glyph_instance(glyph_copy)
 
         # adjust its glyph class to match what the user wants
         # (e.g. SMUFL instead of MUSCIMA++)
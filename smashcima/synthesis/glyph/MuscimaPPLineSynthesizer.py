@@ -3,13 +3,16 @@ from smashcima.geometry.Vector2 import Vector2
 from smashcima.assets.AssetRepository import AssetRepository
 from smashcima.assets.glyphs.muscima_pp.MuscimaPPGlyphs import MuscimaPPGlyphs
 from smashcima.assets.glyphs.muscima_pp.MppGlyphClass import MppGlyphClass
+from smashcima.assets.glyphs.muscima_pp.MppGlyphMetadata \
+    import MppGlyphMetadata
 from smashcima.assets.glyphs.muscima_pp.LineList import LineList
+from smashcima.assets.glyphs.muscima_pp.PooledGlyphList \
+    import PooledLineList
 from smashcima.synthesis.glyph.SmuflGlyphClass import SmuflGlyphClass
 from smashcima.synthesis.glyph.SmashcimaGlyphClass import SmashcimaGlyphClass
 from smashcima.synthesis.style.MuscimaPPStyleDomain import MuscimaPPStyleDomain
 from typing import Type, Dict
 import random
-import copy
 
 
 _QUERY_TO_MPP_LOOKUP: Dict[str, str] = {
@@ -66,7 +69,7 @@ class MuscimaPPLineSynthesizer(NaiveLineSynthesizer):
         glyphs = self.symbol_repository.glyphs_by_class_and_writer.get(
             (mpp_glyph_class, self.mpp_style_domain.current_writer)
         ) or self.symbol_repository.glyphs_by_class.get(mpp_glyph_class)
-        assert isinstance(glyphs, LineList), \
+        assert isinstance(glyphs, (LineList, PooledLineList)), \
             f"Got line glyphs without index for {mpp_glyph_class}"
 
         if glyphs is None or len(glyphs) == 0:
@@ -75,10 +78,13 @@ class MuscimaPPLineSynthesizer(NaiveLineSynthesizer):
                 "the symbol repository"
             )
 
-        # pick a random glyph from the list and copy it
-        glyph = copy.deepcopy(
-            glyphs.pick_line(delta.magnitude, self.rng)
-        )
+        # pick a random glyph from the list and instantiate it
+        # (shares the bitmaps with the symbol repository)
+        picked_glyph = glyphs.pick_line(delta.magnitude, self.rng)
+        glyph = picked_glyph.create_instance()
+        metadata = MppGlyphMetadata.of_glyph(picked_glyph)
+        if metadata is not None:
+            metadata.stamp_glyph_instance(glyph)
 
         assert type(glyph) is glyph_type, \
             f"Picked glyph is of different type: {type(glyph)}"
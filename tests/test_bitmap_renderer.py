@@ -0,0 +1,149 @@
+import unittest
+from math import ceil
+import numpy as np
+from smashcima.scene.Scene import Scene
+from smashcima.scene.Sprite import Sprite
+from smashcima.scene.AffineSpace import AffineSpace
+from smashcima.scene.ViewBox import ViewBox
+from smashcima.geometry.Transform import Transform
+from smashcima.geometry.Rectangle import Rectangle
+from smashcima.geometry.Vector2 import Vector2
+from smashcima.geometry.Point import Point
+from smashcima.geometry.Quad import Quad
+from smashcima.geometry.units import mm_to_px
+from smashcima.rendering.BitmapRenderer import BitmapRenderer
+from smashcima.rendering.RenderList import RenderList
+from smashcima.rendering.traverse_sprites import traverse_sprites
+
+
+def build_scene(seed: int = 0, sprite_count: int = 100) -> Scene:
+    """Random sprites in nested spaces, translated, scaled and rotated,
+    some of them outside of the test view box"""
+    rng = np.random.default_rng(seed)
+    scene = Scene()
+    spaces = [scene.space]
+    for i in range(6):
+        transform = Transform.translate(
+            Vector2(rng.uniform(0, 30), rng.uniform(0, 30))
+        )
+        if i % 3 == 0:
+            transform = transform.then(
+                Transform.rotateDegCC(float(rng.uniform(-20, 20)))
+            )
+        spaces.append(AffineSpace(
+            parent_space=spaces[rng.integers(len(spaces))],
+            transform=transform
+        ))
+    for i in range(sprite_count):
+        bitmap = np.zeros(
+            shape=(rng.integers(5, 40), rng.integers(5, 40), 4),
+            dtype=np.uint8
+        )
+        bitmap[:, :, 3] = (rng.random(bitmap.shape[:2]) > 0.5) * 255
+        bitmap[:, :, :3] = rng.integers(0, 256, size=(*bitmap.shape[:2], 3))
+        transform = Transform.translate(
+            Vector2(rng.uniform(-20, 100), rng.uniform(-20, 100))
+        )
+        if i % 4 == 1:
+            transform = Transform.scale(float(rng.uniform(0.3, 2))) \
+                .then(transform)
+        if i % 4 == 2:
+            transform = Transform.rotateDegCC(float(rng.uniform(0, 90))) \
+                .then(transform)
+        Sprite(
+            space=spaces[rng.integers(len(spaces))],
+            bitmap=bitmap,
+            bitmap_origin=Point(float(rng.random()), float(rng.random())),
+            dpi=[300, 150, 600][i % 3],
+            transform=transform
+        )
+    return scene
+
+
+VIEW_BOX = ViewBox(Rectangle(3.3, 2.1, 60, 50))
+
+
+class BitmapRendererTest(unittest.TestCase):
+    def test_tiled_rendering_equals_single_pass(self):
+        scene = build_scene()
+        expected = BitmapRenderer(dpi=300).render(scene, VIEW_BOX)
+        for tile_size in [1000, 97, 64, 13]:
+            actual = BitmapRenderer(dpi=300, tile_size=tile_size) \
+                .render(scene, VIEW_BOX)
+            self.assertTrue(np.array_equal(expected, actual), tile_size)
+
+    def test_tiled_rendering_at_lower_dpi(self):
+        scene = build_scene(seed=1)
+        expected = BitmapRenderer(dpi=150).render(scene, VIEW_BOX)
+        actual = BitmapRenderer(dpi=150, tile_size=50).render(scene, VIEW_BOX)
+        self.assertTrue(np.array_equal(expected, actual))
+
+    def test_parallel_rendering_equals_single_pass(self):
+        scene = build_scene(seed=2)
+        expected = BitmapRenderer(dpi=300).render(scene, VIEW_BOX)
+        for tile_size in [None, 64]:
+            actual = BitmapRenderer(dpi=300, tile_size=tile_size, workers=4) \
+                .render(scene, VIEW_BOX)
+            self.assertTrue(np.array_equal(expected, actual), tile_size)
+
+    def test_render_list_culling_matches_per_sprite_windows(self):
+        scene = build_scene(seed=3)
+        renderer = BitmapRenderer(dpi=300)
+        canvas_px_bbox = Rectangle(
+            x=0,
+            y=0,
+            width=ceil(mm_to_px(VIEW_BOX.rectangle.width, dpi=300)),
+            height=ceil(mm_to_px(VIEW_BOX.rectangle.height, dpi=300))
+        )
+        draw_calls = list(renderer._build_draw_calls(
+            RenderList.compile(scene), VIEW_BOX, canvas_px_bbox, 300
+        ))
+
+        # the windows computed sprite by sprite, as before the render lists
+        scene_to_canvas_transform = Transform.translate(
+            -VIEW_BOX.rectangle.top_left_corner.vector
+        ).then(Transform.scale(mm_to_px(1, dpi=300)))
+        expected = []
+        for sprite, sprite_transform in traverse_sprites(
+            scene.space,
+            include_pixels_transform=True,
+            include_sprite_transform=True,
+            include_root_space_transform=False
+        ):
+            to_canvas_transform = sprite_transform \
+                .then(scene_to_canvas_transform)
+            window = to_canvas_transform.apply_to(
+                Quad.from_rectangle(sprite.pixels_bbox.dilate(1.0))
+            ).bbox().snap_grow().intersect_with(canvas_px_bbox)
+            if window.has_no_area:
+                continue
+            expected.append((window, to_canvas_transform.then(
+                Transform.translate(-window.top_left_corner.vector)
+            )))
+
+        self.assertGreater(len(expected), 0)
+        self.assertLess(len(expected), len(list(traverse_sprites(
+            scene.space,
+            include_pixels_transform=True,
+            include_sprite_transform=True,
+            include_root_space_transform=False
+        ))))
+        self.assertEqual(len(draw_calls), len(expected))
+        for call, (window, transform) in zip(draw_calls, expected):
+            w = call.canvas_window
+            self.assertEqual(
+                (w.x, w.y, w.width, w.height),
+                (window.x, window.y, window.width, window.height)
+            )
+            self.assertTrue(np.allclose(
+                call.to_window_transform.matrix, transform.matrix
+            ))
+
+    def test_compiled_render_list_renders_like_the_scene(self):
+        scene = build_scene(seed=4)
+        renderer = BitmapRenderer(dpi=300)
+        render_list = RenderList.compile(scene)
+        self.assertTrue(np.array_equal(
+            renderer.render(scene, VIEW_BOX),
+            renderer.render_compiled(render_list, VIEW_BOX)
+        ))
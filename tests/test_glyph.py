@@ -0,0 +1,29 @@
+import unittest
+import numpy as np
+from smashcima.scene.Sprite import Sprite
+from smashcima.scene.visual.Glyph import Glyph
+
+
+class GlyphTest(unittest.TestCase):
+    def test_bbox_of_glyph(self):
+        glyph = Glyph(glyph_class="test")
+        bitmap = np.zeros(shape=(10, 10, 4), dtype=np.uint8)
+        bitmap[2:8, 3:7, 3] = 255
+        glyph.sprites = [Sprite(space=glyph.space, bitmap=bitmap)]
+
+        bbox = glyph.get_bbox_in_space(glyph.space)
+        self.assertGreater(bbox.width, 0)
+        self.assertGreater(bbox.height, 0)
+
+    def test_bbox_of_empty_glyph_raises(self):
+        glyph = Glyph(glyph_class="test")
+        bitmap = np.zeros(shape=(10, 10, 4), dtype=np.uint8)
+        glyph.sprites = [Sprite(space=glyph.space, bitmap=bitmap)]
+
+        with self.assertRaisesRegex(ValueError, "empty segmentation mask"):
+            glyph.get_bbox_in_space(glyph.space)
+
+    def test_bbox_of_glyph_without_sprites_raises(self):
+        glyph = Glyph(glyph_class="test")
+        with self.assertRaisesRegex(ValueError, "empty segmentation mask"):
+            glyph.get_bbox_in_space(glyph.space)
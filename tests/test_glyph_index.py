@@ -0,0 +1,201 @@
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Optional, Tuple, Type
+
+import numpy as np
+
+from smashcima.assets.glyphs.muscima_pp.GlyphIndex import GlyphIndex
+from smashcima.assets.glyphs.muscima_pp.MppGlyphMetadata \
+    import MppGlyphMetadata
+from smashcima.geometry.Point import Point
+from smashcima.scene.ScenePoint import ScenePoint
+from smashcima.scene.Sprite import Sprite
+from smashcima.scene.SpriteMask import SpriteMask
+from smashcima.scene.visual.Glyph import Glyph
+from smashcima.scene.visual.LineGlyph import LineGlyph
+
+
+def make_glyph(
+    glyph_type: Type[Glyph],
+    glyph_class: str,
+    writer: int,
+    objid: int,
+    size: Tuple[int, int] = (9, 5),
+    line: Optional[Tuple[float, float, float, float]] = None
+) -> Glyph:
+    """Creates a glyph the way the MUSCIMA++ extraction does"""
+    width, height = size
+    rng = np.random.default_rng(objid)
+    glyph = glyph_type(glyph_class=glyph_class)
+    glyph.sprites = [
+        Sprite(
+            space=glyph.space,
+            bitmap=SpriteMask.from_mask(
+                rng.random(size=(height, width)) < 0.5,
+                ink_color=(0, 0, 0, 200 + writer)
+            ),
+            bitmap_origin=Point(0.25, 0.75),
+            dpi=300
+        )
+    ]
+    if line is not None:
+        glyph.start_point = ScenePoint(
+            point=Point(line[0], line[1]), space=glyph.space
+        )
+        glyph.end_point = ScenePoint(
+            point=Point(line[2], line[3]), space=glyph.space
+        )
+    MppGlyphMetadata(
+        glyph=glyph,
+        mpp_writer=writer,
+        mpp_piece=1,
+        mpp_numeric_objid=objid
+    )
+    return glyph
+
+
+def make_glyphs():
+    return [
+        make_glyph(Glyph, "noteheadBlack", writer=1, objid=1),
+        make_glyph(Glyph, "restQuarter", writer=2, objid=2, size=(17, 3)),
+        make_glyph(
+            LineGlyph, "stem", writer=1, objid=3, size=(3, 20),
+            line=(0.0, 0.0, 0.5, -6.0)
+        ),
+        make_glyph(Glyph, "noteheadBlack", writer=2, objid=4, size=(8, 8)),
+        make_glyph(
+            LineGlyph, "stem", writer=2, objid=5, size=(2, 11),
+            line=(0.0, 0.0, 0.0, -3.0)
+        ),
+    ]
+
+
+class GlyphIndexTest(unittest.TestCase):
+    def assert_same_glyph(self, loaded: Glyph, original: Glyph):
+        self.assertIs(type(loaded), type(original))
+        self.assertEqual(loaded.glyph_class, original.glyph_class)
+
+        metadata = MppGlyphMetadata.of_glyph(loaded, fail_if_none=True)
+        expected = MppGlyphMetadata.of_glyph(original, fail_if_none=True)
+        self.assertEqual(metadata.mpp_writer, expected.mpp_writer)
+        self.assertEqual(metadata.mpp_piece, expected.mpp_piece)
+        self.assertEqual(
+            metadata.mpp_numeric_objid,
+            expected.mpp_numeric_objid
+        )
+
+        self.assertEqual(len(loaded.sprites), 1)
+        sprite, expected_sprite = loaded.sprites[0], original.sprites[0]
+        self.assertIs(sprite.space, loaded.space)
+        self.assertEqual(sprite.bitmap_origin, expected_sprite.bitmap_origin)
+        self.assertEqual(sprite.dpi, expected_sprite.dpi)
+        self.assertEqual(sprite.mask.ink_color, expected_sprite.mask.ink_color)
+        np.testing.assert_array_equal(
+            sprite.mask.unpack(),
+            expected_sprite.mask.unpack()
+        )
+
+        if isinstance(original, LineGlyph):
+            self.assertEqual(
+                loaded.start_point.point,
+                original.start_point.point
+            )
+            self.assertEqual(loaded.end_point.point, original.end_point.point)
+            self.assertIs(loaded.start_point.space, loaded.space)
+            self.assertIs(loaded.end_point.space, loaded.space)
+
+    def test_write_load_round_trip(self):
+        glyphs = make_glyphs()
+        with tempfile.TemporaryDirectory() as tmp:
+            GlyphIndex.write(glyphs, Path(tmp) / "index")
+            index = GlyphIndex.load(Path(tmp) / "index")
+
+            self.assertEqual(len(index), len(glyphs))
+            for row, glyph in enumerate(glyphs):
+                self.assertIs(index.get_glyph_type(row), type(glyph))
+                self.assert_same_glyph(index.get_glyph(row), glyph)
+            del index # releases the memory-mapped file
+
+    def test_rows_where(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            GlyphIndex.write(make_glyphs(), Path(tmp))
+            index = GlyphIndex.load(Path(tmp))
+
+            self.assertEqual(index.rows_where(mpp_writer=2).tolist(), [1, 3, 4])
+            self.assertEqual(
+                index.rows_where(glyph_class="stem").tolist(),
+                [2, 4]
+            )
+            self.assertEqual(
+                index.rows_where(mpp_writer=1, glyph_class="stem").tolist(),
+                [2]
+            )
+            self.assertEqual(
+                index.rows_where(glyph_class="unknown").tolist(),
+                []
+            )
+            del index
+
+    def test_line_length_matches_materialized_glyph(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            GlyphIndex.write(make_glyphs(), Path(tmp))
+            index = GlyphIndex.load(Path(tmp))
+
+            for row in index.rows_where(glyph_class="stem"):
+                glyph = index.get_glyph(int(row))
+                expected = (
+                    glyph.end_point.point.vector
+                        - glyph.start_point.point.vector
+                ).magnitude
+                self.assertAlmostEqual(index.line_length(int(row)), expected)
+            del index
+
+    def test_recently_requested_glyphs_are_kept(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            GlyphIndex.write(make_glyphs(), Path(tmp))
+            index = GlyphIndex.load(Path(tmp), max_materialized_glyphs=2)
+
+            first = index.get_glyph(0)
+            self.assertIs(index.get_glyph(0), first)
+            second = index.get_glyph(1)
+            self.assertIs(index.get_glyph(0), first) # the most recent now
+            index.get_glyph(2)
+
+            self.assertEqual(list(index._materialized.keys()), [0, 2])
+            self.assertIs(index.get_glyph(0), first)
+            self.assertIsNot(index.get_glyph(1), second)
+            self.assert_same_glyph(index.get_glyph(1), second)
+            del first, second, index
+
+    def test_no_glyphs_are_kept_with_a_zero_bound(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            GlyphIndex.write(make_glyphs(), Path(tmp))
+            index = GlyphIndex.load(Path(tmp), max_materialized_glyphs=0)
+            self.assertIsNot(index.get_glyph(0), index.get_glyph(0))
+            self.assertEqual(len(index._materialized), 0)
+            del index
+
+    def test_empty_index(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            GlyphIndex.write([], Path(tmp))
+            index = GlyphIndex.load(Path(tmp))
+            self.assertEqual(len(index), 0)
+            self.assertEqual(index.rows_where(mpp_writer=1).tolist(), [])
+
+    def test_glyph_without_packed_mask_cannot_be_written(self):
+        glyph = Glyph(glyph_class="noteheadBlack")
+        glyph.sprites = [
+            Sprite(
+                space=glyph.space,
+                bitmap=np.zeros(shape=(4, 4, 4), dtype=np.uint8)
+            )
+        ]
+        MppGlyphMetadata(glyph=glyph, mpp_writer=1, mpp_piece=1)
+        with tempfile.TemporaryDirectory() as tmp:
+            with self.assertRaises(AssertionError):
+                GlyphIndex.write([glyph], Path(tmp))
+
+
+if __name__ == "__main__":
+    unittest.main()
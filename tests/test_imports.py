@@ -0,0 +1,80 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from smashcima.assets.AssetBundle import BUNDLE_META_FILE
+from smashcima.assets.glyphs.muscima_pp.MuscimaPPGlyphs \
+    import MuscimaPPGlyphs
+
+from test_symbol_repository import write_repository
+
+
+ROOT_DIRECTORY = Path(__file__).parent.parent
+
+
+INSTALL_ONLY_MODULES = [
+    "muscima",
+    "skimage",
+    "tqdm",
+    "requests",
+    "smashcima.rendering.DebugGlyphRenderer",
+    "smashcima.assets.glyphs.muscima_pp.MppPage",
+    "smashcima.assets.glyphs.muscima_pp.get_symbols",
+]
+"""Modules needed only to install asset bundles (or to debug them),
+which synthesis must not import"""
+
+
+def imported_install_only_modules(script: str, assets: Path) -> list:
+    """Runs the script in a fresh interpreter and returns the install-only
+    modules that it imported"""
+    completed = subprocess.run(
+        [
+            sys.executable, "-c",
+            script + "\nimport json, sys\n" +
+            f"print(json.dumps([m for m in {INSTALL_ONLY_MODULES!r} " +
+            "if m in sys.modules]))"
+        ],
+        cwd=ROOT_DIRECTORY,
+        env={**os.environ, "MC_ASSETS_CACHE": str(assets)},
+        check=True,
+        capture_output=True,
+        text=True
+    )
+    # the result is the last line, the script may print before it
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+class InstallOnlyImportsTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.assets = Path(self._tmp.name)
+
+        # an installed glyph bundle (the dataset bundle is not needed)
+        bundle_directory = self.assets / MuscimaPPGlyphs.__name__
+        bundle_directory.mkdir()
+        (bundle_directory / BUNDLE_META_FILE).write_text("{}")
+        write_repository(bundle_directory / "symbol_repository")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_importing_smashcima(self):
+        self.assertEqual(imported_install_only_modules(
+            "import smashcima\n" +
+            "from smashcima.orchestration.BaseHandwrittenModel " +
+            "import BaseHandwrittenModel",
+            self.assets
+        ), [])
+
+    def test_constructing_the_model_from_installed_bundles(self):
+        self.assertEqual(imported_install_only_modules(
+            "from smashcima.orchestration.BaseHandwrittenModel " +
+            "import BaseHandwrittenModel\n" +
+            "BaseHandwrittenModel(disk_score_cache=False)",
+            self.assets
+        ), [])
@@ -0,0 +1,109 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from smashcima.assets.AssetRepository import AssetRepository
+from smashcima.assets.AssetBundle import BUNDLE_META_FILE
+from smashcima.assets.datasets.MuscimaPP import MuscimaPP
+from smashcima.assets.glyphs.muscima_pp.GlyphIndex import GlyphIndex
+from smashcima.assets.glyphs.muscima_pp.MuscimaPPGlyphs \
+    import MuscimaPPGlyphs
+from smashcima.assets.glyphs.muscima_pp.PartitionedSymbolRepository \
+    import PartitionedSymbolRepository, partition_directory
+from smashcima.scene.visual.Glyph import Glyph
+from smashcima.scene.visual.LineGlyph import LineGlyph
+
+from test_glyph_index import make_glyph
+
+
+DOCUMENTS = {
+    # document name: (writer, object ids of its glyphs)
+    "CVC-MUSCIMA_W-01_N-02_D-ideal": (1, [21, 22, 23]),
+    "CVC-MUSCIMA_W-02_N-01_D-ideal": (2, [11]),
+    "CVC-MUSCIMA_W-01_N-01_D-ideal": (1, [1, 2]),
+}
+
+
+class MuscimaPPGlyphsInstallTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.assets = Path(self._tmp.name)
+
+        # pretend both bundles are installed
+        for bundle_type in [MuscimaPP, MuscimaPPGlyphs]:
+            (self.assets / bundle_type.__name__).mkdir()
+            (self.assets / bundle_type.__name__ / BUNDLE_META_FILE) \
+                .write_text("{}")
+
+        repository = AssetRepository(self.assets)
+        self.bundle = repository.resolve_bundle(MuscimaPPGlyphs)
+        self.bundle.install_workers = 1
+        documents = repository.resolve_bundle(MuscimaPP).cropobjects_directory
+        documents.mkdir(parents=True)
+        for name in DOCUMENTS.keys():
+            (documents / f"{name}.xml").write_text("")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def cache_documents(self):
+        """Stores the glyphs of all documents into the install cache,
+        as if they were extracted by an interrupted installation"""
+        for name, (writer, objids) in DOCUMENTS.items():
+            GlyphIndex.write(
+                [
+                    make_glyph(
+                        LineGlyph if objid % 2 else Glyph, "stem", writer,
+                        objid=objid, size=(objid % 7 + 1, objid % 5 + 1),
+                        line=(0.0, 0.0, 0.0, -float(objid))
+                            if objid % 2 else None
+                    )
+                    for objid in objids
+                ],
+                self.bundle.install_cache_directory / name
+            )
+
+    def test_install_resumes_from_the_cache(self):
+        self.cache_documents()
+        self.bundle.install()
+
+        directory = self.bundle.symbol_repository_directory
+        self.assertEqual(
+            PartitionedSymbolRepository.available_writers(directory),
+            [1, 2]
+        )
+
+        # glyphs of each writer come in the document order
+        index = GlyphIndex.load(partition_directory(directory, 1))
+        self.assertEqual(
+            index.columns["mpp_numeric_objid"].tolist(),
+            [1, 2, 21, 22, 23]
+        )
+        self.assertIs(index.get_glyph_type(0), LineGlyph)
+        self.assertIs(index.get_glyph_type(1), Glyph)
+        glyph = index.get_glyph(4)
+        self.assertEqual(glyph.end_point.point.y, -23.0)
+        self.assertEqual(glyph.sprites[0].mask.shape, (4, 3, 4))
+        del glyph, index
+
+        self.assertFalse(self.bundle.install_cache_directory.exists())
+
+    def test_cached_documents_no_longer_in_the_dataset_are_ignored(self):
+        self.cache_documents()
+        GlyphIndex.write(
+            [make_glyph(Glyph, "stem", writer=3, objid=5)],
+            self.bundle.install_cache_directory
+                / "CVC-MUSCIMA_W-03_N-01_D-ideal"
+        )
+        self.bundle.install()
+
+        self.assertEqual(
+            PartitionedSymbolRepository.available_writers(
+                self.bundle.symbol_repository_directory
+            ),
+            [1, 2]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
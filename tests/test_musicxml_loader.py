@@ -0,0 +1,218 @@
+import io
+import re
+import unittest
+import zipfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Any, Dict, List
+from smashcima.loading.MusicXmlLoader import MusicXmlLoader
+from smashcima.scene.SceneObject import SceneObject
+from smashcima.scene.semantic.Score import Score
+
+
+INPUT_FILE = Path(__file__).parent.parent / "testing" / "input.musicxml"
+
+
+def describe_score(score: Score) -> List[str]:
+    """Describes the scene graph reachable from the score (objects in the
+    order of traversal, their field values and links), so that two loaded
+    scores can be compared"""
+    ids: Dict[int, int] = {}
+    order: List[SceneObject] = []
+    stack: List[SceneObject] = [score]
+    while len(stack) > 0:
+        scene_object = stack.pop()
+        if id(scene_object) in ids:
+            continue
+        ids[id(scene_object)] = len(ids)
+        order.append(scene_object)
+        stack += [link.target for link in scene_object.outlinks]
+        stack += [link.source for link in scene_object.inlinks]
+
+    def fmt(value: Any) -> str:
+        if isinstance(value, SceneObject):
+            return f"#{ids[id(value)]}"
+        if isinstance(value, (list, tuple)):
+            return "[" + ",".join(fmt(v) for v in value) + "]"
+        if isinstance(value, dict):
+            return "{" + ",".join(
+                f"{k}:{fmt(v)}" for k, v in value.items()
+            ) + "}"
+        if isinstance(value, set):
+            return "{" + ",".join(sorted(fmt(v) for v in value)) + "}"
+        return repr(value)
+
+    lines: List[str] = []
+    for scene_object in order:
+        fields = sorted(
+            (name, value) for name, value in vars(scene_object).items()
+            if name not in ("inlinks", "outlinks")
+        )
+        lines.append(type(scene_object).__name__ + " " + " ".join(
+            f"{name}={fmt(value)}" for name, value in fields
+        ))
+        lines.append("out " + " ".join(
+            f"{l.name}->#{ids[id(l.target)]}" for l in scene_object.outlinks
+        ))
+        lines.append("in " + " ".join(
+            f"{l.name}<-#{ids[id(l.source)]}" for l in scene_object.inlinks
+        ))
+    return lines
+
+
+ELEMENT_ADDRESS = r" at 0x[0-9a-f]+"
+"Memory address in the printed elements, differs between the loaded trees"
+
+NOTE = "<note><pitch><step>C</step><octave>5</octave></pitch>" + \
+    "<duration>1</duration><voice>1</voice><type>quarter</type></note>"
+
+ATTRIBUTES = "<attributes><divisions>1</divisions>" + \
+    "<key><fifths>0</fifths></key><time><beats>2</beats><beat-type>4</beat-type></time>" + \
+    "<clef><sign>G</sign><line>2</line></clef></attributes>"
+
+
+def part(part_id: str, measure_count: int, notes_per_measure: int = 2) -> str:
+    return f"<part id=\"{part_id}\">" + "".join(
+        f"<measure number=\"{i + 1}\">" +
+        ("<print new-system=\"yes\"/>" if i == 2 else "") +
+        (ATTRIBUTES if i == 0 else "") +
+        NOTE * notes_per_measure +
+        "</measure>"
+        for i in range(measure_count)
+    ) + "</part>"
+
+
+def score_xml(part_list: List[str], parts: List[str]) -> bytes:
+    return (
+        "<?xml version=\"1.0\" encoding=\"UTF-8\"?>" +
+        "<score-partwise version=\"3.1\">" +
+        "<work><work-title>Test</work-title></work><part-list>" + "".join(
+            f"<score-part id=\"{p}\"><part-name>{p}</part-name></score-part>"
+            for p in part_list
+        ) + "</part-list>" + "".join(parts) + "</score-partwise>"
+    ).encode("utf-8")
+
+
+class StreamingLoadTest(unittest.TestCase):
+    def assert_streams_like_tree(self, xml: bytes):
+        tree_errors = io.StringIO()
+        tree_score = MusicXmlLoader(errout=tree_errors).load(
+            ET.ElementTree(ET.fromstring(xml))
+        )
+        stream_errors = io.StringIO()
+        stream_score = MusicXmlLoader(errout=stream_errors).load_stream(
+            io.BytesIO(xml)
+        )
+        self.assertEqual(
+            describe_score(stream_score),
+            describe_score(tree_score)
+        )
+        self.assertEqual(
+            stream_score.new_system_measure_indices,
+            tree_score.new_system_measure_indices
+        )
+        self.assertEqual(
+            stream_score.new_page_measure_indices,
+            tree_score.new_page_measure_indices
+        )
+        self.assertEqual(
+            re.sub(ELEMENT_ADDRESS, "", stream_errors.getvalue()),
+            re.sub(ELEMENT_ADDRESS, "", tree_errors.getvalue())
+        )
+        return stream_score
+
+    def test_input_file(self):
+        score = self.assert_streams_like_tree(INPUT_FILE.read_bytes())
+        self.assertGreater(len(score.parts), 0)
+
+    def test_load_file_streams(self):
+        self.assertEqual(
+            describe_score(MusicXmlLoader().load_file(str(INPUT_FILE))),
+            describe_score(MusicXmlLoader().load(ET.parse(INPUT_FILE)))
+        )
+
+    def test_parts_are_ordered_by_the_part_list(self):
+        score = self.assert_streams_like_tree(score_xml(
+            part_list=["P1", "P2"],
+            parts=[part("P2", 3, notes_per_measure=1), part("P1", 3)]
+        ))
+        self.assertEqual(
+            [len(p.measures[0].events) for p in score.parts],
+            [2, 1]
+        )
+
+    def test_parts_missing_in_the_part_list_are_skipped(self):
+        score = self.assert_streams_like_tree(score_xml(
+            part_list=["P1"],
+            parts=[part("P9", 2), part("P1", 3)]
+        ))
+        self.assertEqual([len(p.measures) for p in score.parts], [3])
+
+    def test_first_part_with_duplicate_id_is_used(self):
+        score = self.assert_streams_like_tree(score_xml(
+            part_list=["P1"],
+            parts=[part("P1", 2), part("P1", 5)]
+        ))
+        self.assertEqual([len(p.measures) for p in score.parts], [2])
+
+    def test_errors_are_reported_the_same(self):
+        xml = score_xml(
+            part_list=["P1"],
+            parts=[part("P1", 3).replace(
+                "</measure>", "<unknown-element/></measure>"
+            )]
+        )
+        errors = io.StringIO()
+        MusicXmlLoader(errout=errors).load_stream(io.BytesIO(xml))
+        self.assertIn("[P:P1 M:3]: Unexpected <measure> element",
+            errors.getvalue())
+        self.assert_streams_like_tree(xml)
+
+    def test_missing_part_raises(self):
+        xml = score_xml(part_list=["P1", "P2"], parts=[part("P1", 2)])
+        with self.assertRaisesRegex(Exception, "Cannot find <part>"):
+            MusicXmlLoader().load_stream(io.BytesIO(xml))
+
+    def test_wrong_root_element_raises(self):
+        with self.assertRaisesRegex(Exception, "score-partwose"):
+            MusicXmlLoader().load_stream(io.BytesIO(b"<score-timewise/>"))
+
+
+def build_mxl(container: str) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("META-INF/container.xml", container)
+        archive.writestr("scores/score.musicxml", INPUT_FILE.read_bytes())
+    return buffer.getvalue()
+
+
+class MxlLoadingTest(unittest.TestCase):
+    def assert_loads_like_plain_file(self, container: str):
+        score = MusicXmlLoader().load_mxl(io.BytesIO(build_mxl(container)))
+        expected = MusicXmlLoader().load_file(INPUT_FILE)
+        self.assertEqual(describe_score(score), describe_score(expected))
+
+    def test_container_without_namespace(self):
+        self.assert_loads_like_plain_file(
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<container><rootfiles>'
+            '<rootfile full-path="scores/score.musicxml"/>'
+            '</rootfiles></container>'
+        )
+
+    def test_container_with_namespace(self):
+        self.assert_loads_like_plain_file(
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<container version="1.0" '
+            'xmlns="urn:oasis:names:tc:opendocument:xmlns:container">'
+            '<rootfiles>'
+            '<rootfile full-path="scores/score.musicxml" '
+            'media-type="application/vnd.recordare.musicxml+xml"/>'
+            '</rootfiles></container>'
+        )
+
+    def test_container_without_root_file_raises(self):
+        with self.assertRaisesRegex(Exception, "lists no root file"):
+            MusicXmlLoader().load_mxl(io.BytesIO(build_mxl(
+                '<container><rootfiles/></container>'
+            )))
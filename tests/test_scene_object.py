@@ -0,0 +1,244 @@
+import pickle
+import unittest
+from dataclasses import dataclass, field
+from typing import List, Optional
+from smashcima.scene.SceneObject import SceneObject, Link
+
+
+@dataclass
+class Node(SceneObject):
+    children: List[SceneObject] = field(default_factory=list)
+    parent: Optional[SceneObject] = None
+
+
+@dataclass
+class Leaf(Node):
+    pass
+
+
+@dataclass
+class Other(SceneObject):
+    pass
+
+
+def ids(objects) -> List[int]:
+    return [id(o) for o in objects]
+
+
+class LinkCollectionTest(unittest.TestCase):
+    def test_links_keep_the_attachment_order(self):
+        node = Node()
+        a, b, c = Leaf(), Other(), Node()
+        node.children = [a, b, c]
+        self.assertEqual(ids(l.target for l in node.outlinks), ids([a, b, c]))
+        self.assertEqual(
+            ids(l.target for l in node.outlinks.find(name="children")),
+            ids([a, b, c])
+        )
+
+    def test_find_by_name(self):
+        node, child, parent = Node(), Node(), Node()
+        node.children = [child]
+        node.parent = parent
+        self.assertEqual(
+            ids(l.target for l in node.outlinks.find(name="parent")),
+            ids([parent])
+        )
+        self.assertEqual(node.outlinks.find(name="missing"), [])
+        self.assertEqual(len(node.outlinks.find()), 2)
+
+    def test_find_by_type_includes_subclasses(self):
+        node = Node()
+        a, b, c, d = Leaf(), Other(), Node(), Leaf()
+        node.children = [a, b, c, d]
+        self.assertEqual(
+            ids(l.target for l in node.outlinks.find(Node, "children")),
+            ids([a, c, d])
+        )
+        self.assertEqual(
+            ids(l.target for l in node.outlinks.find(Leaf)),
+            ids([a, d])
+        )
+        self.assertEqual(
+            ids(l.target for l in node.outlinks.find(Other, "parent")),
+            []
+        )
+
+    def test_inlinks_are_indexed_by_source_type(self):
+        target = Other()
+        first, second, third = Node(), Leaf(), Node()
+        for source in [first, second, third]:
+            source.parent = target
+        self.assertEqual(
+            ids(target.get_inlinked(Node, "parent")),
+            ids([first, second, third])
+        )
+        self.assertEqual(ids(target.get_inlinked(Leaf)), ids([second]))
+        self.assertIs(
+            target.get_inlinked(Leaf, "parent", at_most_one=True),
+            second
+        )
+
+    def test_removed_links_are_not_found(self):
+        node = Node()
+        a, b = Leaf(), Leaf()
+        node.children = [a, b]
+        link = node.outlinks.find(name="children")[0]
+        link.detach()
+        self.assertEqual(
+            ids(l.target for l in node.outlinks.find(Leaf, "children")),
+            ids([b])
+        )
+        self.assertEqual(a.inlinks.find(), [])
+        self.assertEqual(len(node.outlinks), 1)
+
+        # re-attached links go to the end
+        Link(source=node, target=a, name="children").attach()
+        self.assertEqual(ids(l.target for l in node.outlinks), ids([b, a]))
+        with self.assertRaises(ValueError):
+            node.outlinks.remove(Link(source=node, target=Other(), name="x"))
+
+    def test_reassignment_replaces_the_links(self):
+        node = Node()
+        a, b = Leaf(), Leaf()
+        node.parent = a
+        node.parent = b
+        self.assertEqual(
+            ids(l.target for l in node.outlinks.find(name="parent")),
+            ids([b])
+        )
+        self.assertEqual(a.inlinks.find(), [])
+
+
+def linked_children(node: Node) -> List[int]:
+    return ids(l.target for l in node.outlinks.find(name="children"))
+
+
+class LinkedListTest(unittest.TestCase):
+    def test_mutations_are_tracked(self):
+        node = Node()
+        a, b, c, d = Leaf(), Leaf(), Leaf(), Leaf()
+        node.children.append(a)
+        node.children.extend([b, c])
+        node.children.insert(0, d)
+        self.assertEqual(linked_children(node), ids([a, b, c, d]))
+
+        node.children.remove(b)
+        self.assertIs(node.children.pop(), c)
+        self.assertEqual(linked_children(node), ids([a, d]))
+        self.assertEqual(b.inlinks.find(), [])
+        self.assertEqual(c.inlinks.find(), [])
+
+        node.children[0] = b
+        del node.children[1]
+        self.assertEqual(ids(node.children), ids([b]))
+        self.assertEqual(linked_children(node), ids([b]))
+
+        node.children += [c, d]
+        node.children[1:] = [a]
+        self.assertEqual(linked_children(node), ids([b, a]))
+
+        node.children.clear()
+        self.assertEqual(linked_children(node), [])
+        self.assertEqual(a.inlinks.find(), [])
+
+    def test_reordering_keeps_the_links(self):
+        node = Node()
+        a, b = Leaf(), Leaf()
+        node.children = [a, b]
+        links = node.outlinks.find(name="children")
+        node.children.reverse()
+        self.assertEqual(ids(node.children), ids([b, a]))
+        self.assertEqual(
+            ids(node.outlinks.find(name="children")), ids(links)
+        )
+
+    def test_reassignment_keeps_the_links_of_remaining_items(self):
+        node = Node()
+        a, b, c = Leaf(), Leaf(), Leaf()
+        node.children = [a, b]
+        link_of_a = node.outlinks.find(name="children")[0]
+        node.children = [a, c]
+        self.assertIs(node.outlinks.find(name="children")[0], link_of_a)
+        self.assertEqual(linked_children(node), ids([a, c]))
+        self.assertEqual(b.inlinks.find(), [])
+
+    def test_assigned_plain_list_is_copied(self):
+        # the field holds a linked copy of the assigned list, mutations
+        # of the original list do not reach the field (nor the links)
+        items = []
+        node, a = Node(), Leaf()
+        node.children = items
+        items.append(a)
+        self.assertIsNot(node.children, items)
+        self.assertEqual(node.children, [])
+        self.assertEqual(linked_children(node), [])
+
+    def test_list_of_another_field_is_copied(self):
+        # assigning the list of another object (or field) copies it,
+        # so that each linked list keeps the links of its own owner
+        first, second = Node(), Node()
+        a, b = Leaf(), Leaf()
+        first.children = [a]
+        second.children = first.children
+        self.assertIsNot(second.children, first.children)
+        self.assertEqual(ids(second.children), ids([a]))
+
+        first.children.append(b)
+        self.assertEqual(linked_children(first), ids([a, b]))
+        self.assertEqual(linked_children(second), ids([a]))
+        self.assertEqual(ids(second.children), ids([a]))
+
+    def test_pickled_linked_list_is_tracked(self):
+        node, a, b = Node(), Leaf(), Leaf()
+        node.children = [a]
+        restored = pickle.loads(pickle.dumps(node))
+        restored.children.append(b)
+        self.assertEqual(len(linked_children(restored)), 2)
+        self.assertIs(
+            restored.outlinks.find(name="children")[1].target,
+            restored.children[1]
+        )
+
+    def test_mutating_replaced_list_does_not_link(self):
+        node, a, b = Node(), Leaf(), Leaf()
+        node.children = [a]
+        old = node.children
+        node.children = []
+        old.append(b)
+        old.remove(a)
+        self.assertEqual(node.children, [])
+        self.assertEqual(linked_children(node), [])
+        self.assertEqual(len(a.inlinks), 0)
+        self.assertEqual(len(b.inlinks), 0)
+
+    def test_replaced_list_is_released_by_any_value(self):
+        for replacement in (Leaf(), set(), None, 42):
+            node, a = Node(), Leaf()
+            old = node.children
+            node.children = replacement
+            old.append(a)
+            self.assertEqual(len(a.inlinks), 0)
+            self.assertEqual(
+                linked_children(node),
+                ids([replacement]) if isinstance(replacement, Leaf) else []
+            )
+
+    def test_reassigning_the_same_list_keeps_it_linked(self):
+        node, a, b = Node(), Leaf(), Leaf()
+        node.children = [a]
+        same = node.children
+        node.children = same
+        same.append(b)
+        self.assertIs(node.children, same)
+        self.assertEqual(linked_children(node), ids([a, b]))
+
+    def test_released_list_can_be_assigned_again(self):
+        node, other, a = Node(), Node(), Leaf()
+        old = node.children
+        node.children = []
+        other.children = old
+        old.append(a)
+        self.assertIs(other.children, old)
+        self.assertEqual(linked_children(node), [])
+        self.assertEqual(linked_children(other), ids([a]))
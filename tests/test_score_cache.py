@@ -0,0 +1,97 @@
+import contextlib
+import io
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from smashcima.loading.ScoreCache import ScoreCache
+from smashcima.scene.semantic.Score import Score
+
+from test_musicxml_loader import build_mxl, describe_score
+
+
+INPUT_FILE = Path(__file__).parent.parent / "testing" / "input.musicxml"
+
+
+class ScoreCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.temporary = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.temporary, ignore_errors=True)
+
+    def load(self, cache: ScoreCache) -> Score:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return cache.load_file(INPUT_FILE)
+
+    def test_disk_layer_is_shared(self):
+        directory = self.temporary / "scores"
+        first = self.load(ScoreCache(directory))
+        self.assertEqual(len(list(directory.glob("*/*.pkl.z"))), 1)
+
+        second = self.load(ScoreCache(directory))
+        self.assertIsNot(first, second)
+        self.assertEqual(len(first.parts), len(second.parts))
+
+    def test_unwritable_directory_disables_disk_layer(self):
+        # a regular file in place of a directory cannot be written into,
+        # unlike a read-only directory, which the root user can write to
+        blocker = self.temporary / "blocker"
+        blocker.write_text("not a directory")
+        cache = ScoreCache(blocker / "scores")
+
+        warnings = io.StringIO()
+        with contextlib.redirect_stderr(warnings):
+            score = self.load(cache)
+            again = self.load(cache)
+
+        self.assertIsInstance(score, Score)
+        self.assertIsInstance(again, Score)
+        self.assertIsNone(cache.directory)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(warnings.getvalue().count("disk cache is disabled"), 1)
+
+    def test_memory_only_cache(self):
+        cache = ScoreCache()
+        first = self.load(cache)
+        second = self.load(cache)
+        self.assertIsNot(first, second)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(list(self.temporary.iterdir()), [])
+
+    def test_disk_layer_is_opt_in(self):
+        with mock.patch("smashcima.loading.ScoreCache.MC_SCORE_CACHE", None):
+            self.assertIsNone(ScoreCache.default().directory)
+
+        directory = self.temporary / "scores"
+        with mock.patch(
+            "smashcima.loading.ScoreCache.MC_SCORE_CACHE", directory
+        ):
+            self.assertEqual(ScoreCache.default().directory, directory)
+
+    def test_file_is_read_once(self):
+        read_bytes = Path.read_bytes
+        with mock.patch.object(
+            Path, "read_bytes", autospec=True, side_effect=read_bytes
+        ) as read_mock, mock.patch("builtins.open") as open_mock:
+            score = self.load(ScoreCache())
+
+        self.assertIsInstance(score, Score)
+        self.assertEqual(read_mock.call_count, 1)
+        open_mock.assert_not_called()
+
+    def test_mxl_file(self):
+        path = self.temporary / "score.mxl"
+        path.write_bytes(build_mxl(
+            '<container><rootfiles>'
+            '<rootfile full-path="scores/score.musicxml"/>'
+            '</rootfiles></container>'
+        ))
+        cache = ScoreCache()
+        with contextlib.redirect_stdout(io.StringIO()):
+            score = cache.load_file(path)
+            again = cache.load_file(path)
+            expected = cache.load_file(INPUT_FILE)
+        self.assertEqual(describe_score(score), describe_score(expected))
+        self.assertEqual(describe_score(again), describe_score(expected))
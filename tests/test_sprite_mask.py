@@ -0,0 +1,99 @@
+import pickle
+import unittest
+
+import numpy as np
+
+from smashcima.geometry.Rectangle import Rectangle
+from smashcima.geometry.Transform import Transform
+from smashcima.geometry.Vector2 import Vector2
+from smashcima.rendering.BitmapRenderer import BitmapRenderer
+from smashcima.scene.AffineSpace import AffineSpace
+from smashcima.scene.Scene import Scene
+from smashcima.scene.ViewBox import ViewBox
+from smashcima.scene.Sprite import Sprite
+from smashcima.scene.SpriteMask import SpriteMask
+
+
+def random_mask(width: int, height: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return rng.random(size=(height, width)) < 0.4
+
+
+class SpriteMaskTest(unittest.TestCase):
+    def test_pack_unpack_round_trip(self):
+        for width in [1, 7, 8, 9, 33, 64]:
+            mask = random_mask(width=width, height=5, seed=width)
+            sprite_mask = SpriteMask.from_mask(mask)
+            self.assertEqual(sprite_mask.packed.shape, (5, (width + 7) // 8))
+            self.assertEqual(sprite_mask.shape, (5, width, 4))
+            np.testing.assert_array_equal(sprite_mask.unpack(), mask)
+
+    def test_non_zero_values_are_ink(self):
+        mask = np.array([[0, 3, 255], [1, 0, 0]], dtype=np.uint8)
+        np.testing.assert_array_equal(
+            SpriteMask.from_mask(mask).unpack(),
+            mask != 0
+        )
+
+    def test_to_bitmap_paints_ink_over_transparent_black(self):
+        mask = random_mask(width=11, height=4)
+        ink_color = (10, 20, 30, 200)
+        bitmap = SpriteMask.from_mask(mask, ink_color).to_bitmap()
+        self.assertEqual(bitmap.shape, (4, 11, 4))
+        self.assertEqual(bitmap.dtype, np.uint8)
+        np.testing.assert_array_equal(bitmap[mask], [ink_color] * mask.sum())
+        np.testing.assert_array_equal(bitmap[~mask], 0)
+
+    def test_mask_is_immutable(self):
+        sprite_mask = SpriteMask.from_mask(random_mask(width=9, height=3))
+        with self.assertRaises(AttributeError):
+            sprite_mask.width = 10
+        with self.assertRaises(ValueError):
+            sprite_mask.packed[0, 0] = 0
+
+    def test_pickle_round_trip(self):
+        mask = random_mask(width=13, height=6)
+        sprite_mask = SpriteMask.from_mask(mask, (1, 2, 3, 4))
+        restored = pickle.loads(pickle.dumps(sprite_mask))
+        self.assertEqual(restored.ink_color, (1, 2, 3, 4))
+        np.testing.assert_array_equal(restored.unpack(), mask)
+
+    def test_sprite_holding_a_mask(self):
+        mask = random_mask(width=13, height=6)
+        sprite_mask = SpriteMask.from_mask(mask)
+        sprite = Sprite(AffineSpace(), sprite_mask)
+        self.assertIs(sprite.image, sprite_mask)
+        self.assertEqual(sprite.pixel_width, 13)
+        self.assertEqual(sprite.pixel_height, 6)
+        np.testing.assert_array_equal(
+            sprite.bitmap,
+            sprite_mask.to_bitmap()
+        )
+        instance = sprite.create_instance(AffineSpace())
+        self.assertIs(instance.image, sprite_mask)
+
+    def test_mask_renders_like_its_bitmap(self):
+        sprite_mask = SpriteMask.from_mask(
+            random_mask(width=40, height=30),
+            ink_color=(30, 60, 90, 180)
+        )
+        view_box = ViewBox(Rectangle(0, 0, 6, 5))
+
+        def render(image) -> np.ndarray:
+            scene = Scene()
+            Sprite(
+                space=scene.space,
+                bitmap=image,
+                transform=Transform.rotateDegCC(10)
+                    .then(Transform.translate(Vector2(3, 2.5)))
+            )
+            return BitmapRenderer(dpi=300).render(scene, view_box)
+
+        np.testing.assert_array_equal(
+            render(sprite_mask),
+            render(sprite_mask.to_bitmap())
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,196 @@
+import random
+import tempfile
+import unittest
+from pathlib import Path
+
+from smashcima.assets.AssetRepository import AssetRepository
+from smashcima.assets.AssetBundle import BUNDLE_META_FILE
+from smashcima.assets.datasets.MuscimaPP import MuscimaPP
+from smashcima.assets.glyphs.muscima_pp.GlyphIndex import GlyphIndex
+from smashcima.assets.glyphs.muscima_pp.PooledGlyphList import PooledLineList
+from smashcima.assets.glyphs.muscima_pp.MppGlyphMetadata \
+    import MppGlyphMetadata
+from smashcima.assets.glyphs.muscima_pp.MuscimaPPGlyphs \
+    import MuscimaPPGlyphs
+from smashcima.assets.glyphs.muscima_pp.PartitionedSymbolRepository \
+    import PartitionedSymbolRepository, partition_directory
+from smashcima.scene.visual.Glyph import Glyph
+from smashcima.scene.visual.LineGlyph import LineGlyph
+
+from test_glyph_index import make_glyph
+
+
+WRITERS = [1, 2, 3, 4]
+
+
+def writer_glyphs(writer: int):
+    """Two noteheads and two stems of different lengths per writer"""
+    return [
+        make_glyph(Glyph, "noteheadBlack", writer, objid=writer * 10 + 1),
+        make_glyph(Glyph, "noteheadBlack", writer, objid=writer * 10 + 2),
+        make_glyph(
+            LineGlyph, "stem", writer, objid=writer * 10 + 3,
+            line=(0.0, 0.0, 0.0, -float(writer))
+        ),
+        make_glyph(
+            LineGlyph, "stem", writer, objid=writer * 10 + 4,
+            line=(0.0, 0.0, 0.0, -float(writer) - 0.5)
+        ),
+    ]
+
+
+def write_repository(directory: Path):
+    for writer in WRITERS:
+        GlyphIndex.write(
+            writer_glyphs(writer),
+            partition_directory(directory, writer)
+        )
+
+
+def glyph_writers(glyphs) -> set:
+    return set(
+        MppGlyphMetadata.of_glyph(g, fail_if_none=True).mpp_writer
+        for g in glyphs
+    )
+
+
+class PartitionedSymbolRepositoryTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.directory = Path(self._tmp.name)
+        write_repository(self.directory)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_lookups_do_not_load_writers(self):
+        repository = PartitionedSymbolRepository(self.directory, WRITERS)
+
+        self.assertEqual(repository.all_writers, set(WRITERS))
+        self.assertEqual(len(repository.all_glyphs), 4 * len(WRITERS))
+        self.assertEqual(len(repository.glyphs_by_class["noteheadBlack"]), 8)
+        self.assertEqual(
+            len(repository.glyphs_by_class_and_writer["stem", 3]),
+            2
+        )
+        self.assertIsInstance(repository.glyphs_by_class["stem"], PooledLineList)
+        self.assertEqual(repository.resident_writers, [])
+
+    def test_glyphs_are_loaded_from_their_writer(self):
+        repository = PartitionedSymbolRepository(self.directory, WRITERS)
+
+        glyphs = repository.glyphs_by_class_and_writer["noteheadBlack", 2]
+        self.assertEqual(glyph_writers(glyphs), {2})
+        self.assertEqual(repository.resident_writers, [2])
+
+        self.assertEqual(glyph_writers(repository.all_glyphs), set(WRITERS))
+
+    def test_lines_are_sorted_and_picked_by_length(self):
+        repository = PartitionedSymbolRepository(self.directory, WRITERS)
+
+        stems = repository.glyphs_by_class["stem"]
+        self.assertEqual(stems.line_lengths, sorted(stems.line_lengths))
+        self.assertEqual(repository.resident_writers, [])
+
+        stem = stems.pick_line(4.5, random.Random(0), percentile_spread=0)
+        self.assertIn(
+            (stem.end_point.point.vector - stem.start_point.point.vector)
+                .magnitude,
+            [4.0, 4.5]
+        )
+
+    def test_least_recently_used_writer_is_unloaded(self):
+        repository = PartitionedSymbolRepository(
+            self.directory, WRITERS, max_resident_writers=2
+        )
+
+        repository.load_writer(1)
+        repository.load_writer(2)
+        self.assertEqual(repository.resident_writers, [1, 2])
+
+        repository.load_writer(1) # becomes the most recently used
+        self.assertEqual(repository.resident_writers, [2, 1])
+
+        repository.load_writer(3)
+        self.assertEqual(repository.resident_writers, [1, 3])
+
+        # evicted writers are loaded again when needed
+        glyphs = repository.glyphs_by_class_and_writer["stem", 2]
+        self.assertEqual(glyph_writers(glyphs), {2})
+        self.assertEqual(repository.resident_writers, [3, 2])
+
+    def test_remove_writer_keeps_list_types(self):
+        repository = PartitionedSymbolRepository(self.directory, WRITERS)
+        repository.load_writer(3)
+        repository.remove_writer(3)
+
+        self.assertEqual(repository.all_writers, {1, 2, 4})
+        self.assertEqual(repository.resident_writers, [])
+        self.assertNotIn(("stem", 3), repository.glyphs_by_class_and_writer)
+        stems = repository.glyphs_by_class["stem"]
+        self.assertIsInstance(stems, PooledLineList)
+        self.assertEqual(len(stems.line_lengths), len(stems))
+        self.assertEqual(glyph_writers(stems), {1, 2, 4})
+
+
+class MuscimaPPGlyphsWriterSelectionTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        assets = Path(self._tmp.name)
+
+        # pretend both bundles are installed
+        for bundle_type in [MuscimaPP, MuscimaPPGlyphs]:
+            (assets / bundle_type.__name__).mkdir()
+            (assets / bundle_type.__name__ / BUNDLE_META_FILE).write_text("{}")
+
+        self.bundle = AssetRepository(assets).resolve_bundle(MuscimaPPGlyphs)
+        write_repository(self.bundle.symbol_repository_directory)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_all_writers_are_loaded_by_default(self):
+        repository = self.bundle.load_symbol_repository()
+        self.assertEqual(repository.all_writers, set(WRITERS))
+
+    def test_allowed_writers(self):
+        self.bundle.configure_symbol_repository(allowed_writers=[1, 3])
+        repository = self.bundle.load_symbol_repository()
+
+        self.assertEqual(repository.all_writers, {1, 3})
+        self.assertEqual(glyph_writers(repository.all_glyphs), {1, 3})
+
+    def test_denied_writers(self):
+        self.bundle.configure_symbol_repository(denied_writers=[2])
+        repository = self.bundle.load_symbol_repository()
+
+        self.assertEqual(repository.all_writers, {1, 3, 4})
+        self.assertEqual(
+            glyph_writers(repository.glyphs_by_class["stem"]),
+            {1, 3, 4}
+        )
+
+    def test_allowed_and_denied_writers(self):
+        self.bundle.configure_symbol_repository(
+            allowed_writers=[1, 2, 3],
+            denied_writers=[3, 4],
+            max_resident_writers=1
+        )
+        repository = self.bundle.load_symbol_repository()
+
+        self.assertEqual(repository.all_writers, {1, 2})
+        self.assertEqual(repository.max_resident_writers, 1)
+
+    def test_configuration_drops_the_loaded_repository(self):
+        repository = self.bundle.load_symbol_repository()
+        self.assertIs(self.bundle.load_symbol_repository(), repository)
+
+        self.bundle.configure_symbol_repository(denied_writers=[1])
+        self.assertEqual(
+            self.bundle.load_symbol_repository().all_writers,
+            {2, 3, 4}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
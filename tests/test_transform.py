@@ -0,0 +1,31 @@
+import copy
+import pickle
+import unittest
+import numpy as np
+from smashcima.geometry.Transform import Transform
+from smashcima.geometry.Vector2 import Vector2
+
+
+class TransformTest(unittest.TestCase):
+    def test_assignment_raises(self):
+        t = Transform.translate(Vector2(1, 2))
+        for name in ("a", "b", "c", "d", "e", "f", "_matrix"):
+            with self.assertRaises(AttributeError):
+                setattr(t, name, 5.0)
+
+    def test_matrix_agrees_with_apply_to(self):
+        t = Transform.translate(Vector2(1, 2)).then(Transform.scale(3))
+        v = t.apply_to(Vector2(1, 1))
+        m = t.matrix
+        self.assertEqual(v.x, m[0, 0] + m[0, 1] + m[0, 2])
+        self.assertEqual(v.y, m[1, 0] + m[1, 1] + m[1, 2])
+        with self.assertRaises(ValueError):
+            m[0, 2] = 10.0
+
+    def test_copy_and_pickle(self):
+        t = Transform(np.array([[1, 2, 3], [4, 5, 6]], dtype=np.float64))
+        for other in (copy.copy(t), copy.deepcopy(t),
+                      pickle.loads(pickle.dumps(t))):
+            self.assertTrue(np.array_equal(t.matrix, other.matrix))
+            with self.assertRaises(AttributeError):
+                other.e = 5.0